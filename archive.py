@@ -0,0 +1,45 @@
+import argparse
+import os
+import time
+from configuration import DatabaseManager, ARCHIVE_POLICIES
+
+
+def archive_table(db, table, older_than_days, batch_size=500, pause=0.2, max_rows=None):
+    """Move aged rows to the archive in small batches until none are left
+
+    Each batch is its own transaction, and the pause between batches gives
+    tellers' writes a chance at the locks, so this can run during the day.
+    """
+    moved = 0
+    while max_rows is None or moved < max_rows:
+        size = batch_size if max_rows is None else min(batch_size, max_rows - moved)
+        count = db.archive_batch(table, older_than_days, size)
+        moved += count
+        if count < size:
+            break
+        time.sleep(pause)
+    return moved
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Move rows older than the retention threshold to archive tables")
+    parser.add_argument("tables", nargs="*", default=sorted(ARCHIVE_POLICIES),
+                        help="tables to archive (default: all)")
+    parser.add_argument("--older-than-days", type=int,
+                        default=int(os.getenv("DB_ARCHIVE_AFTER_DAYS", "730")))
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--pause", type=float, default=0.2, help="seconds to sleep between batches")
+    parser.add_argument("--max-rows", type=int, help="stop after this many rows per table")
+    args = parser.parse_args(argv)
+
+    db = DatabaseManager()                  # Creates the archive tables if missing
+    try:
+        for table in args.tables:
+            moved = archive_table(db, table, args.older_than_days, args.batch_size, args.pause, args.max_rows)
+            print(f"{table}: {moved} rows archived")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
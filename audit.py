@@ -0,0 +1,216 @@
+import argparse
+import glob
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+from datetime import datetime
+from configuration import DatabaseManager, Error
+from paths import user_dir
+
+#Spilled entries are the only copy until replayed, so they live with the user's state, not in the checkout
+DEFAULT_SPILL = os.path.join(user_dir("state"), "audit_spill.jsonl")
+
+AUDIT_INSERT = """
+    INSERT INTO audit_log(logged_at, actor, table_name, row_id, op, before_data, after_data)
+    VALUES(%s, %s, %s, %s, %s, %s, %s)
+"""
+
+
+class AuditEntry:
+    """One committed write with the row as it was before and after"""
+
+    __slots__ = ("logged_at", "actor", "table", "row_id", "op", "before", "after")
+
+    def __init__(self, actor, table, row_id, op, before, after, logged_at=None):
+        self.logged_at = logged_at or datetime.now()
+        self.actor = actor
+        self.table = table
+        self.row_id = row_id
+        self.op = op
+        self.before = before
+        self.after = after
+
+    def as_params(self):
+        return (self.logged_at, self.actor, self.table, self.row_id, self.op,
+                _to_json(self.before), _to_json(self.after))
+
+    def as_json(self):
+        return json.dumps({
+            "logged_at": self.logged_at.isoformat(sep=" "), "actor": self.actor,
+            "table": self.table, "row_id": self.row_id, "op": self.op,
+            "before": self.before, "after": self.after,
+        }, default=str)
+
+
+def _to_json(row):
+    return None if row is None else json.dumps(row, default=str)
+
+
+class AuditLog:
+    """Buffers audit entries in memory and writes them from a background thread
+
+    Callers never wait on the database: entries go into a bounded queue that the
+    writer drains in batched multi-row inserts. When the queue is full, or the
+    database cannot be reached, entries are appended to a local spill file
+    instead, so memory stays bounded and nothing is dropped. Full spill files are
+    rotated but never deleted; replay_spill removes them once they are stored, so
+    the disk, not the log, is what a long outage uses up. close() flushes
+    everything still queued before returning.
+    """
+
+    def __init__(self, db_factory=None, max_queue=10000, batch_size=500, flush_interval=1.0,
+                 spill_path=None, spill_max_bytes=10 * 1024 * 1024):
+        self.db_factory = db_factory or (lambda: DatabaseManager(create_tables=False))
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spill_path = spill_path or os.getenv("DB_AUDIT_SPILL", DEFAULT_SPILL)
+        self.spill_max_bytes = spill_max_bytes
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._spill = None
+        self._spill_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.written = self.spilled = 0
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+        return self
+
+    def log(self, actor, table, row_id, op, before, after):
+        self.record(AuditEntry(actor, table, row_id, op, before, after))
+
+    def record(self, entry):
+        "Queue an entry without blocking; spill it to disk when the queue is full"
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self._spill_entries([entry])
+
+    def close(self):
+        "Stop the writer after it has flushed every queued entry"
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        # Anything recorded after the writer exited, or everything if it never started
+        db = None
+        while not self._queue.empty():
+            db = self._write(db, self._take_batch(block=False))
+        if db is not None:
+            db.close()
+        with self._spill_lock:
+            if self._spill is not None:
+                self._spill.close()
+                self._spill = None
+
+    def _take_batch(self, block=True):
+        batch = []
+        try:
+            if block:
+                batch.append(self._queue.get(timeout=self.flush_interval))
+            while len(batch) < self.batch_size:
+                batch.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+
+    def _run(self):
+        db = None
+        while not self._stop.is_set() or not self._queue.empty():
+            batch = self._take_batch(block=not self._stop.is_set())
+            if batch:
+                db = self._write(db, batch)
+        if db is not None:
+            db.close()
+
+    def _write(self, db, batch):
+        "Insert one batch in a single statement; returns the connection to reuse"
+        try:
+            if db is None:
+                db = self.db_factory()          # Own connection; the GUI's cursor is not thread-safe
+            db.cursor.executemany(AUDIT_INSERT, [entry.as_params() for entry in batch])
+            db.connection.commit()
+            self.written += len(batch)
+            return db
+        except Exception as e:
+            print(f"Audit writer error, spilling {len(batch)} entries: {e}")
+            self._spill_entries(batch)
+            if db is not None:
+                try:
+                    db.close()
+                except Exception:
+                    pass
+            return None
+
+    def _spill_entries(self, entries):
+        with self._spill_lock:
+            if self._spill is None:
+                os.makedirs(os.path.dirname(os.path.abspath(self.spill_path)), exist_ok=True)
+                self._spill = _SpillHandler(self.spill_path, maxBytes=self.spill_max_bytes, encoding="utf-8")
+            for entry in entries:
+                self._spill.emit(logging.makeLogRecord({"msg": entry.as_json()}))
+            self._spill.flush()
+            self.spilled += len(entries)
+
+
+def _rotated_spills(spill_path):
+    "Rotated spill files, oldest (highest suffix) first"
+    rotated = [p for p in glob.glob(spill_path + ".*") if p.rsplit(".", 1)[1].isdigit()]
+    return sorted(rotated, key=lambda p: -int(p.rsplit(".", 1)[1]))
+
+
+class _SpillHandler(logging.handlers.RotatingFileHandler):
+    """RotatingFileHandler that shifts every rotated file up instead of deleting the oldest
+
+    Spill files hold entries not yet in audit_log, so none may be dropped.
+    """
+
+    def doRollover(self):
+        waiting = len(_rotated_spills(self.baseFilename))
+        self.backupCount = waiting + 1          # One more than exist: the shift never removes a file
+        super().doRollover()
+        print(f"Audit spill rotated; {waiting + 1} full files wait for replay_spill")
+
+
+def replay_spill(db, spill_path, batch_size=500):
+    "Load spilled entries into audit_log, oldest file first, removing each file once stored"
+    paths = _rotated_spills(spill_path)
+    if os.path.exists(spill_path):
+        paths.append(spill_path)
+    loaded = 0
+    for path in paths:
+        with open(path, encoding="utf-8") as spill:
+            entries = [json.loads(line) for line in spill if line.strip()]
+        params = [(e["logged_at"], e["actor"], e["table"], e["row_id"], e["op"],
+                   _to_json(e["before"]), _to_json(e["after"])) for e in entries]
+        try:
+            for start in range(0, len(params), batch_size):
+                db.cursor.executemany(AUDIT_INSERT, params[start:start + batch_size])
+            db.connection.commit()
+        except Error as e:
+            print(f"Error replaying {path}: {e}")
+            db.connection.rollback()
+            raise
+        os.remove(path)
+        loaded += len(params)
+    return loaded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load audit entries spilled to disk into audit_log")
+    parser.add_argument("--spill", default=os.getenv("DB_AUDIT_SPILL", DEFAULT_SPILL))
+    args = parser.parse_args(argv)
+
+    db = DatabaseManager()
+    try:
+        print(f"Replayed {replay_spill(db, args.spill)} audit entries")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
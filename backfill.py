@@ -0,0 +1,22 @@
+import argparse
+from configuration import DatabaseManager, NORMALIZED_SOURCES
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fill normalized phone/email columns for existing rows")
+    parser.add_argument("tables", nargs="*", default=sorted(NORMALIZED_SOURCES),
+                        help="tables to convert (default: all)")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    db = DatabaseManager()                  # Creates the shadow columns and indexes if missing
+    try:
+        for table in args.tables:
+            converted = db.backfill_normalized_columns(table, args.batch_size)
+            print(f"{table}: {converted} rows normalized")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
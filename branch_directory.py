@@ -0,0 +1,102 @@
+from bisect import bisect_left
+
+
+def _branch_key(branch_id):
+    # Ids arrive as ints from the database and as text from entries and tree values
+    if isinstance(branch_id, str) and branch_id.strip().isdigit():
+        return int(branch_id)
+    return branch_id
+
+
+class BranchDirectory:
+    """Every branch held client-side: rows by id plus a sorted prefix index
+
+    Branches are few and rarely change, so lists resolve branch_name here
+    instead of joining branches for every employee and customer row, and forms
+    check branch ids without a round trip. load() takes the whole table once;
+    apply() keeps it current from branch writes and polled change sets.
+    """
+
+    def __init__(self):
+        self.loaded = False
+        self._by_id = {}
+        self._keys = []                         # Sorted (search key, branch_id)
+
+    def load(self, rows):
+        self._by_id = {row["branch_id"]: row for row in rows}
+        self.loaded = True
+        self._reindex()
+
+    def apply(self, rows=(), deleted_ids=()):
+        "Add or replace changed branch rows and drop deleted ones"
+        for branch_id in deleted_ids:
+            self._by_id.pop(_branch_key(branch_id), None)
+        for row in rows:
+            self._by_id[row["branch_id"]] = row
+        self._reindex()
+
+    def _reindex(self):
+        keys = []
+        for branch_id, row in self._by_id.items():
+            keys.append((str(branch_id), branch_id))
+            name = (row["branch_name"] or "").lower()
+            # Every word of the name is a key, so "main" finds "Pune Main"
+            for start in [0] + [i + 1 for i, char in enumerate(name) if char == " "]:
+                keys.append((name[start:], branch_id))
+        keys.sort()
+        self._keys = keys
+
+    def __contains__(self, branch_id):
+        return _branch_key(branch_id) in self._by_id
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def get(self, branch_id):
+        return self._by_id.get(_branch_key(branch_id))
+
+    def name(self, branch_id):
+        row = self.get(branch_id)
+        return row["branch_name"] if row else None
+
+    def label(self, branch_id):
+        "'3 - Main Branch', the form the branch pickers show; the bare id for unknown branches"
+        row = self.get(branch_id)
+        return f"{row['branch_id']} - {row['branch_name']}" if row else str(branch_id)
+
+    def labels(self):
+        "Labels of every branch, ordered by name"
+        rows = sorted(self._by_id.values(), key=lambda row: ((row["branch_name"] or "").lower(), row["branch_id"]))
+        return [self.label(row["branch_id"]) for row in rows]
+
+    def complete(self, text, limit=20):
+        "Labels of branches whose id or any word of whose name starts with text"
+        prefix = text.strip().lower()
+        if not prefix:
+            return self.labels()[:limit]
+        found = []
+        position = bisect_left(self._keys, (prefix,))
+        while position < len(self._keys) and len(found) < limit:
+            key, branch_id = self._keys[position]
+            if not key.startswith(prefix):
+                break
+            if branch_id not in found:
+                found.append(branch_id)
+            position += 1
+        return [self.label(branch_id) for branch_id in found]
+
+    def resolve(self, text):
+        "Branch id for '3', '3 - Main Branch' or a unique branch name; None when nothing matches"
+        text = text.strip()
+        head = text.split(" - ", 1)[0].strip()
+        if head.isdigit():
+            branch_id = int(head)
+            return branch_id if branch_id in self._by_id else None
+        matches = [branch_id for branch_id, row in self._by_id.items()
+                   if (row["branch_name"] or "").lower() == text.lower()]
+        return matches[0] if len(matches) == 1 else None
+
+    def fill_names(self, rows):
+        "Copies of rows with branch_name set from their branch_id; rows may be shared with the query cache"
+        return [{**row, "branch_name": self.name(row.get("branch_id"))} for row in rows]
+
@@ -0,0 +1,42 @@
+import threading
+from configuration import DatabaseManager
+
+
+class StatsReconciler:
+    """Periodically rebuilds branch_stats from the base tables
+
+    The counters are kept current incrementally on every write; this job only
+    corrects drift from writes made outside DatabaseManager or lost on failure.
+    """
+
+    def __init__(self, interval=3600.0, days=30, db_factory=None):
+        self.interval = interval
+        self.days = days
+        self.db_factory = db_factory or (lambda: DatabaseManager(create_tables=False))
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="stats-reconciler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _run(self):
+        first = True
+        while first or not self._stop.wait(self.interval):
+            db = None
+            try:
+                db = self.db_factory()
+                # Seed straight away on a database that predates the aggregate tables
+                if not first or not db.has_branch_stats():
+                    db.reconcile_branch_stats(self.days)
+            except Exception as e:
+                print(f"Branch stats reconciliation failed: {e}")
+            finally:
+                first = False
+                if db is not None:
+                    db.close()
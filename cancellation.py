@@ -0,0 +1,49 @@
+import threading
+from mysql.connector import Error
+
+QUERY_INTERRUPTED = 1317    # Query execution was interrupted (KILL QUERY)
+
+
+class QueryCancelled(Error):
+    """Raised by a read whose CancelToken was cancelled; any partial result has been dropped"""
+
+    def __init__(self, msg="Query cancelled"):
+        super().__init__(msg=msg, errno=QUERY_INTERRUPTED)
+
+
+class CancelToken:
+    """Cancellation handle for the reads of one operation
+
+    DatabaseManager.cancellable(token) runs reads under the token. While a
+    statement runs, the token holds a killer for it: KILL QUERY from a side
+    connection on MySQL, interrupt() on SQLite. cancel() may be called from any
+    thread; the lock makes sure a kill never lands on the statement after the
+    one it was meant for.
+    """
+
+    def __init__(self):
+        self.cancelled = False
+        self._killer = None
+        self._lock = threading.Lock()
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+            killer, self._killer = self._killer, None
+            if killer is not None:
+                try:
+                    killer()
+                except Error as e:
+                    print(f"Could not stop the running query: {e}")
+
+    def arm(self, killer):
+        "Called before a statement runs; fails straight away if already cancelled"
+        with self._lock:
+            if self.cancelled:
+                raise QueryCancelled()
+            self._killer = killer
+
+    def disarm(self):
+        "Called once the statement and its fetch are over, however they ended"
+        with self._lock:
+            self._killer = None
@@ -0,0 +1,164 @@
+import queue
+import threading
+import time
+from configuration import DatabaseManager, PRIMARY_KEYS
+
+
+class ChangeSet:
+    """Net changes to one table since the previous poll"""
+
+    def __init__(self, table, rows, deleted_ids, columns=None):
+        self.table = table
+        self.rows = rows                        # Current version of inserted/updated rows
+        self.deleted_ids = deleted_ids          # Tombstones
+        self.columns = columns                  # Columns the writes set; None when unknown
+
+    def __repr__(self):
+        return f"ChangeSet({self.table!r}, {len(self.rows)} rows, {len(self.deleted_ids)} deleted)"
+
+
+class ChangePoller:
+    """Background poller that follows change_log from a watermark
+
+    Only rows changed since the last poll are fetched, so keeping a view fresh
+    costs O(changes) instead of a full table reload. Results are queued for the
+    Tk thread to drain; widgets must never be touched from the poller thread.
+    """
+
+    def __init__(self, start_seq, interval=2.0, gap_timeout=10.0, db_factory=None):
+        self.start_seq = start_seq
+        self.watermark = start_seq
+        self.interval = interval
+        self.gap_timeout = gap_timeout          # How long a missing seq may stay uncommitted before it is skipped
+        self.db_factory = db_factory or (lambda: DatabaseManager(create_tables=False))
+        self.changes = queue.Queue()
+        self._emitted = set()                   # Seqs above the watermark already delivered
+        self._gap_since = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="change-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 5)
+
+    def drain(self):
+        """Return every queued ChangeSet without blocking"""
+        change_sets = []
+        while True:
+            try:
+                change_sets.append(self.changes.get_nowait())
+            except queue.Empty:
+                return change_sets
+
+    def _run(self):
+        db = None
+        while not self._stop.is_set():
+            try:
+                if db is None:
+                    db = self.db_factory()      # Own connection; the GUI's cursor is not thread-safe
+                self.poll_once(db)
+            except Exception as e:
+                print(f"Change poller error: {e}")
+                if db is not None:
+                    try:
+                        db.close()
+                    except Exception:
+                        pass
+                db = None
+            self._stop.wait(self.interval)
+        if db is not None:
+            db.close()
+
+    def poll_once(self, db):
+        """Fetch change records past the watermark and queue net deltas per table"""
+        records = db.get_changes_since(self.watermark)
+        if records is None:
+            return                              # Unreachable; the watermark holds until the next poll
+        fresh = [r for r in records if r["seq"] not in self._emitted]
+
+        self._queue_net_changes(db, fresh)
+        self._emitted.update(r["seq"] for r in fresh)
+        self._advance([r["seq"] for r in records])
+
+    def _queue_net_changes(self, db, records, chunk_size=1000):
+        """Queue one ChangeSet per table with the current version of the changed rows"""
+        # Keep only the last operation per row
+        latest = {}
+        for record in records:
+            latest[(record["table_name"], record["row_id"])] = record["op"]
+
+        by_table = {}
+        for (table, row_id), op in latest.items():
+            upserts, deletes = by_table.setdefault(table, ([], []))
+            (deletes if op == "D" else upserts).append(row_id)
+
+        for table, (upserts, deletes) in by_table.items():
+            rows = []
+            for start in range(0, len(upserts), chunk_size):
+                rows.extend(db.get_rows_by_ids(table, upserts[start:start + chunk_size]))
+            # A row updated then deleted by someone else before we re-read it is a tombstone too
+            found = {row[PRIMARY_KEYS[table]] for row in rows}
+            deletes.extend(i for i in upserts if i not in found)
+            self.changes.put(ChangeSet(table, rows, deletes))
+
+    def replay(self, since):
+        """Queue the net changes between an older watermark and start_seq in the background
+
+        Used after a list was shown from a saved snapshot. Changes at or below
+        start_seq are already committed, so gaps there are rollbacks and are
+        not waited on. Replayed rows are re-read now, so they are never older
+        than anything the regular polls deliver.
+        """
+        thread = threading.Thread(target=self._replay, args=(since, self.start_seq),
+                                  name="change-replay", daemon=True)
+        thread.start()
+        return thread
+
+    def _replay(self, since, until, page_size=5000):
+        db = None
+        try:
+            db = self.db_factory()
+            records = []
+            while since < until and not self._stop.is_set():
+                page = db.get_changes_since(since, page_size)
+                if page is None:
+                    # Nothing is queued, rather than part of what changed since the snapshot
+                    raise RuntimeError("change log unavailable")
+                page = [r for r in page if r["seq"] <= until]
+                if not page:
+                    break
+                records.extend(page)
+                since = page[-1]["seq"]
+            self._queue_net_changes(db, records)
+        except Exception as e:
+            print(f"Change replay error: {e}")
+        finally:
+            if db is not None:
+                db.close()
+
+    def _advance(self, seqs):
+        """Move the watermark over contiguous seqs
+
+        Auto-increment values are handed out before commit, so a gap may be a
+        transaction still in flight. Hold the watermark there until the gap has
+        been open for gap_timeout, after which it is treated as a rollback.
+        """
+        now = time.monotonic()
+        for seq in seqs:
+            if seq == self.watermark + 1:
+                self.watermark = seq
+                self._gap_since = None
+            elif self._gap_since is None:
+                self._gap_since = now
+                break
+            elif now - self._gap_since >= self.gap_timeout:
+                self.watermark = seq
+                self._gap_since = None
+            else:
+                break
+        self._emitted = {seq for seq in self._emitted if seq > self.watermark}
@@ -0,0 +1,178 @@
+import argparse
+import contextlib
+import json
+import sys
+import time
+from configuration import DatabaseManager
+
+
+class Entity:
+    """How one table maps onto DatabaseManager methods"""
+
+    def __init__(self, key, fields, columns, methods):
+        self.key = key
+        self.fields = fields                    # Argument names, in method parameter order
+        self.columns = columns                  # Matching column names in returned rows
+        self.methods = methods                  # action -> DatabaseManager method name
+
+
+ENTITIES = {
+    "contacts": Entity(
+        "id",
+        ("name", "gender", "phone", "email", "address"),
+        ("name", "gender", "phone", "email", "address"),
+        {"list": "get_all_contacts", "search": "searching_contact", "get": "get_contact_through_id",
+         "create": "create_contact", "update": "update_contact", "delete": "delete_contact"},
+    ),
+    "branches": Entity(
+        "branch_id",
+        ("name", "address", "city", "state", "zip_code"),
+        ("branch_name", "branch_address", "branch_city", "branch_state", "branch_zip"),
+        {"list": "get_all_branches", "search": "search_branches", "get": "get_branch_by_id",
+         "create": "insert_branch", "update": "update_branch", "delete": "delete_branch"},
+    ),
+    "employees": Entity(
+        "emp_id",
+        ("name", "dob", "phone", "email", "position", "branch_id"),
+        ("emp_name", "emp_dob", "emp_phone", "emp_email", "emp_position", "branch_id"),
+        {"list": "get_all_employees", "search": "search_employees", "get": "get_employee_by_id",
+         "create": "insert_employee", "update": "update_employee", "delete": "delete_employee",
+         "filter": "filter_employees"},
+    ),
+    "customers": Entity(
+        "cust_id",
+        ("name", "dob", "phone", "email", "address", "branch_id"),
+        ("name", "dob", "phone", "email", "address", "branch_id"),
+        {"list": "get_all_customers", "search": "search_customers", "get": "get_customer_by_id",
+         "create": "insert_customer", "update": "update_customer", "delete": "delete_customer",
+         "filter": "filter_customers"},
+    ),
+}
+
+ACTIONS = ("list", "search", "get", "filter", "create", "update", "delete")
+
+
+class OperationFailed(Exception):
+    """The database refused a write; DatabaseManager has printed its error"""
+
+
+def run_operation(db, entity_name, action, row_id=None, term=None, fields=None, columns=None):
+    """Run one operation and return its JSON-ready result
+
+    Updates are partial: fields that are not given keep their current value.
+    columns narrows list/search/get/filter results to those columns.
+    """
+    entity = ENTITIES[entity_name]
+    if action not in entity.methods:
+        raise ValueError(f"{entity_name} does not support {action}")
+    method = getattr(db, entity.methods[action])
+    fields = fields or {}
+    unknown = set(fields) - set(entity.fields)
+    if unknown:
+        raise ValueError(f"Unknown fields for {entity_name}: {', '.join(sorted(unknown))}")
+    projection = {}
+    if columns:
+        if entity_name == "branches" or action not in ("list", "search", "get", "filter"):
+            raise ValueError(f"--columns is not supported for {entity_name} {action}")
+        projection = {"columns": tuple(columns)}
+
+    if action == "list":
+        return method(**projection)
+    if action in ("search", "filter"):
+        return method(term or "", **projection)
+    if action == "get":
+        return method(row_id, **projection)
+    if action == "create":
+        row_id = method(*[fields.get(f) for f in entity.fields])
+        if row_id is None:
+            # Only looked up on failure, to tell bad input from a database error
+            branch_id = fields.get("branch_id")
+            if branch_id not in (None, "") and db.get_branch_by_id(branch_id) is None:
+                raise ValueError(f"Unknown branch_id: {branch_id}")
+            raise OperationFailed(f"Could not create a row in {entity_name}")
+        return {entity.key: row_id}
+    if action == "update":
+        # Merged from the locked primary row, so a lagging replica cannot undo newer writes
+        current = db.lock_row(entity_name, row_id)
+        if not current:
+            return {"updated": False}
+        values = [fields.get(f, current[c]) for f, c in zip(entity.fields, entity.columns)]
+        return {"updated": method(row_id, *values)}
+    if action == "delete":
+        return {"deleted": method(row_id)}
+    raise ValueError(f"Unknown action: {action}")
+
+
+def _dump(value, out):
+    out.write(json.dumps(value, default=str, separators=(",", ":")))
+    out.write("\n")
+
+
+def run_batch(db, lines, out):
+    """Run JSON-lines operations on one connection; one JSON result line per input line
+
+    Each input line looks like
+    {"entity": "customers", "action": "update", "id": 7, "fields": {"phone": "98765 43210"}}
+    """
+    count = failures = 0
+    start = time.perf_counter()
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        count += 1
+        try:
+            op = json.loads(line)
+            result = run_operation(db, op["entity"], op["action"], op.get("id"),
+                                   op.get("term"), op.get("fields"), op.get("columns"))
+            _dump({"ok": True, "result": result}, out)
+        except Exception as e:
+            failures += 1
+            _dump({"ok": False, "error": str(e)}, out)
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed else 0.0
+    print(f"{count} operations, {failures} failed, {elapsed:.2f}s, {rate:.0f} ops/s", file=sys.stderr)
+    return failures
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Headless access to contacts, branches, employees and customers",
+        epilog="Use 'batch' to read JSON-lines operations from stdin over one connection.",
+    )
+    parser.add_argument("entity", choices=sorted(ENTITIES) + ["batch"])
+    parser.add_argument("action", nargs="?", choices=ACTIONS)
+    parser.add_argument("target", nargs="?", help="row id for get/update/delete, term for search, filter expression for filter")
+    parser.add_argument("--set", action="append", default=[], metavar="FIELD=VALUE",
+                        help="field for create/update, repeatable")
+    parser.add_argument("--columns", help="comma-separated columns to return for list/search/get/filter")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.entity != "batch" and args.action is None:
+        print("An action is required", file=sys.stderr)
+        return 2
+
+    # Results own stdout; DatabaseManager's status prints go to stderr
+    out = sys.stdout
+    with contextlib.redirect_stdout(sys.stderr):
+        db = DatabaseManager()
+        try:
+            if args.entity == "batch":
+                return 1 if run_batch(db, sys.stdin, out) else 0
+            fields = dict(item.split("=", 1) for item in args.set)
+            row_id = args.target if args.action in ("get", "update", "delete") else None
+            columns = [c.strip() for c in args.columns.split(",")] if args.columns else None
+            _dump(run_operation(db, args.entity, args.action, row_id, args.target, fields, columns), out)
+            return 0
+        except Exception as e:
+            _dump({"error": str(e)}, sys.stderr)
+            return 1
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
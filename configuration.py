@@ -1,128 +1,1517 @@
-import mysql.connector                                  #Importing MySQL
-from mysql.connector import Error                       #Importing Error from MySQL to gather the errors in the sql script if any
-import os                                               #Importing os to create operaating system and run the SQL in its suitable environment
-from dotenv import load_dotenv                          
-
-#Loading environment variables from .env files
-load_dotenv()
-
-class DatabaseManager:
-    def __init__(self):
-        "Initialize the database connection using environment variable"
-        try:
-            self.connection = mysql.connector.connect(
-            host = os.getenv("DB_Host","localhost"),
-            user = os.getenv("DB_User","root"),
-            password = os.getenv("DB_Password","J@rvis"),
-            database = os.getenv("DB_name","project")
-            )
-
-            if self.connection.is_connected():         #Checking connection if established
-                self.cursor = self.connection.cursor(dictionary=True)
-                print("Connected to MySQL DataBase.")
-                self._create_table()
-        except Error as e:
-            print(f"Error connecting to MySQL DataBase: {e}")
-            raise
-
-    def _create_table(self):                        #Fucntion to create the tables to take the dataa inputs
-        try:
-            self.cursor.execute("""
-                create table if not exists contacts(
-                    id int auto_increment primary key,
-                    name varchar(100) not null,
-                    gender varchar(20),
-                    phone int,
-                    email varchar(100),
-                    address varchar(200),
-                    created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            self.connection.commit()                #Calling function to create tables
-            print("Tables are created successfully.")
-
-        except Error as e:                          #Calling error to provide error if any found
-            print(f"Error creating tables: {e}")
-            raise
-    
-    def close(self):                            #Closing DataBase connection
-        if hasattr(self,'connection') and self.connection.is_connected():
-            self.cursor.close()                 #Closing cursor to stop database creation and importing entries
-            self.connection.close()             #Closing connection to be disconnected from database
-            print("MySQL connection is closed.")
-
-    def create_contact(self, name, gender=None, phone=None, email=None, address=None):
-        try:
-            #Creaating query to take input for the data fields
-            query = """
-                    INSERT INTO contacts(name, gender, phone, email, address)
-                    VALUES(%s, %s, %s, %s, %s)
-            """
-            self.cursor.execute(query,(name,gender,phone,email,address))
-            self.connection.commit()
-            return self.cursor.lastrowid
-        except Error as e:
-            self.connection.rollback()
-            return None
-        
-    def get_contact_through_id(self, contact_id):
-        "Get a contact by id"
-        query = "SELECT * from contacts where id = %s"
-        self.cursor.execute(query, (contact_id,))
-        return self.cursor.fetchone()
-    
-    def get_all_contacts(self):
-        "Getting aall the contacts"
-        query = "SELECT * from contacts order by name"
-        self.cursor.execute(query)
-        return self.cursor.fetchall()
-    
-    def searching_contact(self, search_term):
-        """Searching contacts by name, phone, or email"""
-        query = """
-            SELECT * from contacts
-            where name like %s or phone like %s or email like %s
-            order by name
-        """
-        parameter = f"%{search_term}%"
-        self.cursor.execute(query,(parameter,parameter,parameter))
-        return self.cursor.fetchall()
-
-    def update_contact(self, contact_id, name=None, gender=None, phone=None, email=None, address=None):        #Function for updating contacts
-        try:
-            current = self.get_contact_through_id(contact_id)
-            if not current:
-                return False
-            
-            name = name if name is not None else current['name']
-            gender = gender if gender is not None else current['gender']
-            phone = phone if phone is not None else current['phone']
-            email = email if email is not None else current['email']
-            address = address if address is not None else current['address']
-
-            query ="""
-                UPDATE contacts
-                set name = %s, gender = %s, phone = %s, email = %s, address = %s
-                where id = %s
-            """
-
-            self.cursor.execute(query,(name, gender, email, phone, address, contact_id))
-            self.connection.commit()
-            return self.cursor.rowcount>0
-        except Error as e:
-            print(f"Error updating contact: {e}")
-            self.connection.rollback()
-            return False
-    
-    def delete_contact(self, contact_id):              #Function to delete the require entries or values
-        """Delete a contact"""
-        try:
-            query = "DELETE from contacts where id = %s"
-            self.cursor.execute(query,(contact_id,))
-            self.connection.commit()
-            return self.cursor.rowcount > 0
-        except Error as e:
-            print(f"Error deleting contact:{e}")
-            self.connection.rollback()
-            return False
-    
\ No newline at end of file
+import mysql.connector                                  #Importing MySQL
+from mysql.connector import Error                       #Importing Error from MySQL to gather the errors in the sql script if any
+import os                                               #Importing os to create operaating system and run the SQL in its suitable environment
+import re
+import contextlib
+from dotenv import load_dotenv                          
+from normalize import normalize_phone, normalize_email
+from query_cache import cached
+from resilience import (CircuitBreaker, DatabaseUnavailable, GuardedCursor, CONNECTION_ERRORS,
+                        is_unhealthy, retry)
+from replicas import make_router
+from filters import compile_filter, ORDER_COLUMNS
+from cancellation import QueryCancelled
+from events import ChangeEvent
+
+#Loading environment variables from .env files
+load_dotenv()
+
+#Rows fetched at a time by cancellable reads, so a cancelled result is dropped early
+CANCEL_FETCH_ROWS = 1000
+
+#Primary key column of each table the GUI and pollers track
+PRIMARY_KEYS = {"contacts": "id", "branches": "branch_id", "employees": "emp_id", "customers": "cust_id"}
+
+#Raw phone/email columns of each table with normalized shadow columns
+NORMALIZED_SOURCES = {
+    "contacts": ("phone", "email"),
+    "employees": ("emp_phone", "emp_email"),
+    "customers": ("phone", "email"),
+}
+
+#Columns bulk_update may set on many rows at once
+BULK_COLUMNS = {
+    "employees": ("emp_name", "emp_dob", "emp_phone", "emp_email", "emp_position", "branch_id"),
+    "customers": ("name", "dob", "phone", "email", "address", "branch_id"),
+}
+
+#Tables with an archive copy and the column their age is measured by
+ARCHIVE_POLICIES = {"contacts": "created_date", "customers": "created_date"}
+
+#Search terms that are a complete email or phone number go to the shadow column indexes
+FULL_EMAIL = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+PHONE_LIKE = re.compile(r"^\+?[\d\s().-]{10,}$")
+
+#Columns the list views display; wide and internal columns are read when a row is opened
+LIST_COLUMNS = {
+    "contacts": ("id", "name", "phone", "email"),
+    "employees": ("emp_id", "emp_name", "emp_dob", "emp_phone", "emp_email", "emp_position",
+                  "branch_id", "branch_name"),
+    "customers": ("cust_id", "name", "dob", "phone", "email", "branch_id", "branch_name"),
+}
+
+#Columns the single-row update statements set, published with their change events
+UPDATE_COLUMNS = {
+    "branches": ("branch_name", "branch_address", "branch_city", "branch_state", "branch_zip"),
+    "employees": ("emp_name", "emp_dob", "emp_phone", "emp_email", "emp_position", "branch_id",
+                  "phone_norm", "email_norm"),
+    "customers": ("name", "dob", "phone", "email", "address", "branch_id", "phone_norm", "email_norm"),
+    "contacts": ("name", "gender", "phone", "email", "address", "phone_norm", "email_norm"),
+}
+
+#Columns the substring searches match; results are ordered by the first one
+SEARCH_COLUMNS = {
+    "contacts": ("name", "phone", "email"),
+    "branches": ("branch_name", "branch_city", "branch_state"),
+    "employees": ("emp_name", "emp_email", "emp_position"),
+    "customers": ("name", "email", "phone"),
+}
+
+#Row queries used to re-read changed rows by primary key (table -> (select, key column))
+ROW_QUERIES = {
+    "contacts": ("SELECT * from contacts", "id"),
+    "branches": ("SELECT * from branches", "branch_id"),
+    "employees": ("""SELECT e.*, b.branch_name from employees e
+                     left join branches b on b.branch_id = e.branch_id""", "e.emp_id"),
+    "customers": ("""SELECT c.*, b.branch_name from customers c
+                     left join branches b on b.branch_id = c.branch_id""", "c.cust_id"),
+    "contacts_archive": ("SELECT * from contacts_archive", "id"),
+    "customers_archive": ("""SELECT c.*, b.branch_name from customers_archive c
+                             left join branches b on b.branch_id = c.branch_id""", "c.cust_id"),
+}
+
+def _with_branch_id(columns):
+    "A projection that can still be filtered by branch"
+    if columns is None or "branch_id" in columns:
+        return columns
+    return tuple(columns) + ("branch_id",)
+
+class DatabaseManager:
+    def __init__(self, create_tables=True, cache=None, allow_offline=False):
+        """Initialize the database connection using environment variable
+
+        With allow_offline a failed first connection leaves the manager in degraded
+        mode: calls fail fast until the background probe reaches the server.
+        """
+        self._init_hooks(cache)
+        self.connection = None
+        self.cursor = GuardedCursor(self)
+        self.breaker = CircuitBreaker(self._probe,
+                                      failure_threshold=int(os.getenv("DB_BREAKER_THRESHOLD", "3")),
+                                      probe_interval=float(os.getenv("DB_BREAKER_PROBE_INTERVAL", "5")))
+        self._connection_lost = False
+        self._tables_pending = create_tables
+        try:
+            self._connect()
+        except Error as e:
+            print(f"Error connecting to MySQL DataBase: {e}")
+            if not allow_offline:
+                raise
+            self.breaker.trip(e)
+        #Optional read replicas from DB_REPLICAS; writes and locking reads stay on DB_Host
+        self.replicas = make_router(self._open_connection)
+
+    def _open_connection(self, host=None, port=None, **options):
+        "One connection with bounded connect, statement and lock wait times; options go to connect()"
+        connection = mysql.connector.connect(
+        host = host or os.getenv("DB_Host","localhost"),
+        port = port or int(os.getenv("DB_Port","3306")),
+        user = os.getenv("DB_User","root"),
+        password = os.getenv("DB_Password","J@rvis"),
+        database = os.getenv("DB_name","project"),
+        connection_timeout = int(os.getenv("DB_CONNECT_TIMEOUT", "5")),
+        **options
+        )
+        cursor = connection.cursor(dictionary=True)
+        #Reads running longer than this are aborted by the server (error 3024)
+        cursor.execute("SET SESSION max_execution_time = %s", (int(os.getenv("DB_QUERY_TIMEOUT_MS", "10000")),))
+        cursor.execute("SET SESSION innodb_lock_wait_timeout = %s", (int(os.getenv("DB_LOCK_WAIT_TIMEOUT", "10")),))
+        return connection, cursor
+
+    def _connect(self):
+        "(Re)connect with jittered retries, creating the tables on the first success if asked"
+        self.connection, cursor = retry(self._open_connection, self.retries)
+        self.cursor.attach(cursor)
+        self._connection_lost = False
+        print("Connected to MySQL DataBase.")
+        if self._tables_pending:
+            self._create_table()
+            self._tables_pending = False
+
+    def _probe(self):
+        "Health check run by the circuit breaker on its own short-lived connection"
+        connection, cursor = self._open_connection()
+        try:
+            cursor.execute("SELECT 1")
+            cursor.fetchall()
+        finally:
+            connection.close()
+
+    def _before_query(self):
+        "Fail fast while the breaker is open; reconnect a dropped connection between transactions"
+        if not self.breaker.allow():
+            raise DatabaseUnavailable(msg=f"Database unavailable: {self.breaker.last_error}")
+        if self.connection is None or self._connection_lost:
+            if self._written_tables:
+                raise DatabaseUnavailable(msg="Connection lost in the middle of a write")
+            try:
+                self._connect()
+            except Error as e:
+                self.breaker.trip(e)
+                raise
+
+    def _query_failed(self, error):
+        if getattr(error, "errno", None) in CONNECTION_ERRORS:
+            self._connection_lost = True
+        if is_unhealthy(error):
+            self.breaker.record_failure(error)
+
+    def _init_hooks(self, cache=None):
+        "Post-commit hooks shared by every backend"
+        self.cache = cache                              #Optional QueryCache shared by the read methods
+        self.audit = None                               #Optional AuditLog; before/after rows are captured only when set
+        self.audit_actor = None
+        self.events = None                              #Optional EventBus told about every committed write
+        self._written_tables = set()
+        self._audit_pending = []
+        self._events_pending = []
+        self.breaker = None                             #CircuitBreaker on backends that reach a server
+        self.replicas = None                            #Optional ReplicaRouter that serves plain reads
+        self._read_floor = 0                            #Newest change seq this session wrote or saw
+        self._pending_seq = 0
+        self._pinned = False                            #A locking read opened a transaction on the primary
+        self._column_names = {}                         #table -> column names, for checking projections
+        self._cancel_token = None                       #CancelToken of the reads running under cancellable()
+        self.retries = int(os.getenv("DB_RETRIES", "3"))
+
+    def _create_table(self):                        #Fucntion to create the tables to take the dataa inputs
+        try:
+            self.cursor.execute("""
+                create table if not exists contacts(
+                    id int auto_increment primary key,
+                    name varchar(100) not null,
+                    gender varchar(20),
+                    phone varchar(20),
+                    email varchar(100),
+                    address varchar(200),
+                    created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+                )
+            """)
+            self.cursor.execute("""
+                create table if not exists branches(
+                    branch_id int auto_increment primary key,
+                    branch_name varchar(100) not null,
+                    branch_address varchar(200),
+                    branch_city varchar(100),
+                    branch_state varchar(100),
+                    branch_zip varchar(10),
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+                )
+            """)
+            self.cursor.execute("""
+                create table if not exists employees(
+                    emp_id int auto_increment primary key,
+                    emp_name varchar(100) not null,
+                    emp_dob date,
+                    emp_phone varchar(20),
+                    emp_email varchar(100),
+                    emp_position varchar(50),
+                    branch_id int,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                    index idx_employees_branch (branch_id)
+                )
+            """)
+            self.cursor.execute("""
+                create table if not exists customers(
+                    cust_id int auto_increment primary key,
+                    name varchar(100) not null,
+                    dob date,
+                    phone varchar(20),
+                    email varchar(100),
+                    address varchar(200),
+                    branch_id int,
+                    created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                    index idx_customers_branch (branch_id)
+                )
+            """)
+            #Every write appends here; seq is the watermark pollers resume from
+            self.cursor.execute("""
+                create table if not exists change_log(
+                    seq bigint auto_increment primary key,
+                    table_name varchar(30) not null,
+                    row_id int not null,
+                    op char(1) not null,
+                    changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            #Per-branch aggregates, maintained on every employee/customer write
+            self.cursor.execute("""
+                create table if not exists branch_stats(
+                    branch_id int primary key,
+                    employee_count int not null default 0,
+                    customer_count int not null default 0
+                )
+            """)
+            self.cursor.execute("""
+                create table if not exists branch_daily_new_customers(
+                    branch_id int not null,
+                    day date not null,
+                    new_customers int not null default 0,
+                    primary key (branch_id, day)
+                )
+            """)
+            #Before/after images of committed writes, filled in the background by audit.py
+            self.cursor.execute("""
+                create table if not exists audit_log(
+                    id bigint auto_increment primary key,
+                    logged_at datetime(6) not null,
+                    actor varchar(100),
+                    table_name varchar(30) not null,
+                    row_id int not null,
+                    op char(1) not null,
+                    before_data json,
+                    after_data json,
+                    index idx_audit_log_row (table_name, row_id)
+                )
+            """)
+            #Older contacts tables were created before updated_at existed
+            self._ensure_column("contacts", "updated_at",
+                                "TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP")
+            #An int phone overflows on ten digit numbers and cannot keep a leading + or 0
+            if self._column_type("contacts", "phone") == "int":
+                self.cursor.execute("alter table contacts modify phone varchar(20)")
+            #Normalized shadow columns for indexed exact lookups (filled by backfill.py for old rows)
+            for table in NORMALIZED_SOURCES:
+                self._ensure_column(table, "phone_norm", "varchar(15)")
+                self._ensure_column(table, "email_norm", "varchar(100)")
+                self._ensure_index(table, f"idx_{table}_phone_norm", "phone_norm")
+                self._ensure_index(table, f"idx_{table}_email_norm", "email_norm")
+            #Branch-scoped lists read one branch's index range, already in display order
+            self._ensure_index("employees", "idx_employees_branch_name", "branch_id, emp_name")
+            self._ensure_index("customers", "idx_customers_branch_name", "branch_id, name")
+            #Columns the filter language compares on (filters.FILTER_FIELDS)
+            self._ensure_index("customers", "idx_customers_name", "name")
+            self._ensure_index("customers", "idx_customers_dob", "dob")
+            self._ensure_index("customers", "idx_customers_created", "created_date")
+            self._ensure_index("employees", "idx_employees_name", "emp_name")
+            self._ensure_index("employees", "idx_employees_position", "emp_position")
+            self._ensure_index("employees", "idx_employees_dob", "emp_dob")
+            self._ensure_index("branches", "idx_branches_city", "branch_city")
+            self._create_archive_tables()
+            self.connection.commit()                #Calling function to create tables
+            print("Tables are created successfully.")
+
+        except Error as e:                          #Calling error to provide error if any found
+            print(f"Error creating tables: {e}")
+            raise
+
+    def _column_type(self, table, column):
+        "Data type of a column in the current database, or None if it does not exist"
+        self.cursor.execute("""
+            SELECT data_type from information_schema.columns
+            where table_schema = database() and table_name = %s and column_name = %s
+        """, (table, column))
+        row = self.cursor.fetchone()
+        return row["data_type"].lower() if row else None
+
+    def _ensure_column(self, table, column, definition):
+        "Add a column to an existing table unless it is already there"
+        if self._column_type(table, column) is None:
+            self.cursor.execute(f"alter table {table} add column {column} {definition}")
+
+    def _table_columns(self, table):
+        "Column names of a table in definition order"
+        rows = self._fetch_all("""
+            SELECT column_name as name from information_schema.columns
+            where table_schema = database() and table_name = %s order by ordinal_position
+        """, (table,))
+        return [row["name"] for row in rows]
+
+    def _projection(self, table, columns, alias=""):
+        """Select list for columns, or every column when columns is None
+
+        branch_name comes from the branches join (or _with_branch_name) and is
+        left to the caller; other names are checked against the table.
+        """
+        if columns is None:
+            return f"{alias}*"
+        if table not in self._column_names:
+            self._column_names[table] = set(self._table_columns(table))
+        known = self._column_names[table]
+        if "branch_id" in known:
+            known = known | {"branch_name"}
+        unknown = [column for column in columns if column not in known]
+        if unknown or not columns:
+            raise ValueError(f"Unknown columns for {table}: {', '.join(unknown) or '(none given)'}")
+        if table.endswith("_archive") and "archived_at" not in columns:
+            columns = tuple(columns) + ("archived_at",)     #Marks archived rows in mixed results
+        return ", ".join(f"{alias}{column}" for column in columns if column != "branch_name")
+
+    def _select(self, table, columns=None):
+        "The ROW_QUERIES select for table, narrowed to columns"
+        select, key = ROW_QUERIES[table]
+        if columns is None:
+            return select
+        alias = key.split(".")[0] + "." if "." in key else ""
+        fields = self._projection(table, columns, alias)
+        source = select[select.index(' from '):]
+        if "branch_name" in columns:
+            fields += ", b.branch_name"
+        else:
+            # No per-row join when the caller resolves branch names itself (BranchDirectory)
+            source = source.split("left join branches")[0].rstrip()
+        return f"SELECT {fields}{source}"
+
+    def _create_archive_tables(self):
+        "Archive copies of the aged tables, kept in step with columns added to the hot table"
+        for table in ARCHIVE_POLICIES:
+            archive = f"{table}_archive"
+            self.cursor.execute(f"create table if not exists {archive} like {table}")
+            self._ensure_column(archive, "archived_at", "TIMESTAMP DEFAULT CURRENT_TIMESTAMP")
+            missing = self._fetch_all("""
+                SELECT h.column_name as name, h.column_type as definition
+                from information_schema.columns h
+                left join information_schema.columns a
+                    on a.table_schema = h.table_schema and a.table_name = %s and a.column_name = h.column_name
+                where h.table_schema = database() and h.table_name = %s and a.column_name is null
+            """, (archive, table))
+            for column in missing:
+                self.cursor.execute(f"alter table {archive} add column {column['name']} {column['definition']}")
+
+    def _ensure_index(self, table, index, columns):
+        "Create a secondary index unless one with that name exists"
+        self.cursor.execute("""
+            SELECT count(*) as found from information_schema.statistics
+            where table_schema = database() and table_name = %s and index_name = %s
+        """, (table, index))
+        if self.cursor.fetchone()["found"] == 0:
+            self.cursor.execute(f"create index {index} on {table} ({columns})")
+    
+    def close(self):                            #Closing DataBase connection
+        if getattr(self,'replicas',None) is not None:
+            self.replicas.close()
+        if getattr(self,'connection',None) is not None and self.connection.is_connected():
+            self.cursor.close()                 #Closing cursor to stop database creation and importing entries
+            self.connection.close()             #Closing connection to be disconnected from database
+            print("MySQL connection is closed.")
+
+    def _fetch_all(self, query, params=()):
+        "Run a read query and return every row"
+        return self._read(query, params, self._fetch_rows)
+
+    def _fetch_one(self, query, params=()):
+        "Run a read query and return the first row"
+        return self._read(query, params, lambda cursor: cursor.fetchone())
+
+    def _read(self, query, params, fetch):
+        """Serve a read from a caught-up replica when possible, else from the primary
+
+        Reads inside a write stay on the primary and are not retried, since a
+        retry after a lost connection would split the transaction.
+        """
+        token = self._cancel_token
+        def run(cursor):
+            if token is None:
+                cursor.execute(query, params)
+                return fetch(cursor)
+            token.arm(self._query_killer(cursor))
+            try:
+                cursor.execute(query, params)
+                return fetch(cursor)
+            except Error as e:
+                if token.cancelled and not isinstance(e, QueryCancelled):
+                    raise QueryCancelled() from e
+                raise
+            finally:
+                token.disarm()
+        if "for update" in query:
+            self._pinned = True
+        if self._written_tables or self._pinned:
+            return run(self.cursor)
+        if self.replicas is not None:
+            served, rows = self.replicas.read(run, self._read_floor)
+            if served:
+                return rows
+        return retry(lambda: run(self.cursor), self.retries)
+
+    def _fetch_rows(self, cursor):
+        "fetchall(), except under a cancel token: chunk by chunk, dropping the rows once it is cancelled"
+        token = self._cancel_token
+        if token is None:
+            return cursor.fetchall()
+        rows = []
+        while True:
+            chunk = cursor.fetchmany(CANCEL_FETCH_ROWS)
+            if not chunk:
+                return rows
+            if token.cancelled:
+                #Freed now rather than when the traceback that still references them is
+                rows.clear()
+                del chunk
+                #Read what the server sent before the kill, so the connection stays usable
+                while cursor.fetchmany(CANCEL_FETCH_ROWS):
+                    pass
+                raise QueryCancelled()
+            rows.extend(chunk)
+
+    @contextlib.contextmanager
+    def cancellable(self, token):
+        """Run the reads inside the block under token; token.cancel() from another thread stops them
+
+        A cancelled read raises QueryCancelled. Only one operation at a time
+        should use a manager, so the token is not per thread.
+        """
+        previous, self._cancel_token = self._cancel_token, token
+        try:
+            yield token
+        finally:
+            self._cancel_token = previous
+
+    def _query_killer(self, cursor):
+        "Stops the statement running on cursor: KILL QUERY for its connection, sent from a side connection"
+        host = port = None
+        connection = self.connection
+        if self.replicas is not None:
+            for replica in self.replicas.replicas:
+                if cursor is replica.cursor:
+                    connection, host, port = replica.connection, replica.host, replica.port
+        thread_id = connection.connection_id
+
+        def kill():
+            side, side_cursor = self._open_connection(host, port)
+            try:
+                side_cursor.execute(f"KILL QUERY {int(thread_id)}")
+            finally:
+                side.close()
+        return kill
+
+    def follow(self, session):
+        """Read on behalf of another manager's session from a second connection
+
+        Shares its query cache and waits for replicas that have its writes, so a
+        background read sees what the session has just saved.
+        """
+        self.cache = session.cache
+        self._saw_seq(session._read_floor)
+
+    def _saw_seq(self, seq):
+        "Later reads only go to replicas that have applied this change"
+        self._read_floor = max(self._read_floor, seq or 0)
+
+    def _audit_before(self, table, row_id, current=None):
+        "The row as it is before a write, when auditing is on; current is that row if the caller locked it already"
+        if self.audit is None:
+            return None
+        if current is not None:
+            return current
+        #Locking read: the current row on the primary, not an older snapshot or a replica
+        return self._fetch_one(f"SELECT * from {table} where {PRIMARY_KEYS[table]} = %s for update", (row_id,))
+
+    def _log_change(self, table, row_id, op, before=None, columns=None):
+        "Record a write in change_log; committed together with the write itself"
+        self.cursor.execute(
+            "INSERT INTO change_log(table_name, row_id, op) VALUES(%s, %s, %s)",
+            (table, row_id, op)
+        )
+        self._pending_seq = max(self._pending_seq, self.cursor.lastrowid or 0)
+        self._written_tables.add(table)
+        if self.audit is not None:
+            after = None if op == "D" else self._fetch_one(
+                f"SELECT * from {table} where {PRIMARY_KEYS[table]} = %s", (row_id,))
+            self._audit_pending.append((table, row_id, op, before, after))
+        if self.events is not None:
+            self._events_pending.append(ChangeEvent(table, op, (row_id,), columns))
+
+    def _log_changes(self, table, ids, op, befores=None, columns=None):
+        "Record one operation on many rows; befores maps id -> row when auditing"
+        self.cursor.executemany(
+            "INSERT INTO change_log(table_name, row_id, op) VALUES(%s, %s, %s)",
+            [(table, row_id, op) for row_id in ids]
+        )
+        self._pending_seq = max(self._pending_seq, self.cursor.lastrowid or 0)
+        self._written_tables.add(table)
+        if self.audit is not None:
+            key = PRIMARY_KEYS[table]
+            afters = {} if op == "D" else {row[key]: row for row in self._fetch_all(
+                f"SELECT * from {table} where {key} in ({', '.join(['%s'] * len(ids))})", tuple(ids))}
+            befores = befores or {}
+            for row_id in ids:
+                self._audit_pending.append((table, row_id, op, befores.get(row_id), afters.get(row_id)))
+        if self.events is not None:
+            self._events_pending.append(ChangeEvent(table, op, ids, columns))
+
+    def _commit(self):
+        "Commit the current write, then run the hooks for what it changed"
+        self.connection.commit()
+        written, self._written_tables = self._written_tables, set()
+        pending, self._audit_pending = self._audit_pending, []
+        events, self._events_pending = self._events_pending, []
+        seq, self._pending_seq = self._pending_seq, 0
+        self._pinned = False
+        #Read-your-writes: this session's later reads wait for a replica that has the write
+        if self.replicas is not None and written:
+            self._saw_seq(seq or self._primary_seq())
+        #After the commit, so a concurrent read cannot re-cache the old rows
+        if self.cache is not None and written:
+            self.cache.invalidate(*written)
+        #Only committed writes are audited; the entries are written in the background
+        if self.audit is not None:
+            for table, row_id, op, before, after in pending:
+                self.audit.log(self.audit_actor, table, row_id, op, before, after)
+        #Last, so subscribers that re-read the changed rows see them committed and uncached
+        if self.events is not None:
+            for event in events:
+                self.events.publish(event)
+
+    def _rollback(self):
+        try:
+            self.connection.rollback()
+        except Error as e:
+            print(f"Rollback failed, the server discards the transaction with the connection: {e}")
+        self._written_tables = set()
+        self._audit_pending = []
+        self._events_pending = []
+        self._pending_seq = 0
+        self._pinned = False
+
+    def _primary_seq(self):
+        "Newest change seq on the primary, for writes that do not log changes themselves"
+        self.cursor.execute("SELECT coalesce(max(seq), 0) as seq from change_log")
+        return self.cursor.fetchone()["seq"]
+
+    # ======================
+    # CHANGE WATERMARKS
+    # ======================
+
+    def _end_snapshot(self):
+        "End the open read transaction so other sessions' commits are visible"
+        if self.breaker is not None:
+            self._before_query()                #Reconnects, or raises DatabaseUnavailable while offline
+        self.connection.commit()
+
+    def get_latest_change_seq(self):
+        "Current watermark, or None while the database cannot be reached; take it before a full load"
+        try:
+            self._end_snapshot()
+            row = self._fetch_one("SELECT coalesce(max(seq), 0) as seq from change_log")
+        except Error as e:
+            print(f"Error reading the change log: {e}")
+            return None
+        self._saw_seq(row["seq"])               #Rows re-read after this watermark are at least as new
+        return row["seq"]
+
+    def get_oldest_change_seq(self):
+        "Oldest change record still kept, or None; a watermark below it missed pruned changes"
+        row = self._fetch_one("SELECT min(seq) as seq from change_log")
+        return row["seq"]
+
+    def get_changes_since(self, seq, limit=1000):
+        "Change records after a watermark, oldest first; None while the database cannot be reached"
+        try:
+            self._end_snapshot()
+            changes = self._fetch_all("""
+                SELECT seq, table_name, row_id, op from change_log
+                where seq > %s order by seq limit %s
+            """, (seq, limit))
+        except Error as e:
+            print(f"Error reading the change log: {e}")
+            return None
+        if changes:
+            self._saw_seq(changes[-1]["seq"])
+        return changes
+
+    def get_rows_by_ids(self, table, ids):
+        "Re-read the current version of changed rows in one query"
+        if not ids:
+            return []
+        select, key = ROW_QUERIES[table]
+        placeholders = ", ".join(["%s"] * len(ids))
+        return self._fetch_all(f"{select} where {key} in ({placeholders})", tuple(ids))
+
+    def lock_row(self, table, row_id):
+        """The current row on the primary, locked until the next commit or rollback
+
+        For read-modify-write callers that merge a partial update into the row.
+        Nothing stays locked when the row does not exist.
+        """
+        row = self._fetch_one(f"SELECT * from {table} where {PRIMARY_KEYS[table]} = %s for update", (row_id,))
+        if row is None:
+            self._rollback()
+        return row
+
+    def get_page(self, table, after_id=0, limit=100):
+        "One keyset page of full rows in primary key order, for paginated API listings"
+        select, key = ROW_QUERIES[table]
+        return self._fetch_all(f"{select} where {key} > %s order by {key} limit %s", (after_id, limit))
+
+    def search_page(self, table, search_term, after=None, limit=100):
+        """One keyset page of search results in (name, primary key) order
+
+        after is the (name, id) of the last row of the previous page, so a page
+        costs the same however deep it is. Whole phone numbers and emails go to
+        the indexed exact lookup, as in the search methods.
+        """
+        select, qualified_key = ROW_QUERIES[table]
+        key = PRIMARY_KEYS[table]
+        alias = qualified_key[:-len(key)]
+        name = SEARCH_COLUMNS[table][0]
+        exact = None if table == "branches" else self._exact_lookup(table, search_term)
+        if exact is not None:
+            rows = sorted(exact, key=lambda row: (row[name], row[key]))
+            if after is not None:
+                rows = [row for row in rows if (row[name], row[key]) > tuple(after)]
+            return rows[:limit]
+        conditions = " or ".join(f"{alias}{column} like %s" for column in SEARCH_COLUMNS[table])
+        params = [f"%{search_term}%"] * len(SEARCH_COLUMNS[table])
+        if after is not None:
+            conditions = f"({conditions}) and ({alias}{name} > %s or ({alias}{name} = %s and {alias}{key} > %s))"
+            params += [after[0], after[0], after[1]]
+        return self._fetch_all(f"{select} where {conditions} order by {alias}{name}, {alias}{key} limit %s",
+                               tuple(params) + (limit,))
+
+    def iter_table(self, table, columns, batch_size=10000):
+        "Stream rows in primary key order, one keyset-paginated batch at a time"
+        key = PRIMARY_KEYS[table]
+        select = ", ".join([key] + [c for c in columns if c != key])
+        last_id = 0
+        while True:
+            rows = self._fetch_all(
+                f"SELECT {select} from {table} where {key} > %s order by {key} limit %s",
+                (last_id, batch_size)
+            )
+            if not rows:
+                return
+            yield from rows
+            last_id = rows[-1][key]
+
+    def backfill_normalized_columns(self, table, batch_size=1000):
+        "Fill phone_norm/email_norm for existing rows, committing one batch at a time"
+        key = PRIMARY_KEYS[table]
+        phone_column, email_column = NORMALIZED_SOURCES[table]
+        converted = 0
+        last_id = 0
+        while True:
+            rows = self._fetch_all(f"""
+                SELECT {key}, {phone_column}, {email_column} from {table}
+                where {key} > %s order by {key} limit %s
+            """, (last_id, batch_size))
+            if not rows:
+                return converted
+            try:
+                self.cursor.executemany(
+                    f"UPDATE {table} set phone_norm = %s, email_norm = %s where {key} = %s",
+                    [(normalize_phone(row[phone_column]), normalize_email(row[email_column]), row[key])
+                     for row in rows]
+                )
+                self._written_tables.add(table)         #Exact lookups read the shadow columns
+                self._commit()
+            except Error as e:
+                print(f"Error backfilling {table}: {e}")
+                self._rollback()
+                raise
+            converted += len(rows)
+            last_id = rows[-1][key]
+
+    def _find_by_normalized(self, table, column, value, columns=None):
+        "Exact match on an indexed shadow column; None input matches nothing"
+        if value is None:
+            return []
+        _, key = ROW_QUERIES[table]
+        prefix = key.split(".")[0] + "." if "." in key else ""
+        return self._fetch_all(f"{self._select(table, columns)} where {prefix}{column} = %s", (value,))
+
+    def _exact_lookup(self, table, search_term, columns=None):
+        "Indexed exact match when a search term is a whole phone number or email, else None"
+        term = search_term.strip()
+        if FULL_EMAIL.match(term):
+            return self._find_by_normalized(table, "email_norm", normalize_email(term), columns)
+        if PHONE_LIKE.match(term) and normalize_phone(term):
+            return self._find_by_normalized(table, "phone_norm", normalize_phone(term), columns)
+        return None
+
+    def prune_change_log(self, older_than_days=7):
+        "Drop change records no poller can still need"
+        try:
+            self.cursor.execute(
+                "DELETE from change_log where changed_at < now() - interval %s day",
+                (older_than_days,)
+            )
+            self._commit()
+            return self.cursor.rowcount
+        except Error as e:
+            print(f"Error pruning change log: {e}")
+            self._rollback()
+            return 0
+
+    # ======================
+    # ARCHIVE
+    # ======================
+
+    def archive_batch(self, table, older_than_days, batch_size=500):
+        "Move one batch of rows older than the threshold into the archive table; returns rows moved"
+        key = PRIMARY_KEYS[table]
+        age_column = ARCHIVE_POLICIES[table]
+        extra = ", branch_id, date(created_date) as created_day" if table == "customers" else ""
+        try:
+            rows = self._fetch_all(f"""
+                SELECT {key}{extra} from {table}
+                where {age_column} < now() - interval %s day
+                order by {key} limit %s for update
+            """, (older_than_days, batch_size))
+            if not rows:
+                self._rollback()
+                return 0
+            ids = tuple(row[key] for row in rows)
+            placeholders = ", ".join(["%s"] * len(ids))
+            columns = ", ".join(self._table_columns(table))
+            self.cursor.execute(f"""
+                INSERT INTO {table}_archive({columns}, archived_at)
+                SELECT {columns}, now() from {table} where {key} in ({placeholders})
+            """, ids)
+            self.cursor.execute(f"DELETE from {table} where {key} in ({placeholders})", ids)
+            self._log_changes(table, ids, "D")             #Archived rows leave the open lists
+            if table == "customers":
+                #Aggregates describe the hot table, as reconcile_branch_stats does
+                per_branch, per_day = {}, {}
+                for row in rows:
+                    per_branch[row["branch_id"]] = per_branch.get(row["branch_id"], 0) + 1
+                    bucket = (row["branch_id"], row["created_day"])
+                    per_day[bucket] = per_day.get(bucket, 0) + 1
+                for branch_id, count in per_branch.items():
+                    self._bump_branch_stats(branch_id, customers=-count)
+                for (branch_id, day), count in per_day.items():
+                    self._bump_new_customers(branch_id, -count, day)
+            self._written_tables.add(f"{table}_archive")
+            self._commit()
+            return len(ids)
+        except Error as e:
+            print(f"Error archiving {table}: {e}")
+            self._rollback()
+            raise
+
+    def _with_archive(self, rows, archived, sort_column):
+        "Hot and archived matches in one list; archived rows carry archived_at"
+        return sorted(list(rows) + list(archived), key=lambda row: row[sort_column] or "")
+
+    # ======================
+    # BRANCH AGGREGATES
+    # ======================
+
+    def _bump_branch_stats(self, branch_id, employees=0, customers=0):
+        "Adjust one branch's counters inside the caller's transaction"
+        if branch_id in (None, ""):
+            return
+        self.cursor.execute("""
+            INSERT INTO branch_stats(branch_id, employee_count, customer_count)
+            VALUES(%s, %s, %s)
+            on duplicate key update
+                employee_count = employee_count + values(employee_count),
+                customer_count = customer_count + values(customer_count)
+        """, (branch_id, employees, customers))
+
+    def _bump_new_customers(self, branch_id, delta, day=None):
+        "Adjust the new-customer bucket of one branch and day (today on the server by default)"
+        if branch_id in (None, ""):
+            return
+        self.cursor.execute("""
+            INSERT INTO branch_daily_new_customers(branch_id, day, new_customers)
+            VALUES(%s, coalesce(%s, curdate()), %s)
+            on duplicate key update new_customers = new_customers + values(new_customers)
+        """, (branch_id, day, delta))
+
+    @cached("branches", "branch_stats", "employees", "customers")     #Counters move with every employee/customer write
+    def get_branch_dashboard(self, days=30):
+        "Counts and new-customer rate per branch, read from the aggregate tables only"
+        return self._fetch_all("""
+            SELECT b.branch_id, b.branch_name,
+                   coalesce(s.employee_count, 0) as employee_count,
+                   coalesce(s.customer_count, 0) as customer_count,
+                   coalesce(n.new_customers, 0) as new_customers
+            from branches b
+            left join branch_stats s on s.branch_id = b.branch_id
+            left join (
+                SELECT branch_id, sum(new_customers) as new_customers
+                from branch_daily_new_customers
+                where day >= curdate() - interval %s day
+                group by branch_id
+            ) n on n.branch_id = b.branch_id
+            order by b.branch_name
+        """, (days,))
+
+    def has_branch_stats(self):
+        "Whether the aggregate table has been populated at all"
+        return self._fetch_one("SELECT count(*) as found from branch_stats")["found"] > 0
+
+    def reconcile_branch_stats(self, days=30):
+        "Rebuild the aggregates from the base tables to correct any drift"
+        try:
+            self.cursor.execute("DELETE from branch_stats")
+            self.cursor.execute("""
+                INSERT INTO branch_stats(branch_id, employee_count, customer_count)
+                SELECT branch_id, sum(employees), sum(customers) from (
+                    SELECT branch_id, count(*) as employees, 0 as customers
+                    from employees where branch_id is not null group by branch_id
+                    union all
+                    SELECT branch_id, 0, count(*)
+                    from customers where branch_id is not null group by branch_id
+                ) counts group by branch_id
+            """)
+            self.cursor.execute("DELETE from branch_daily_new_customers")
+            self.cursor.execute("""
+                INSERT INTO branch_daily_new_customers(branch_id, day, new_customers)
+                SELECT branch_id, date(created_date), count(*) from customers
+                where branch_id is not null and created_date >= curdate() - interval %s day
+                group by branch_id, date(created_date)
+            """, (days,))
+            self._written_tables.add("branch_stats")
+            self._commit()
+            return True
+        except Error as e:
+            print(f"Error reconciling branch stats: {e}")
+            self._rollback()
+            return False
+
+    # ======================
+    # CONTACTS
+    # ======================
+
+    def create_contact(self, name, gender=None, phone=None, email=None, address=None):
+        try:
+            #Creaating query to take input for the data fields
+            query = """
+                    INSERT INTO contacts(name, gender, phone, email, address, phone_norm, email_norm)
+                    VALUES(%s, %s, %s, %s, %s, %s, %s)
+            """
+            self.cursor.execute(query,(name,gender,phone,email,address,
+                                       normalize_phone(phone),normalize_email(email)))
+            contact_id = self.cursor.lastrowid
+            self._log_change("contacts", contact_id, "I")
+            self._commit()
+            return contact_id
+        except Error as e:
+            self._rollback()
+            return None
+        
+    def get_contact_through_id(self, contact_id, columns=None):
+        "Get a contact by id, only the given columns when asked"
+        query = f"SELECT {self._projection('contacts', columns)} from contacts where id = %s"
+        return self._fetch_one(query, (contact_id,))
+    
+    @cached("contacts")
+    def get_all_contacts(self, columns=None):
+        "Getting aall the contacts, only the given columns when asked"
+        query = f"SELECT {self._projection('contacts', columns)} from contacts order by name"
+        return self._fetch_all(query)
+    
+    @cached("contacts", "contacts_archive", fold_case=True)
+    def searching_contact(self, search_term, include_archive=False, columns=None):
+        """Searching contacts by name, phone, or email, in the archive too when asked"""
+        rows = self._search_contacts_in("contacts", search_term, columns)
+        if include_archive:
+            rows = self._with_archive(rows, self._search_contacts_in("contacts_archive", search_term, columns),
+                                      "name")
+        return rows
+
+    def _search_contacts_in(self, table, search_term, columns=None):
+        exact = self._exact_lookup(table, search_term, columns)
+        if exact is not None:
+            return exact
+        query = f"""
+            SELECT {self._projection(table, columns)} from {table}
+            where name like %s or phone like %s or email like %s
+            order by name
+        """
+        parameter = f"%{search_term}%"
+        return self._fetch_all(query,(parameter,parameter,parameter))
+
+    def find_contacts_by_phone(self, phone):
+        "Contacts whose number matches after normalization"
+        return self._find_by_normalized("contacts", "phone_norm", normalize_phone(phone))
+
+    def find_contacts_by_email(self, email):
+        "Contacts whose email matches case-insensitively"
+        return self._find_by_normalized("contacts", "email_norm", normalize_email(email))
+
+    def update_contact(self, contact_id, name=None, gender=None, phone=None, email=None, address=None):        #Function for updating contacts
+        try:
+            #Locking read on the primary: fields not given keep their current value, not a replica's
+            current = self._fetch_one("SELECT * from contacts where id = %s for update", (contact_id,))
+            if not current:
+                self._rollback()
+                return False
+            before = self._audit_before("contacts", contact_id, current)
+            
+            name = name if name is not None else current['name']
+            gender = gender if gender is not None else current['gender']
+            phone = phone if phone is not None else current['phone']
+            email = email if email is not None else current['email']
+            address = address if address is not None else current['address']
+
+            query ="""
+                UPDATE contacts
+                set name = %s, gender = %s, phone = %s, email = %s, address = %s,
+                    phone_norm = %s, email_norm = %s
+                where id = %s
+            """
+
+            self.cursor.execute(query,(name, gender, phone, email, address,
+                                       normalize_phone(phone), normalize_email(email), contact_id))
+            updated = self.cursor.rowcount>0
+            if updated:
+                self._log_change("contacts", contact_id, "U", before, UPDATE_COLUMNS["contacts"])
+            self._commit()
+            return updated
+        except Error as e:
+            print(f"Error updating contact: {e}")
+            self._rollback()
+            return False
+    
+    def delete_contact(self, contact_id):              #Function to delete the require entries or values
+        """Delete a contact"""
+        try:
+            before = self._audit_before("contacts", contact_id)
+            query = "DELETE from contacts where id = %s"
+            self.cursor.execute(query,(contact_id,))
+            deleted = self.cursor.rowcount > 0
+            if deleted:
+                self._log_change("contacts", contact_id, "D", before)     #Tombstone for pollers
+            self._commit()
+            return deleted
+        except Error as e:
+            print(f"Error deleting contact:{e}")
+            self._rollback()
+            return False
+
+    def merge_contacts(self, keep_id, drop_id):
+        "Fill the kept contact's empty fields from the duplicate, then delete the duplicate"
+        try:
+            before = self._audit_before("contacts", keep_id)
+            self.cursor.execute("""
+                UPDATE contacts k join contacts d on d.id = %s
+                set k.gender = coalesce(nullif(k.gender, ''), d.gender),
+                    k.phone_norm = coalesce(k.phone_norm, d.phone_norm),
+                    k.email_norm = coalesce(k.email_norm, d.email_norm),
+                    k.phone = coalesce(nullif(k.phone, ''), d.phone),
+                    k.email = coalesce(nullif(k.email, ''), d.email),
+                    k.address = coalesce(nullif(k.address, ''), d.address)
+                where k.id = %s
+            """, (drop_id, keep_id))
+            if self.cursor.rowcount > 0:
+                self._log_change("contacts", keep_id, "U", before)
+            return self.delete_contact(drop_id)     #Commits the fill and the delete together
+        except Error as e:
+            print(f"Error merging contacts: {e}")
+            self._rollback()
+            return False
+
+    # ======================
+    # BRANCHES
+    # ======================
+
+    @cached("branches")
+    def get_all_branches(self):
+        "Getting all the branches"
+        return self._fetch_all("SELECT * from branches order by branch_name")
+
+    @cached("branches", fold_case=True)
+    def search_branches(self, search_term):
+        """Searching branches by name, city or state"""
+        query = """
+            SELECT * from branches
+            where branch_name like %s or branch_city like %s or branch_state like %s
+            order by branch_name
+        """
+        parameter = f"%{search_term}%"
+        return self._fetch_all(query, (parameter, parameter, parameter))
+
+    def get_branch_by_id(self, branch_id):
+        "Get a branch by id"
+        return self._fetch_one("SELECT * from branches where branch_id = %s", (branch_id,))
+
+    def _with_branch_name(self, branch_id, rows, columns=None):
+        "Attach the branch name to rows that all belong to one branch, unless projected away"
+        if rows and (columns is None or "branch_name" in columns):
+            branch = self.get_branch_by_id(branch_id)
+            branch_name = branch["branch_name"] if branch else None
+            for row in rows:
+                row["branch_name"] = branch_name
+        return rows
+
+    def partition_by_branch(self, table, partitions=16):
+        """Hash-partition employees or customers on branch_id so branch-scoped queries prune
+
+        MySQL needs the partitioning column in every unique key, so the primary key
+        becomes (id, branch_id) and branch_id becomes NOT NULL; tables with rows that
+        have no branch are left alone.
+        """
+        if table not in ("employees", "customers"):
+            raise ValueError(f"{table} is not partitioned by branch")
+        key = PRIMARY_KEYS[table]
+        try:
+            if self._fetch_one("""
+                SELECT count(*) as found from information_schema.partitions
+                where table_schema = database() and table_name = %s and partition_name is not null
+            """, (table,))["found"] > 0:
+                print(f"{table} is already partitioned")
+                return True
+            if self._fetch_one(f"SELECT count(*) as found from {table} where branch_id is null")["found"] > 0:
+                print(f"Cannot partition {table}: some rows have no branch")
+                return False
+            self.cursor.execute(f"""
+                alter table {table}
+                    modify branch_id int not null,
+                    drop primary key,
+                    add primary key ({key}, branch_id)
+                partition by hash(branch_id) partitions {int(partitions)}
+            """)
+            return True
+        except Error as e:
+            print(f"Error partitioning {table}: {e}")
+            return False
+
+    def insert_branch(self, name, address, city, state, zip_code):
+        try:
+            query = """
+                INSERT INTO branches(branch_name, branch_address, branch_city, branch_state, branch_zip)
+                VALUES(%s, %s, %s, %s, %s)
+            """
+            self.cursor.execute(query, (name, address, city, state, zip_code))
+            branch_id = self.cursor.lastrowid
+            self._log_change("branches", branch_id, "I")
+            self._commit()
+            return branch_id
+        except Error as e:
+            print(f"Error adding branch: {e}")
+            self._rollback()
+            return None
+
+    def update_branch(self, branch_id, name, address, city, state, zip_code):
+        try:
+            before = self._audit_before("branches", branch_id)
+            query = """
+                UPDATE branches
+                set branch_name = %s, branch_address = %s, branch_city = %s,
+                    branch_state = %s, branch_zip = %s
+                where branch_id = %s
+            """
+            self.cursor.execute(query, (name, address, city, state, zip_code, branch_id))
+            updated = self.cursor.rowcount > 0
+            if updated:
+                self._log_change("branches", branch_id, "U", before, UPDATE_COLUMNS["branches"])
+            self._commit()
+            return updated
+        except Error as e:
+            print(f"Error updating branch: {e}")
+            self._rollback()
+            return False
+
+    def delete_branch(self, branch_id):
+        try:
+            before = self._audit_before("branches", branch_id)
+            self.cursor.execute("DELETE from branches where branch_id = %s", (branch_id,))
+            deleted = self.cursor.rowcount > 0
+            if deleted:
+                self._log_change("branches", branch_id, "D", before)
+            self._commit()
+            return deleted
+        except Error as e:
+            print(f"Error deleting branch: {e}")
+            self._rollback()
+            return False
+
+    # ======================
+    # EMPLOYEES
+    # ======================
+
+    @cached("employees", "branches")
+    def get_all_employees(self, columns=None):
+        "Getting all the employees with their branch name, only the given columns when asked"
+        return self._fetch_all(f"{self._select('employees', columns)} order by e.emp_name")
+
+    @cached("employees", "branches", fold_case=True)
+    def search_employees(self, search_term, columns=None):
+        """Searching employees by name, email or position"""
+        exact = self._exact_lookup("employees", search_term, columns)
+        if exact is not None:
+            return exact
+        query = f"""
+            {self._select('employees', columns)}
+            where e.emp_name like %s or e.emp_email like %s or e.emp_position like %s
+            order by e.emp_name
+        """
+        parameter = f"%{search_term}%"
+        return self._fetch_all(query, (parameter, parameter, parameter))
+
+    @cached("employees", "branches")
+    def get_employees_by_branch(self, branch_id, columns=None):
+        "Employees of one branch; the branch name is read once instead of joined per row"
+        return self._with_branch_name(branch_id, self._fetch_all(
+            f"SELECT {self._projection('employees', columns)} from employees where branch_id = %s order by emp_name",
+            (branch_id,)), columns)
+
+    @cached("employees", "branches", fold_case=True)
+    def search_employees_in_branch(self, branch_id, search_term, columns=None):
+        """Searching one branch's employees by name, email or position"""
+        exact = self._exact_lookup("employees", search_term, _with_branch_id(columns))
+        if exact is not None:
+            return [row for row in exact if str(row["branch_id"]) == str(branch_id)]
+        parameter = f"%{search_term}%"
+        return self._with_branch_name(branch_id, self._fetch_all(f"""
+            SELECT {self._projection('employees', columns)} from employees
+            where branch_id = %s and (emp_name like %s or emp_email like %s or emp_position like %s)
+            order by emp_name
+        """, (branch_id, parameter, parameter, parameter)), columns)
+
+    def get_employee_by_id(self, emp_id, columns=None):
+        "Get an employee by id, only the given columns when asked"
+        return self._fetch_one(f"SELECT {self._projection('employees', columns)} from employees where emp_id = %s",
+                               (emp_id,))
+
+    def find_employees_by_phone(self, phone):
+        "Employees whose number matches after normalization"
+        return self._find_by_normalized("employees", "phone_norm", normalize_phone(phone))
+
+    def find_employees_by_email(self, email):
+        "Employees whose email matches case-insensitively"
+        return self._find_by_normalized("employees", "email_norm", normalize_email(email))
+
+    def insert_employee(self, name, dob, phone, email, position, branch_id):
+        try:
+            query = """
+                INSERT INTO employees(emp_name, emp_dob, emp_phone, emp_email, emp_position, branch_id,
+                                      phone_norm, email_norm)
+                VALUES(%s, %s, %s, %s, %s, %s, %s, %s)
+            """
+            self.cursor.execute(query, (name, dob, phone, email, position, branch_id,
+                                        normalize_phone(phone), normalize_email(email)))
+            emp_id = self.cursor.lastrowid
+            self._log_change("employees", emp_id, "I")
+            self._bump_branch_stats(branch_id, employees=1)
+            self._commit()
+            return emp_id
+        except Error as e:
+            print(f"Error adding employee: {e}")
+            self._rollback()
+            return None
+
+    def update_employee(self, emp_id, name, dob, phone, email, position, branch_id):
+        try:
+            previous = self._fetch_one(
+                "SELECT branch_id from employees where emp_id = %s for update", (emp_id,))
+            before = self._audit_before("employees", emp_id)
+            query = """
+                UPDATE employees
+                set emp_name = %s, emp_dob = %s, emp_phone = %s, emp_email = %s,
+                    emp_position = %s, branch_id = %s, phone_norm = %s, email_norm = %s
+                where emp_id = %s
+            """
+            self.cursor.execute(query, (name, dob, phone, email, position, branch_id,
+                                        normalize_phone(phone), normalize_email(email), emp_id))
+            updated = self.cursor.rowcount > 0
+            if updated:
+                self._log_change("employees", emp_id, "U", before, UPDATE_COLUMNS["employees"])
+                if str(previous["branch_id"]) != str(branch_id):
+                    self._bump_branch_stats(previous["branch_id"], employees=-1)
+                    self._bump_branch_stats(branch_id, employees=1)
+            self._commit()
+            return updated
+        except Error as e:
+            print(f"Error updating employee: {e}")
+            self._rollback()
+            return False
+
+    def delete_employee(self, emp_id):
+        try:
+            previous = self._fetch_one(
+                "SELECT branch_id from employees where emp_id = %s for update", (emp_id,))
+            before = self._audit_before("employees", emp_id)
+            self.cursor.execute("DELETE from employees where emp_id = %s", (emp_id,))
+            deleted = self.cursor.rowcount > 0
+            if deleted:
+                self._log_change("employees", emp_id, "D", before)
+                self._bump_branch_stats(previous["branch_id"], employees=-1)
+            self._commit()
+            return deleted
+        except Error as e:
+            print(f"Error deleting employee: {e}")
+            self._rollback()
+            return False
+
+    # ======================
+    # CUSTOMERS
+    # ======================
+
+    @cached("customers", "branches")
+    def get_all_customers(self, columns=None):
+        "Getting all the customers with their branch name, only the given columns when asked"
+        return self._fetch_all(f"{self._select('customers', columns)} order by c.name")
+
+    @cached("customers", "branches", "customers_archive", fold_case=True)
+    def search_customers(self, search_term, include_archive=False, columns=None):
+        """Searching customers by name, email or phone, in the archive too when asked"""
+        rows = self._search_customers_in("customers", search_term, columns)
+        if include_archive:
+            rows = self._with_archive(rows, self._search_customers_in("customers_archive", search_term, columns),
+                                      "name")
+        return rows
+
+    def _search_customers_in(self, table, search_term, columns=None):
+        exact = self._exact_lookup(table, search_term, columns)
+        if exact is not None:
+            return exact
+        query = f"""
+            {self._select(table, columns)}
+            where c.name like %s or c.email like %s or c.phone like %s
+            order by c.name
+        """
+        parameter = f"%{search_term}%"
+        return self._fetch_all(query, (parameter, parameter, parameter))
+
+    @cached("customers", "branches")
+    def get_customers_by_branch(self, branch_id, columns=None):
+        "Customers of one branch; the branch name is read once instead of joined per row"
+        return self._with_branch_name(branch_id, self._fetch_all(
+            f"SELECT {self._projection('customers', columns)} from customers where branch_id = %s order by name",
+            (branch_id,)), columns)
+
+    @cached("customers", "branches", fold_case=True)
+    def search_customers_in_branch(self, branch_id, search_term, columns=None):
+        """Searching one branch's customers by name, email or phone"""
+        exact = self._exact_lookup("customers", search_term, _with_branch_id(columns))
+        if exact is not None:
+            return [row for row in exact if str(row["branch_id"]) == str(branch_id)]
+        parameter = f"%{search_term}%"
+        return self._with_branch_name(branch_id, self._fetch_all(f"""
+            SELECT {self._projection('customers', columns)} from customers
+            where branch_id = %s and (name like %s or email like %s or phone like %s)
+            order by name
+        """, (branch_id, parameter, parameter, parameter)), columns)
+
+    def get_customer_by_id(self, cust_id, columns=None):
+        "Get a customer by id, only the given columns when asked"
+        return self._fetch_one(f"SELECT {self._projection('customers', columns)} from customers where cust_id = %s",
+                               (cust_id,))
+
+    def find_customers_by_phone(self, phone):
+        "Customers whose number matches after normalization"
+        return self._find_by_normalized("customers", "phone_norm", normalize_phone(phone))
+
+    def find_customers_by_email(self, email):
+        "Customers whose email matches case-insensitively"
+        return self._find_by_normalized("customers", "email_norm", normalize_email(email))
+
+    def insert_customer(self, name, dob, phone, email, address, branch_id):
+        try:
+            query = """
+                INSERT INTO customers(name, dob, phone, email, address, branch_id, phone_norm, email_norm)
+                VALUES(%s, %s, %s, %s, %s, %s, %s, %s)
+            """
+            self.cursor.execute(query, (name, dob, phone, email, address, branch_id,
+                                        normalize_phone(phone), normalize_email(email)))
+            cust_id = self.cursor.lastrowid
+            self._log_change("customers", cust_id, "I")
+            self._bump_branch_stats(branch_id, customers=1)
+            self._bump_new_customers(branch_id, 1)
+            self._commit()
+            return cust_id
+        except Error as e:
+            print(f"Error adding customer: {e}")
+            self._rollback()
+            return None
+
+    def update_customer(self, cust_id, name, dob, phone, email, address, branch_id):
+        try:
+            previous = self._fetch_one("""
+                SELECT branch_id, date(created_date) as created_day
+                from customers where cust_id = %s for update
+            """, (cust_id,))
+            before = self._audit_before("customers", cust_id)
+            query = """
+                UPDATE customers
+                set name = %s, dob = %s, phone = %s, email = %s, address = %s, branch_id = %s,
+                    phone_norm = %s, email_norm = %s
+                where cust_id = %s
+            """
+            self.cursor.execute(query, (name, dob, phone, email, address, branch_id,
+                                        normalize_phone(phone), normalize_email(email), cust_id))
+            updated = self.cursor.rowcount > 0
+            if updated:
+                self._log_change("customers", cust_id, "U", before, UPDATE_COLUMNS["customers"])
+                if str(previous["branch_id"]) != str(branch_id):
+                    self._bump_branch_stats(previous["branch_id"], customers=-1)
+                    self._bump_branch_stats(branch_id, customers=1)
+                    self._bump_new_customers(previous["branch_id"], -1, previous["created_day"])
+                    self._bump_new_customers(branch_id, 1, previous["created_day"])
+            self._commit()
+            return updated
+        except Error as e:
+            print(f"Error updating customer: {e}")
+            self._rollback()
+            return False
+
+    def merge_customers(self, keep_id, drop_id):
+        "Fill the kept customer's empty fields from the duplicate, then delete the duplicate"
+        try:
+            before = self._audit_before("customers", keep_id)
+            self.cursor.execute("""
+                UPDATE customers k join customers d on d.cust_id = %s
+                set k.dob = coalesce(k.dob, d.dob),
+                    k.phone_norm = coalesce(k.phone_norm, d.phone_norm),
+                    k.email_norm = coalesce(k.email_norm, d.email_norm),
+                    k.phone = coalesce(nullif(k.phone, ''), d.phone),
+                    k.email = coalesce(nullif(k.email, ''), d.email),
+                    k.address = coalesce(nullif(k.address, ''), d.address),
+                    k.branch_id = coalesce(k.branch_id, d.branch_id),
+                    k.created_date = least(k.created_date, d.created_date)
+                where k.cust_id = %s
+            """, (drop_id, keep_id))
+            if self.cursor.rowcount > 0:
+                self._log_change("customers", keep_id, "U", before)
+            return self.delete_customer(drop_id)    #Commits the fill and the delete together
+        except Error as e:
+            print(f"Error merging customers: {e}")
+            self._rollback()
+            return False
+
+    def delete_customer(self, cust_id):
+        try:
+            previous = self._fetch_one("""
+                SELECT branch_id, date(created_date) as created_day
+                from customers where cust_id = %s for update
+            """, (cust_id,))
+            before = self._audit_before("customers", cust_id)
+            self.cursor.execute("DELETE from customers where cust_id = %s", (cust_id,))
+            deleted = self.cursor.rowcount > 0
+            if deleted:
+                self._log_change("customers", cust_id, "D", before)
+                self._bump_branch_stats(previous["branch_id"], customers=-1)
+                self._bump_new_customers(previous["branch_id"], -1, previous["created_day"])
+            self._commit()
+            return deleted
+        except Error as e:
+            print(f"Error deleting customer: {e}")
+            self._rollback()
+            return False
+
+    # ======================
+    # FILTERS
+    # ======================
+
+    def _filter_query(self, table, text, columns=None):
+        "SELECT and params for a filter expression (see filters.compile_filter)"
+        where, params = compile_filter(table, text)
+        return f"{self._select(table, columns)} where {where} order by {ORDER_COLUMNS[table]}", params
+
+    @cached("customers", "branches")
+    def filter_customers(self, text, columns=None):
+        """Customers matching a filter such as 'city:Pune dob:1990..1999 name:A*'"""
+        return self._fetch_all(*self._filter_query("customers", text, columns))
+
+    @cached("employees", "branches")
+    def filter_employees(self, text, columns=None):
+        """Employees matching a filter such as 'position:Manager branch:3'"""
+        return self._fetch_all(*self._filter_query("employees", text, columns))
+
+    def explain_filter(self, table, text):
+        "How the server reads each table for a filter; full_scan marks whole-table reads"
+        query, params = self._filter_query(table, text)
+        return [{"table": step["table"], "access": step["type"], "index": step["key"],
+                 #<subqueryN> and <derived> rows are small temporary tables, not base tables
+                 "full_scan": step["type"] in ("ALL", "index") and not str(step["table"]).startswith("<")}
+                for step in self._fetch_all(f"EXPLAIN {query}", params)]
+
+    # ======================
+    # BULK OPERATIONS
+    # ======================
+
+    def _lock_rows(self, table, ids):
+        "Lock and read the current rows of one chunk, keyed by id"
+        key = PRIMARY_KEYS[table]
+        created_day = ", date(created_date) as created_day" if table == "customers" else ""
+        placeholders = ", ".join(["%s"] * len(ids))
+        rows = self._fetch_all(
+            f"SELECT *{created_day} from {table} where {key} in ({placeholders}) for update", tuple(ids))
+        return {row[key]: row for row in rows}
+
+    def _bump_for_rows(self, table, rows, sign, branch_id=None):
+        "Move branch aggregates for many employee/customer rows; branch_id None means each row's own"
+        per_branch, per_day = {}, {}
+        for row in rows:
+            branch = row["branch_id"] if branch_id is None else branch_id
+            per_branch[branch] = per_branch.get(branch, 0) + sign
+            if table == "customers":
+                bucket = (branch, row["created_day"])
+                per_day[bucket] = per_day.get(bucket, 0) + sign
+        for branch, count in per_branch.items():
+            if table == "customers":
+                self._bump_branch_stats(branch, customers=count)
+            else:
+                self._bump_branch_stats(branch, employees=count)
+        for (branch, day), count in per_day.items():
+            self._bump_new_customers(branch, count, day)
+
+    def delete_many(self, table, ids, chunk_size=500):
+        "Delete many employees or customers in one transaction; returns the ids deleted"
+        key = PRIMARY_KEYS[table]
+        ids = list(ids)
+        deleted = []
+        try:
+            for start in range(0, len(ids), chunk_size):
+                chunk = list(ids[start:start + chunk_size])
+                rows = self._lock_rows(table, chunk)
+                if not rows:
+                    continue
+                placeholders = ", ".join(["%s"] * len(rows))
+                self.cursor.execute(f"DELETE from {table} where {key} in ({placeholders})", tuple(rows))
+                self._log_changes(table, list(rows), "D", rows)
+                self._bump_for_rows(table, rows.values(), -1)
+                deleted.extend(rows)
+            self._commit()
+            return deleted
+        except Error as e:
+            print(f"Error deleting {table}: {e}")
+            self._rollback()
+            return []
+
+    def bulk_update(self, table, ids, changes, chunk_size=500):
+        "Set the same column values on many employees or customers in one transaction; returns the ids updated"
+        unknown = set(changes) - set(BULK_COLUMNS[table])
+        if unknown or not changes:
+            raise ValueError(f"Cannot bulk update {table} columns: {', '.join(sorted(unknown)) or 'none given'}")
+        key = PRIMARY_KEYS[table]
+        changes = dict(changes)
+        phone_column, email_column = NORMALIZED_SOURCES[table]
+        if phone_column in changes:
+            changes["phone_norm"] = normalize_phone(changes[phone_column])
+        if email_column in changes:
+            changes["email_norm"] = normalize_email(changes[email_column])
+        assignments = ", ".join(f"{column} = %s" for column in changes)
+        ids = list(ids)
+        updated = []
+        try:
+            for start in range(0, len(ids), chunk_size):
+                chunk = list(ids[start:start + chunk_size])
+                rows = self._lock_rows(table, chunk)
+                if not rows:
+                    continue
+                placeholders = ", ".join(["%s"] * len(rows))
+                self.cursor.execute(f"UPDATE {table} set {assignments} where {key} in ({placeholders})",
+                                    tuple(changes.values()) + tuple(rows))
+                self._log_changes(table, list(rows), "U", rows, changes)
+                if "branch_id" in changes:
+                    moved = [row for row in rows.values() if str(row["branch_id"]) != str(changes["branch_id"])]
+                    self._bump_for_rows(table, moved, -1)
+                    self._bump_for_rows(table, moved, 1, changes["branch_id"])
+                updated.extend(rows)
+            self._commit()
+            return updated
+        except Error as e:
+            print(f"Error updating {table}: {e}")
+            self._rollback()
+            return []
+
+    def reassign_branch(self, table, ids, branch_id, chunk_size=500):
+        "Move many employees or customers to another branch in one transaction"
+        return self.bulk_update(table, ids, {"branch_id": branch_id}, chunk_size)
@@ -0,0 +1,174 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from configuration import DatabaseManager
+from normalize import normalize_phone, normalize_email, email_local_part, normalize_name, soundex
+
+# Columns read per table for duplicate detection
+DEDUP_SOURCES = {
+    "customers": ("cust_id", "name", "phone", "email"),
+    "contacts": ("id", "name", "phone", "email"),
+}
+
+
+class CandidatePair:
+    """Two records that are probably the same person"""
+
+    def __init__(self, score, left, right, reasons):
+        self.score = score
+        self.left = left                        # (id, name, phone, email) as normalized
+        self.right = right
+        self.reasons = reasons
+
+    def __repr__(self):
+        return f"CandidatePair({self.score:.2f}, {self.left[0]}, {self.right[0]})"
+
+
+def blocking_keys(record):
+    """Keys a record is filed under; only records sharing a key are compared"""
+    _, name, phone, email = record
+    keys = []
+    if phone:
+        keys.append("p:" + phone)
+    local = email_local_part(email)
+    if local:
+        keys.append("e:" + local)
+    tokens = name.split()
+    if tokens:
+        # Surname and first name phonetics, order-insensitive so swapped names still meet
+        codes = sorted({soundex(tokens[0]), soundex(tokens[-1])})
+        keys.append("n:" + "".join(codes))
+    return keys
+
+
+def jaro_winkler(a, b):
+    """Jaro-Winkler similarity between two strings, 0.0 to 1.0"""
+    if a == b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+    window = max(len(a), len(b)) // 2 - 1
+    a_flags = [False] * len(a)
+    b_flags = [False] * len(b)
+    matches = 0
+    for i, ch in enumerate(a):
+        for j in range(max(0, i - window), min(len(b), i + window + 1)):
+            if not b_flags[j] and b[j] == ch:
+                a_flags[i] = b_flags[j] = True
+                matches += 1
+                break
+    if not matches:
+        return 0.0
+    transpositions = 0
+    j = 0
+    for i, flagged in enumerate(a_flags):
+        if flagged:
+            while not b_flags[j]:
+                j += 1
+            if a[i] != b[j]:
+                transpositions += 1
+            j += 1
+    m = float(matches)
+    jaro = (m / len(a) + m / len(b) + (m - transpositions / 2) / m) / 3
+    prefix = 0
+    for x, y in zip(a[:4], b[:4]):
+        if x != y:
+            break
+        prefix += 1
+    return jaro + prefix * 0.1 * (1 - jaro)
+
+
+def score_pair(left, right):
+    """Weighted match score and the fields that agreed"""
+    name_score = jaro_winkler(left[1], right[1])
+    if name_score < 0.9:
+        # "Sharma Rahul" against "Rahul Sharma"
+        name_score = max(name_score, jaro_winkler(" ".join(sorted(left[1].split())),
+                                                  " ".join(sorted(right[1].split()))))
+    reasons = [f"name {name_score:.2f}"]
+    score = 0.6 * name_score
+    if left[2] and left[2] == right[2]:
+        score += 0.25
+        reasons.append("phone")
+    if left[3] and left[3] == right[3]:
+        score += 0.15
+        reasons.append("email")
+    return score, reasons
+
+
+def _compare_blocks(blocks, threshold, window):
+    """Worker: score pairs inside each block and keep those above the threshold"""
+    found = []
+    for block in blocks:
+        if len(block) <= window:
+            pairs = ((block[i], block[j]) for i in range(len(block)) for j in range(i + 1, len(block)))
+        else:
+            # Oversized block (a very common surname): sorted neighbourhood instead of all pairs
+            block = sorted(block, key=lambda r: r[1])
+            pairs = ((block[i], block[j]) for i in range(len(block))
+                     for j in range(i + 1, min(len(block), i + window)))
+        for left, right in pairs:
+            score, reasons = score_pair(left, right)
+            if score >= threshold:
+                found.append((score, left, right, reasons))
+    return found
+
+
+def load_records(db, table, batch_size=10000):
+    """Stream a table and return normalized (id, name, phone, email) tuples"""
+    key, *columns = DEDUP_SOURCES[table]
+    for row in db.iter_table(table, columns, batch_size):
+        yield (row[key], normalize_name(row["name"]),
+               normalize_phone(row["phone"]), normalize_email(row["email"]))
+
+
+def find_duplicates(records, threshold=0.75, window=50, workers=None, chunk_size=2000, limit=None):
+    """Ranked candidate pairs from an iterable of normalized records
+
+    Records are grouped by blocking key and only compared within a group, so
+    the work grows with the block sizes rather than with n squared. Blocks are
+    scored in parallel across processes.
+    """
+    blocks = {}
+    for record in records:
+        for key in blocking_keys(record):
+            blocks.setdefault(key, []).append(record)
+    comparable = [block for block in blocks.values() if len(block) > 1]
+    blocks = None
+
+    chunks = [comparable[i:i + chunk_size] for i in range(0, len(comparable), chunk_size)]
+    best = {}
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = [pool.submit(_compare_blocks, chunk, threshold, window) for chunk in chunks]
+        for future in futures:
+            for score, left, right, reasons in future.result():
+                # The same pair can meet in several blocks; keep it once
+                pair_key = (min(left[0], right[0]), max(left[0], right[0]))
+                if pair_key not in best or best[pair_key].score < score:
+                    best[pair_key] = CandidatePair(score, left, right, reasons)
+
+    ranked = sorted(best.values(), key=lambda pair: pair.score, reverse=True)
+    return ranked[:limit] if limit else ranked
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Find likely duplicate customers or contacts")
+    parser.add_argument("table", choices=sorted(DEDUP_SOURCES))
+    parser.add_argument("--threshold", type=float, default=0.75)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    db = DatabaseManager(create_tables=False)
+    try:
+        pairs = find_duplicates(load_records(db, args.table), args.threshold,
+                                workers=args.workers, limit=args.limit)
+    finally:
+        db.close()
+    for pair in pairs:
+        print(f"{pair.score:.3f}\t{pair.left[0]}\t{pair.left[1]}\t{pair.right[0]}\t{pair.right[1]}\t"
+              + ", ".join(pair.reasons))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import threading
+
+
+class ChangeEvent:
+    """One kind of committed write: the table, the op (I, U or D), the row ids and the columns set
+
+    columns is None when any column may have changed, as for inserts, deletes
+    and merges.
+    """
+
+    def __init__(self, table, op, ids, columns=None):
+        self.table = table
+        self.op = op
+        self.ids = tuple(ids)
+        self.columns = frozenset(columns) if columns is not None else None
+
+    def touches(self, *columns):
+        "Whether the write may have changed any of columns"
+        return self.columns is None or any(column in self.columns for column in columns)
+
+    def __repr__(self):
+        columns = "*" if self.columns is None else ",".join(sorted(self.columns))
+        return f"ChangeEvent({self.table!r}, {self.op!r}, {len(self.ids)} ids, {columns})"
+
+
+class EventBus:
+    """In-process publish/subscribe for committed writes
+
+    DatabaseManager publishes after each commit, on the thread that committed,
+    so views only subscribe to the bus of a manager used from the Tk thread.
+    Subscribers run in subscription order; one that fails is reported and the
+    rest still run.
+    """
+
+    def __init__(self):
+        self._subscribers = []                  # (tables or None for all, callback)
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback, *tables):
+        "Call callback(event) for writes to tables, or to any table when none are given"
+        subscriber = (frozenset(tables) or None, callback)
+        with self._lock:
+            self._subscribers.append(subscriber)
+        return lambda: self._unsubscribe(subscriber)
+
+    def _unsubscribe(self, subscriber):
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+    def publish(self, event):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for tables, callback in subscribers:
+            if tables is not None and event.table not in tables:
+                continue
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"Change event subscriber failed on {event}: {e}")
@@ -1,16 +1,22 @@
-import tkinter as tk
-from interface import ContactManagerApp
-import os
-from dotenv import load_dotenv
-
-def main():
-    # Load environment variables
-    load_dotenv()
-    
-    # Create the GUI application
-    root = tk.Tk()
-    app = ContactManagerApp(root)
-    root.mainloop()
-
-if __name__ == "__main__":
-    main()
\ No newline at end of file
+import sys
+from dotenv import load_dotenv
+
+def main():
+    # Load environment variables
+    load_dotenv()
+
+    # Any arguments select the headless command-line mode (see cli.py)
+    if len(sys.argv) > 1:
+        from cli import main as cli_main
+        sys.exit(cli_main(sys.argv[1:]))
+
+    import tkinter as tk
+    from interface import BankManagementApp
+
+    # Create the GUI application
+    root = tk.Tk()
+    BankManagementApp(root)
+    root.mainloop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+import argparse
+import contextlib
+import re
+import shlex
+import sys
+from datetime import date, timedelta
+from normalize import normalize_email, normalize_phone
+
+
+class FilterError(ValueError):
+    """A filter that names an unknown field or uses a form the field does not allow"""
+
+
+class Field:
+    """How one filter field maps onto an indexed column"""
+
+    def __init__(self, column, kind="text", prefix=True, normalize=None, lookup=None):
+        self.column = column
+        self.kind = kind                        # text, date or int
+        self.prefix = prefix                    # value* allowed
+        self.normalize = normalize              # Applied to the value before comparing
+        self.lookup = lookup                    # (table, key, column) matched through a subquery
+
+    def sql(self, condition):
+        "Clause for 'column <condition>', through the lookup table when there is one"
+        if self.lookup is None:
+            return f"{self.column} {condition}"
+        table, key, column = self.lookup
+        return f"{self.column} in (SELECT {key} from {table} where {column} {condition})"
+
+
+#Filter fields per table; every column here has an index (see _create_table)
+FILTER_FIELDS = {
+    "customers": {
+        "name": Field("c.name"),
+        "phone": Field("c.phone_norm", prefix=False, normalize=normalize_phone),
+        "email": Field("c.email_norm", normalize=normalize_email),
+        "dob": Field("c.dob", kind="date", prefix=False),
+        "created": Field("c.created_date", kind="date", prefix=False),
+        "branch": Field("c.branch_id", kind="int", prefix=False),
+        "city": Field("c.branch_id", lookup=("branches", "branch_id", "branch_city")),
+    },
+    "employees": {
+        "name": Field("e.emp_name"),
+        "phone": Field("e.phone_norm", prefix=False, normalize=normalize_phone),
+        "email": Field("e.email_norm", normalize=normalize_email),
+        "position": Field("e.emp_position"),
+        "dob": Field("e.emp_dob", kind="date", prefix=False),
+        "branch": Field("e.branch_id", kind="int", prefix=False),
+        "city": Field("e.branch_id", lookup=("branches", "branch_id", "branch_city")),
+    },
+}
+#Filtered lists come back in the same order as the unfiltered ones
+ORDER_COLUMNS = {"customers": "c.name", "employees": "e.emp_name"}
+FIELD_ALIASES = {"created_date": "created", "branch_id": "branch", "emp_position": "position"}
+
+DATE = re.compile(r"^\d{4}(-\d{2}(-\d{2})?)?$")
+COMPARISON = re.compile(r"^(>=|<=|>|<)(.+)$")
+TERM = re.compile(r"^(\w+)[:=](.*)$")
+FILTER_LIKE = re.compile(r"(^|\s)\w+[:=]")
+
+#One example per filter form, run through EXPLAIN by check_plans()
+SAMPLE_FILTERS = {
+    "customers": ["name:Asha*", "Asha", "phone:9876543210", "email:asha@example.com", "email:asha*",
+                  "dob:1990-01-01..1999-12-31", "created:2024-01", "branch:3", "branch:3 name:A*",
+                  "city:Pune", "city:Pune dob:<2000-01-01"],
+    "employees": ["name:Ravi*", "position:Manager", "position:Man*", "dob:1980..1989", "branch:3",
+                  "position:Manager city:Pune"],
+}
+
+
+def is_filter_query(text):
+    "Whether a search box entry uses field:value terms"
+    return bool(FILTER_LIKE.search(text))
+
+
+def _value(field, value, name):
+    if field.kind == "int":
+        if not value.isdigit():
+            raise FilterError(f"{name} takes a number, not {value!r}")
+        return int(value)
+    if field.normalize is not None:
+        normalized = field.normalize(value)
+        if normalized is None:
+            raise FilterError(f"Not a valid {name}: {value!r}")
+        return normalized
+    return value
+
+
+def _period(value, name):
+    "First day of YYYY, YYYY-MM or YYYY-MM-DD and the first day after it"
+    if not DATE.match(value):
+        raise FilterError(f"{name} takes a date, not {value!r} (use YYYY, YYYY-MM or YYYY-MM-DD)")
+    parts = [int(part) for part in value.split("-")]
+    try:
+        if len(parts) == 3:
+            first = date(*parts)
+            return first, first + timedelta(days=1)
+        if len(parts) == 2:
+            year, month = parts
+            return date(year, month, 1), date(year + month // 12, month % 12 + 1, 1)
+        return date(parts[0], 1, 1), date(parts[0] + 1, 1, 1)
+    except ValueError as e:
+        raise FilterError(f"{name} takes a date, not {value!r}: {e}") from e
+
+
+def _range(field, name, value):
+    """Half-open bounds for a..b, a.., ..b, >=a, >a, <=b, <b or a bare period
+
+    Upper bounds are "< the day after", so timestamps on the last day match too.
+    """
+    bounds = []
+    match = COMPARISON.match(value)
+    if match:
+        operator, text = match.groups()
+        first, after = _period(text, name)
+        bounds.append({">=": (">=", first), ">": (">=", after),
+                       "<": ("<", first), "<=": ("<", after)}[operator])
+    else:
+        low, separator, high = value.partition("..")
+        if not separator:
+            high = low                          # dob:1990 means the whole year
+        if not low and not high:
+            raise FilterError(f"Empty range for {name}")
+        if low:
+            bounds.append((">=", _period(low, name)[0]))
+        if high:
+            bounds.append(("<", _period(high, name)[1]))
+    return ([field.sql(f"{operator} %s") for operator, _ in bounds],
+            [day.isoformat() for _, day in bounds])
+
+
+def _prefix(field, name, stem):
+    "Clause and params for a prefix match that can use the column's index"
+    if not stem:
+        raise FilterError(f"No prefix for {name}")
+    if field.normalize is not None:
+        # Normalized columns hold lower-case text, so the prefix is a plain range
+        stem = stem.strip().lower()
+        return [field.sql(">= %s"), field.sql("< %s")], [stem, stem[:-1] + chr(ord(stem[-1]) + 1)]
+    # A leading-anchored LIKE uses the index; % and _ in the stem are literal
+    escaped = stem.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+    return [field.sql("like %s escape '!'")], [escaped + "%"]
+
+
+def compile_filter(table, text):
+    """Compile a filter into (where clause, params) over ROW_QUERIES aliases
+
+    Terms are ANDed. field:value is equality, field:value* a prefix match,
+    date fields take a..b, a.., ..b, >=a, <b or a bare year/month/day, and a
+    run of words without a field is a name prefix. Values with spaces go in
+    quotes.
+    """
+    fields = FILTER_FIELDS.get(table)
+    if fields is None:
+        raise FilterError(f"No filters for {table}")
+    try:
+        terms = shlex.split(text)
+    except ValueError as e:
+        raise FilterError(f"Unbalanced quotes in filter: {e}") from e
+    if not terms:
+        raise FilterError("Empty filter")
+
+    clauses, params = [], []
+    words = [term for term in terms if not TERM.match(term)]
+    if words:
+        terms = [term for term in terms if TERM.match(term)] + ["name:" + " ".join(words) + "*"]
+    for term in terms:
+        name, value = TERM.match(term).groups()
+        name = FIELD_ALIASES.get(name.lower(), name.lower())
+        field = fields.get(name)
+        if field is None:
+            raise FilterError(f"Unknown field {name!r}; use one of {', '.join(sorted(fields))}")
+        if not value:
+            raise FilterError(f"No value for {name}")
+        if field.kind == "date":
+            more, values = _range(field, name, value)
+        elif value.endswith("*"):
+            if not field.prefix:
+                raise FilterError(f"{name} does not take prefix matches")
+            more, values = _prefix(field, name, value[:-1])
+        else:
+            more, values = [field.sql("= %s")], [_value(field, value, name)]
+        clauses.extend(more)
+        params.extend(values)
+    return " and ".join(clauses), tuple(params)
+
+
+def full_scans(plan):
+    "Tables an explain_filter() plan reads in full"
+    return [step["table"] for step in plan if step["full_scan"]]
+
+
+def check_plans(db, samples=SAMPLE_FILTERS, log=print):
+    "EXPLAIN every sample filter; returns the ones that scan a whole table"
+    failures = []
+    for table, filters in samples.items():
+        for text in filters:
+            scanned = full_scans(db.explain_filter(table, text))
+            log(f"{'FULL SCAN' if scanned else 'indexed':9}  {table}: {text}"
+                + (f"  ({', '.join(scanned)})" if scanned else ""))
+            if scanned:
+                failures.append((table, text, scanned))
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile a filter, or EXPLAIN every filter form")
+    parser.add_argument("table", nargs="?", choices=sorted(FILTER_FIELDS))
+    parser.add_argument("filter", nargs="?", help='e.g. "position:Manager city:Pune"')
+    parser.add_argument("--check", action="store_true",
+                        help="EXPLAIN the sample filters and fail on any full table scan")
+    parser.add_argument("--mysql", action="store_true", help="use the configured MySQL database for --check")
+    args = parser.parse_args(argv)
+
+    if not args.check:
+        if not args.table or not args.filter:
+            parser.error("a table and a filter are required without --check")
+        where, params = compile_filter(args.table, args.filter)
+        print(f"where {where}")
+        print(f"params {params}")
+        return 0
+
+    with contextlib.ExitStack() as stack:
+        if args.mysql:
+            from configuration import DatabaseManager
+            db = DatabaseManager()
+        else:
+            from loadgen import seed_standin
+            from sqlite_backend import SQLiteDatabaseManager
+            db = SQLiteDatabaseManager(stack.enter_context(seed_standin(2000, prefix="bank-filters-")))
+        try:
+            failures = check_plans(db)
+        finally:
+            db.close()
+    print("FAIL" if failures else "PASS")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
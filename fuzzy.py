@@ -0,0 +1,174 @@
+import heapq
+import sys
+import threading
+from normalize import normalize_name
+
+
+def edit_distance(a, b, max_distance):
+    """Optimal string alignment distance, or max_distance + 1 once it is exceeded"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous2 is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                value = min(value, previous2[j - 2] + 1)       # Transposition: "jonh" -> "john"
+            current[j] = value
+            row_min = min(row_min, value)
+        if row_min > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def _deletes(word, max_distance):
+    """Every string reachable from word by removing up to max_distance characters"""
+    results = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        results |= frontier
+    return results
+
+
+class FuzzyNameIndex:
+    """In-memory typo-tolerant name index using symmetric deletes (SymSpell)
+
+    Names are split into tokens; each distinct token is stored once with the
+    deletes of its prefix, so a lookup only verifies tokens that share a delete
+    with the query instead of comparing against every name.
+    """
+
+    def __init__(self, max_distance=2, prefix_length=7):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self._names = {}                        # row id -> display name
+        self._tokens = {}                       # token -> set of row ids
+        self._deletes = {}                      # delete of a token prefix -> set of tokens
+        self._lock = threading.Lock()
+        self._building = False
+        self._touched = set()                   # Ids written while a build is streaming
+        self.ready = False
+
+    def __len__(self):
+        return len(self._names)
+
+    def build(self, rows, key, name_field="name"):
+        """Load from a streaming scan; live writes made meanwhile take precedence"""
+        with self._lock:
+            self._building = True
+            self._touched = set()
+        try:
+            for row in rows:
+                with self._lock:
+                    if row[key] not in self._touched:
+                        self._add(row[key], row[name_field])
+        finally:
+            with self._lock:
+                self._building = False
+                self._touched = set()
+                self.ready = True
+
+    def add(self, row_id, name):
+        with self._lock:
+            if self._building:
+                self._touched.add(row_id)
+            self._remove(row_id)
+            self._add(row_id, name)
+
+    def remove(self, row_id):
+        with self._lock:
+            if self._building:
+                self._touched.add(row_id)
+            self._remove(row_id)
+
+    def _add(self, row_id, name):
+        self._names[row_id] = name
+        for token in set(normalize_name(name).split()):
+            ids = self._tokens.get(token)
+            if ids is None:
+                ids = self._tokens[token] = set()
+                for delete in _deletes(token[:self.prefix_length], self.max_distance):
+                    self._deletes.setdefault(delete, set()).add(token)
+            ids.add(row_id)
+
+    def _remove(self, row_id):
+        name = self._names.pop(row_id, None)
+        if name is None:
+            return
+        for token in set(normalize_name(name).split()):
+            ids = self._tokens.get(token)
+            if ids is None:
+                continue
+            ids.discard(row_id)
+            if not ids:
+                del self._tokens[token]
+                for delete in _deletes(token[:self.prefix_length], self.max_distance):
+                    tokens = self._deletes.get(delete)
+                    if tokens is not None:
+                        tokens.discard(token)
+                        if not tokens:
+                            del self._deletes[delete]
+
+    def _similar_tokens(self, query_token, max_distance):
+        """Indexed tokens within max_distance of query_token, with their distances"""
+        candidates = set()
+        for delete in _deletes(query_token[:self.prefix_length], max_distance):
+            candidates |= self._deletes.get(delete, set())
+        matches = {}
+        for token in candidates:
+            distance = edit_distance(query_token, token, max_distance)
+            if distance <= max_distance:
+                matches[token] = distance
+        return matches
+
+    def search(self, query, k=20, max_distance=None):
+        """Top-k (row id, name, distance) for names containing every query token
+
+        A row's distance is the sum of the best distance of each query token.
+        """
+        max_distance = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        query_tokens = normalize_name(query).split()
+        if not query_tokens:
+            return []
+        with self._lock:
+            scores = None
+            for query_token in query_tokens:
+                token_scores = {}
+                for token, distance in self._similar_tokens(query_token, max_distance).items():
+                    for row_id in self._tokens[token]:
+                        if distance < token_scores.get(row_id, max_distance + 1):
+                            token_scores[row_id] = distance
+                if scores is None:
+                    scores = token_scores
+                else:
+                    scores = {row_id: scores[row_id] + d for row_id, d in token_scores.items()
+                              if row_id in scores}
+                if not scores:
+                    return []
+            ranked = heapq.nsmallest(k, scores.items(), key=lambda item: (item[1], self._names[item[0]]))
+            return [(row_id, self._names[row_id], distance) for row_id, distance in ranked]
+
+    def memory_usage(self):
+        """Approximate bytes held by the index structures"""
+        with self._lock:
+            size = sys.getsizeof(self._names) + sys.getsizeof(self._tokens) + sys.getsizeof(self._deletes)
+            size += sum(sys.getsizeof(name) for name in self._names.values())
+            size += sum(sys.getsizeof(token) + sys.getsizeof(ids) for token, ids in self._tokens.items())
+            size += sum(sys.getsizeof(delete) + sys.getsizeof(tokens) for delete, tokens in self._deletes.items())
+            return size
+
+    def stats(self):
+        """Counts and memory for display"""
+        return {
+            "names": len(self._names),
+            "tokens": len(self._tokens),
+            "deletes": len(self._deletes),
+            "bytes": self.memory_usage(),
+        }
@@ -1,1528 +1,2627 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
-from datetime import datetime
-from configuration import DatabaseManager
-
-class BankManagementApp:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Bank Management System")
-        self.root.geometry("1200x800")
-        self.root.minsize(1000, 700)
-        
-        # Initialize database
-        try:
-            self.db = DatabaseManager()
-        except Exception as e:
-            messagebox.showerror("Database Error", f"Failed to connect to database: {str(e)}")
-            root.destroy()
-            return
-
-        # Current selection tracking
-        self.current_branch_id = None
-        self.current_employee_id = None
-        self.current_customer_id = None
-
-        # Configure styles
-        self._configure_styles()
-        
-        # Create login tabs interface
-        self._create_login_tabs()
-
-    def _configure_styles(self):
-        """Configure widget styles and colors"""
-        self.style = ttk.Style()
-        self.style.theme_use('clam')
-        
-        # Color scheme
-        self.bg_color = '#F0F8FF'  # Alice Blue
-        self.primary_color = '#4682B4'  # Steel Blue
-        self.secondary_color = '#5F9EA0'  # Cadet Blue
-        self.highlight_color = '#B0E0E6'  # Powder Blue
-        
-        # Configure styles
-        self.style.configure('TFrame', background=self.bg_color)
-        self.style.configure('TLabel', background=self.bg_color, font=('Helvetica', 10))
-        self.style.configure('TButton', font=('Helvetica', 10, 'bold'), padding=5)
-        self.style.configure('Treeview', font=('Helvetica', 9), rowheight=25, 
-                           fieldbackground=self.bg_color)
-        self.style.configure('Treeview.Heading', font=('Helvetica', 10, 'bold'))
-        self.style.map('Treeview', 
-                      background=[('selected', self.primary_color)],
-                      foreground=[('selected', 'white')])
-        self.style.configure('TLabelframe', background=self.bg_color)
-        self.style.configure('TLabelframe.Label', background=self.bg_color)
-
-    def _create_login_tabs(self):
-        """Create login interface with role selection tabs"""
-        self.login_notebook = ttk.Notebook(self.root)
-        self.login_notebook.pack(fill=tk.BOTH, expand=True)
-        
-        # Create tabs for each role
-        self._create_admin_login_tab()
-        self._create_employee_login_tab()
-        self._create_customer_login_tab()
-
-    def _create_admin_login_tab(self):
-        """Admin login tab"""
-        admin_tab = ttk.Frame(self.login_notebook)
-        self.login_notebook.add(admin_tab, text="Admin")
-        
-        # Admin tab content
-        content_frame = ttk.Frame(admin_tab)
-        content_frame.pack(expand=True, fill=tk.BOTH, padx=50, pady=50)
-        
-        ttk.Label(content_frame, text="Admin Panel", font=('Helvetica', 16, 'bold')).pack(pady=20)
-        ttk.Label(content_frame, text="Full access to all management functions").pack(pady=10)
-        
-        ttk.Button(content_frame, text="Enter Admin Dashboard", command=self._show_admin_interface,
-                  style='Primary.TButton').pack(pady=20)
-
-    def _create_employee_login_tab(self):
-        """Employee login tab"""
-        employee_tab = ttk.Frame(self.login_notebook)
-        self.login_notebook.add(employee_tab, text="Employee")
-        
-        # Employee tab content
-        content_frame = ttk.Frame(employee_tab)
-        content_frame.pack(expand=True, fill=tk.BOTH, padx=50, pady=50)
-        
-        ttk.Label(content_frame, text="Employee Panel", font=('Helvetica', 16, 'bold')).pack(pady=20)
-        ttk.Label(content_frame, text="Access to employee and customer management").pack(pady=10)
-        
-        ttk.Button(content_frame, text="Enter Employee Dashboard", command=self._show_employee_interface,
-                  style='Primary.TButton').pack(pady=20)
-
-    def _create_customer_login_tab(self):
-        """Customer login tab"""
-        customer_tab = ttk.Frame(self.login_notebook)
-        self.login_notebook.add(customer_tab, text="Customer")
-        
-        # Customer tab content
-        content_frame = ttk.Frame(customer_tab)
-        content_frame.pack(expand=True, fill=tk.BOTH, padx=50, pady=50)
-        
-        ttk.Label(content_frame, text="Customer Panel", font=('Helvetica', 16, 'bold')).pack(pady=20)
-        ttk.Label(content_frame, text="Access to customer management only").pack(pady=10)
-        
-        ttk.Button(content_frame, text="Enter Customer Dashboard", command=self._show_customer_interface,
-                  style='Primary.TButton').pack(pady=20)
-
-    def _show_admin_interface(self):
-        """Switch to admin interface"""
-        self.login_notebook.destroy()
-        self._setup_interface("admin")
-
-    def _show_employee_interface(self):
-        """Switch to employee interface"""
-        self.login_notebook.destroy()
-        self._setup_interface("employee")
-
-    def _show_customer_interface(self):
-        """Switch to customer interface"""
-        self.login_notebook.destroy()
-        self._setup_interface("customer")
-
-    def _setup_interface(self, role):
-        """Create the main interface components"""
-        self.notebook = ttk.Notebook(self.root)
-        self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        # Create tabs based on role
-        if role == "admin":
-            self._create_branch_tab()
-            self._create_employee_tab()
-            self._create_customer_tab()
-            self.notebook.select(0)  # Select first tab
-        elif role == "employee":
-            self._create_employee_tab()
-            self._create_customer_tab()
-            self.notebook.select(0)  # Select first tab
-        elif role == "customer":
-            self._create_customer_tab()
-
-    # ======================
-    # BRANCH TAB IMPLEMENTATION
-    # ======================
-    def _create_branch_tab(self):
-        """Create branch management tab"""
-        self.branch_tab = ttk.Frame(self.notebook)
-        self.notebook.add(self.branch_tab, text="Branch Management")
-        
-        # Main container
-        main_frame = ttk.Frame(self.branch_tab)
-        main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        # Form frame
-        form_frame = ttk.LabelFrame(main_frame, text="Branch Details")
-        form_frame.pack(fill=tk.X, pady=5)
-        
-        # Form fields
-        fields = ["Name:", "Address:", "City:", "State:", "PIN Code:"]
-        self.branch_entries = []
-        for i, field in enumerate(fields):
-            ttk.Label(form_frame, text=field).grid(row=i, column=0, sticky="e", padx=5, pady=3)
-            entry = ttk.Entry(form_frame, width=40)
-            entry.grid(row=i, column=1, sticky="w", padx=5, pady=3)
-            self.branch_entries.append(entry)
-
-        # Form buttons (Save and Clear)
-        form_btn_frame = ttk.Frame(form_frame)
-        form_btn_frame.grid(row=len(fields), columnspan=2, pady=10)
-        
-        ttk.Button(form_btn_frame, text="Save", command=self._update_branch, 
-                  style='Primary.TButton').pack(side=tk.LEFT, padx=5)
-        ttk.Button(form_btn_frame, text="Clear", command=self._new_branch).pack(side=tk.LEFT, padx=5)
-
-        # Treeview frame
-        tree_frame = ttk.LabelFrame(main_frame, text="Branch List")
-        tree_frame.pack(fill=tk.BOTH, expand=True, pady=5)
-        
-        # Treeview
-        columns = ("ID", "Name", "Address", "City", "State", "PIN Code")
-        self.branch_tree = ttk.Treeview(tree_frame, columns=columns, show="headings", selectmode='browse')
-        
-        for col in columns:
-            self.branch_tree.heading(col, text=col)
-            self.branch_tree.column(col, width=120, anchor=tk.CENTER)
-        
-        # Scrollbars
-        y_scroll = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.branch_tree.yview)
-        x_scroll = ttk.Scrollbar(tree_frame, orient=tk.HORIZONTAL, command=self.branch_tree.xview)
-        self.branch_tree.configure(yscroll=y_scroll.set, xscroll=x_scroll.set)
-        
-        # Layout
-        self.branch_tree.grid(row=0, column=0, sticky="nsew")
-        y_scroll.grid(row=0, column=1, sticky="ns")
-        x_scroll.grid(row=1, column=0, sticky="ew")
-        
-        tree_frame.grid_rowconfigure(0, weight=1)
-        tree_frame.grid_columnconfigure(0, weight=1)
-        
-        # Treeview buttons (New, Update, Delete)
-        tree_btn_frame = ttk.Frame(tree_frame)
-        tree_btn_frame.grid(row=2, columnspan=2, pady=5)
-        
-        ttk.Button(tree_btn_frame, text="New", command=self._new_branch).pack(side=tk.LEFT, padx=5)
-        ttk.Button(tree_btn_frame, text="Update", command=self._update_branch, 
-                  style='Primary.TButton').pack(side=tk.LEFT, padx=5)
-        ttk.Button(tree_btn_frame, text="Delete", command=self._delete_branch, 
-                  style='Danger.TButton').pack(side=tk.LEFT, padx=5)
-
-        # Search frame (at bottom)
-        search_frame = ttk.Frame(main_frame)
-        search_frame.pack(fill=tk.X, pady=5)
-        
-        ttk.Label(search_frame, text="Search Branch:").pack(side=tk.LEFT, padx=5)
-        self.branch_search_var = tk.StringVar()
-        search_entry = ttk.Entry(search_frame, textvariable=self.branch_search_var, width=40)
-        search_entry.pack(side=tk.LEFT, padx=5)
-        ttk.Button(search_frame, text="Search", command=self._search_branches).pack(side=tk.LEFT, padx=5)
-        ttk.Button(search_frame, text="Clear", command=self._clear_branch_search).pack(side=tk.LEFT)
-        
-        # Bind Enter key to search
-        search_entry.bind('<Return>', lambda e: self._search_branches())
-        
-        # Bind selection event
-        self.branch_tree.bind("<<TreeviewSelect>>", self._on_branch_select)
-        
-        # Load initial data
-        self._load_branches()
-
-    def _load_branches(self):
-        """Load branches into treeview"""
-        for item in self.branch_tree.get_children():
-            self.branch_tree.delete(item)
-        
-        try:
-            branches = self.db.get_all_branches()
-            for branch in branches:
-                self.branch_tree.insert("", tk.END, values=(
-                    branch["branch_id"],
-                    branch["branch_name"],
-                    branch["branch_address"],
-                    branch["branch_city"],
-                    branch["branch_state"],
-                    branch["branch_zip"]
-                ))
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load branches: {str(e)}")
-
-    def _search_branches(self):
-        """Search branches by name, city or state"""
-        search_term = self.branch_search_var.get().strip()
-        if not search_term:
-            self._load_branches()
-            return
-        
-        try:
-            for item in self.branch_tree.get_children():
-                self.branch_tree.delete(item)
-            
-            branches = self.db.search_branches(search_term)
-            for branch in branches:
-                self.branch_tree.insert("", tk.END, values=(
-                    branch["branch_id"],
-                    branch["branch_name"],
-                    branch["branch_address"],
-                    branch["branch_city"],
-                    branch["branch_state"],
-                    branch["branch_zip"]
-                ))
-        except Exception as e:
-            messagebox.showerror("Error", f"Search failed: {str(e)}")
-
-    def _clear_branch_search(self):
-        """Clear search results"""
-        self.branch_search_var.set("")
-        self._load_branches()
-
-    def _on_branch_select(self, event):
-        """Handle branch selection in treeview"""
-        selected_items = self.branch_tree.selection()
-        if not selected_items:
-            return
-        
-        selected_item = selected_items[0]
-        branch_id = self.branch_tree.item(selected_item)["values"][0]
-        
-        try:
-            branch = self.db.get_branch_by_id(branch_id)
-            if branch:
-                self.current_branch_id = branch["branch_id"]
-                # Update form fields
-                for i, field in enumerate(["branch_name", "branch_address", 
-                                          "branch_city", "branch_state", "branch_zip"]):
-                    self.branch_entries[i].delete(0, tk.END)
-                    self.branch_entries[i].insert(0, branch[field])
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load branch details: {str(e)}")
-
-    def _update_branch(self):
-        """Update selected branch"""
-        if not hasattr(self, 'current_branch_id') or not self.current_branch_id:
-            messagebox.showwarning("Warning", "Please select a branch to update")
-            return
-        
-        data = [entry.get().strip() for entry in self.branch_entries]
-        if not all(data):
-            messagebox.showerror("Error", "All fields are required")
-            return
-        
-        try:
-            success = self.db.update_branch(
-                self.current_branch_id,
-                data[0],  # name
-                data[1],  # address
-                data[2],  # city
-                data[3],  # state
-                data[4]   # zip
-            )
-            if success:
-                messagebox.showinfo("Success", "Branch updated successfully")
-                self._load_branches()
-            else:
-                messagebox.showerror("Error", "Failed to update branch")
-        except Exception as e:
-            messagebox.showerror("Error", f"Update failed: {str(e)}")
-
-    def _new_branch(self):
-        """Clear form for new branch entry"""
-        self.current_branch_id = None
-        for entry in self.branch_entries:
-            entry.delete(0, tk.END)
-
-    def _delete_branch(self):
-        """Delete selected branch"""
-        selected_items = self.branch_tree.selection()
-        if not selected_items:
-            messagebox.showwarning("Warning", "Please select a branch to delete")
-            return
-        
-        selected_item = selected_items[0]
-        branch_id = self.branch_tree.item(selected_item)["values"][0]
-        branch_name = self.branch_tree.item(selected_item)["values"][1]
-        
-        if messagebox.askyesno("Confirm", f"Delete branch '{branch_name}'?"):
-            try:
-                if self.db.delete_branch(branch_id):
-                    messagebox.showinfo("Success", "Branch deleted")
-                    self._load_branches()
-                    self._new_branch()  # Clear form
-                else:
-                    messagebox.showerror("Error", "Failed to delete branch")
-            except Exception as e:
-                messagebox.showerror("Error", f"Delete failed: {str(e)}")
-
-    # ======================
-    # EMPLOYEE TAB IMPLEMENTATION
-    # ======================
-    def _create_employee_tab(self):
-        """Create employee management tab"""
-        self.employee_tab = ttk.Frame(self.notebook)
-        self.notebook.add(self.employee_tab, text="Employee Management")
-        
-        # Main container
-        main_frame = ttk.Frame(self.employee_tab)
-        main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        # Form frame
-        form_frame = ttk.LabelFrame(main_frame, text="Employee Details")
-        form_frame.pack(fill=tk.X, pady=5)
-        
-        # Form fields
-        fields = [
-            "Name:", 
-            "Date of Birth (YYYY-MM-DD):", 
-            "Phone:", 
-            "Email:", 
-            "Position:", 
-            "Branch ID:"
-        ]
-        self.employee_entries = []
-        for i, field in enumerate(fields):
-            ttk.Label(form_frame, text=field).grid(row=i, column=0, sticky="e", padx=5, pady=3)
-            entry = ttk.Entry(form_frame, width=40)
-            entry.grid(row=i, column=1, sticky="w", padx=5, pady=3)
-            self.employee_entries.append(entry)
-
-        # Form buttons (Save and Clear)
-        form_btn_frame = ttk.Frame(form_frame)
-        form_btn_frame.grid(row=len(fields), columnspan=2, pady=10)
-        
-        ttk.Button(form_btn_frame, text="Save", command=self._update_employee, 
-                  style='Primary.TButton').pack(side=tk.LEFT, padx=5)
-        ttk.Button(form_btn_frame, text="Clear", command=self._new_employee).pack(side=tk.LEFT, padx=5)
-
-        # Treeview frame
-        tree_frame = ttk.LabelFrame(main_frame, text="Employee List")
-        tree_frame.pack(fill=tk.BOTH, expand=True, pady=5)
-        
-        # Treeview
-        columns = ("ID", "Name", "DOB", "Phone", "Email", "Position", "Branch ID")
-        self.employee_tree = ttk.Treeview(tree_frame, columns=columns, show="headings", selectmode='browse')
-        
-        for col in columns:
-            self.employee_tree.heading(col, text=col)
-            self.employee_tree.column(col, width=120, anchor=tk.CENTER)
-        
-        # Scrollbars
-        y_scroll = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.employee_tree.yview)
-        x_scroll = ttk.Scrollbar(tree_frame, orient=tk.HORIZONTAL, command=self.employee_tree.xview)
-        self.employee_tree.configure(yscroll=y_scroll.set, xscroll=x_scroll.set)
-        
-        # Layout
-        self.employee_tree.grid(row=0, column=0, sticky="nsew")
-        y_scroll.grid(row=0, column=1, sticky="ns")
-        x_scroll.grid(row=1, column=0, sticky="ew")
-        
-        tree_frame.grid_rowconfigure(0, weight=1)
-        tree_frame.grid_columnconfigure(0, weight=1)
-        
-        # Treeview buttons (New, Update, Delete)
-        tree_btn_frame = ttk.Frame(tree_frame)
-        tree_btn_frame.grid(row=2, columnspan=2, pady=5)
-        
-        ttk.Button(tree_btn_frame, text="New", command=self._new_employee).pack(side=tk.LEFT, padx=5)
-        ttk.Button(tree_btn_frame, text="Update", command=self._update_employee, 
-                  style='Primary.TButton').pack(side=tk.LEFT, padx=5)
-        ttk.Button(tree_btn_frame, text="Delete", command=self._delete_employee, 
-                  style='Danger.TButton').pack(side=tk.LEFT, padx=5)
-
-        # Search frame (at bottom)
-        search_frame = ttk.Frame(main_frame)
-        search_frame.pack(fill=tk.X, pady=5)
-        
-        ttk.Label(search_frame, text="Search Employee:").pack(side=tk.LEFT, padx=5)
-        self.employee_search_var = tk.StringVar()
-        search_entry = ttk.Entry(search_frame, textvariable=self.employee_search_var, width=40)
-        search_entry.pack(side=tk.LEFT, padx=5)
-        ttk.Button(search_frame, text="Search", command=self._search_employees).pack(side=tk.LEFT, padx=5)
-        ttk.Button(search_frame, text="Clear", command=self._clear_employee_search).pack(side=tk.LEFT)
-        
-        # Bind Enter key to search
-        search_entry.bind('<Return>', lambda e: self._search_employees())
-        
-        # Bind selection event
-        self.employee_tree.bind("<<TreeviewSelect>>", self._on_employee_select)
-        
-        # Load initial data
-        self._load_employees()
-
-    def _load_employees(self):
-        """Load employees into treeview"""
-        for item in self.employee_tree.get_children():
-            self.employee_tree.delete(item)
-        
-        try:
-            employees = self.db.get_all_employees()
-            for emp in employees:
-                self.employee_tree.insert("", tk.END, values=(
-                    emp["emp_id"],
-                    emp["emp_name"],
-                    emp["emp_dob"],
-                    emp["emp_phone"],
-                    emp["emp_email"],
-                    emp["emp_position"],
-                    emp["branch_id"]
-                ))
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load employees: {str(e)}")
-
-    def _search_employees(self):
-        """Search employees by name, email or position"""
-        search_term = self.employee_search_var.get().strip()
-        if not search_term:
-            self._load_employees()
-            return
-        
-        try:
-            for item in self.employee_tree.get_children():
-                self.employee_tree.delete(item)
-            
-            employees = self.db.search_employees(search_term)
-            for emp in employees:
-                self.employee_tree.insert("", tk.END, values=(
-                    emp["emp_id"],
-                    emp["emp_name"],
-                    emp["emp_dob"],
-                    emp["emp_phone"],
-                    emp["emp_email"],
-                    emp["emp_position"],
-                    emp["branch_id"]
-                ))
-        except Exception as e:
-            messagebox.showerror("Error", f"Search failed: {str(e)}")
-
-    def _clear_employee_search(self):
-        """Clear employee search results"""
-        self.employee_search_var.set("")
-        self._load_employees()
-
-    def _on_employee_select(self, event):
-        """Handle employee selection in treeview"""
-        selected_items = self.employee_tree.selection()
-        if not selected_items:
-            return
-        
-        selected_item = selected_items[0]
-        emp_id = self.employee_tree.item(selected_item)["values"][0]
-        
-        try:
-            employee = self.db.get_employee_by_id(emp_id)
-            if employee:
-                self.current_employee_id = employee["emp_id"]
-                # Update form fields
-                for i, field in enumerate(["emp_name", "emp_dob", "emp_phone", 
-                                          "emp_email", "emp_position", "branch_id"]):
-                    self.employee_entries[i].delete(0, tk.END)
-                    self.employee_entries[i].insert(0, employee[field])
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load employee details: {str(e)}")
-
-    def _update_employee(self):
-        """Update selected employee"""
-        if not hasattr(self, 'current_employee_id') or not self.current_employee_id:
-            messagebox.showwarning("Warning", "Please select an employee to update")
-            return
-        
-        data = [entry.get().strip() for entry in self.employee_entries]
-        if not all(data):
-            messagebox.showerror("Error", "All fields are required")
-            return
-        
-        # Validate date format
-        try:
-            datetime.strptime(data[1], "%Y-%m-%d")
-        except ValueError:
-            messagebox.showerror("Error", "Invalid date format. Use YYYY-MM-DD")
-            return
-        
-        try:
-            success = self.db.update_employee(
-                self.current_employee_id,
-                data[0],  # name
-                data[1],  # dob
-                data[2],  # phone
-                data[3],  # email
-                data[4],  # position
-                data[5]   # branch_id
-            )
-            if success:
-                messagebox.showinfo("Success", "Employee updated successfully")
-                self._load_employees()
-            else:
-                messagebox.showerror("Error", "Failed to update employee")
-        except Exception as e:
-            messagebox.showerror("Error", f"Update failed: {str(e)}")
-
-    def _new_employee(self):
-        """Clear form for new employee entry"""
-        self.current_employee_id = None
-        for entry in self.employee_entries:
-            entry.delete(0, tk.END)
-
-    def _delete_employee(self):
-        """Delete selected employee"""
-        selected_items = self.employee_tree.selection()
-        if not selected_items:
-            messagebox.showwarning("Warning", "Please select an employee to delete")
-            return
-        
-        selected_item = selected_items[0]
-        emp_id = self.employee_tree.item(selected_item)["values"][0]
-        emp_name = self.employee_tree.item(selected_item)["values"][1]
-        
-        if messagebox.askyesno("Confirm", f"Delete employee '{emp_name}'?"):
-            try:
-                if self.db.delete_employee(emp_id):
-                    messagebox.showinfo("Success", "Employee deleted")
-                    self._load_employees()
-                    self._new_employee()  # Clear form
-                else:
-                    messagebox.showerror("Error", "Failed to delete employee")
-            except Exception as e:
-                messagebox.showerror("Error", f"Delete failed: {str(e)}")
-
-    # ======================
-    # CUSTOMER TAB IMPLEMENTATION
-    # ======================
-    def _create_customer_tab(self):
-        """Create customer management tab"""
-        self.customer_tab = ttk.Frame(self.notebook)
-        self.notebook.add(self.customer_tab, text="Customer Management")
-        
-        # Main container
-        main_frame = ttk.Frame(self.customer_tab)
-        main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        # Form frame
-        form_frame = ttk.LabelFrame(main_frame, text="Customer Details")
-        form_frame.pack(fill=tk.X, pady=5)
-        
-        # Form fields
-        fields = [
-            "Name:", 
-            "Date of Birth (YYYY-MM-DD):", 
-            "Phone:", 
-            "Email:", 
-            "Address:", 
-            "Branch ID:"
-        ]
-        self.customer_entries = []
-        for i, field in enumerate(fields):
-            ttk.Label(form_frame, text=field).grid(row=i, column=0, sticky="e", padx=5, pady=3)
-            entry = ttk.Entry(form_frame, width=40)
-            entry.grid(row=i, column=1, sticky="w", padx=5, pady=3)
-            self.customer_entries.append(entry)
-
-        # Form buttons (Save and Clear)
-        form_btn_frame = ttk.Frame(form_frame)
-        form_btn_frame.grid(row=len(fields), columnspan=2, pady=10)
-        
-        ttk.Button(form_btn_frame, text="Save", command=self._update_customer, 
-                  style='Primary.TButton').pack(side=tk.LEFT, padx=5)
-        ttk.Button(form_btn_frame, text="Clear", command=self._new_customer).pack(side=tk.LEFT, padx=5)
-
-        # Treeview frame
-        tree_frame = ttk.LabelFrame(main_frame, text="Customer List")
-        tree_frame.pack(fill=tk.BOTH, expand=True, pady=5)
-        
-        # Treeview
-        columns = ("ID", "Name", "DOB", "Phone", "Email", "Address", "Branch ID")
-        self.customer_tree = ttk.Treeview(tree_frame, columns=columns, show="headings", selectmode='browse')
-        
-        for col in columns:
-            self.customer_tree.heading(col, text=col)
-            self.customer_tree.column(col, width=120, anchor=tk.CENTER)
-        
-        # Scrollbars
-        y_scroll = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.customer_tree.yview)
-        x_scroll = ttk.Scrollbar(tree_frame, orient=tk.HORIZONTAL, command=self.customer_tree.xview)
-        self.customer_tree.configure(yscroll=y_scroll.set, xscroll=x_scroll.set)
-        
-        # Layout
-        self.customer_tree.grid(row=0, column=0, sticky="nsew")
-        y_scroll.grid(row=0, column=1, sticky="ns")
-        x_scroll.grid(row=1, column=0, sticky="ew")
-        
-        tree_frame.grid_rowconfigure(0, weight=1)
-        tree_frame.grid_columnconfigure(0, weight=1)
-        
-        # Treeview buttons (New, Update, Delete)
-        tree_btn_frame = ttk.Frame(tree_frame)
-        tree_btn_frame.grid(row=2, columnspan=2, pady=5)
-        
-        ttk.Button(tree_btn_frame, text="New", command=self._new_customer).pack(side=tk.LEFT, padx=5)
-        ttk.Button(tree_btn_frame, text="Update", command=self._update_customer, 
-                  style='Primary.TButton').pack(side=tk.LEFT, padx=5)
-        ttk.Button(tree_btn_frame, text="Delete", command=self._delete_customer, 
-                  style='Danger.TButton').pack(side=tk.LEFT, padx=5)
-
-        # Search frame (at bottom)
-        search_frame = ttk.Frame(main_frame)
-        search_frame.pack(fill=tk.X, pady=5)
-        
-        ttk.Label(search_frame, text="Search Customer:").pack(side=tk.LEFT, padx=5)
-        self.customer_search_var = tk.StringVar()
-        search_entry = ttk.Entry(search_frame, textvariable=self.customer_search_var, width=40)
-        search_entry.pack(side=tk.LEFT, padx=5)
-        ttk.Button(search_frame, text="Search", command=self._search_customers).pack(side=tk.LEFT, padx=5)
-        ttk.Button(search_frame, text="Clear", command=self._clear_customer_search).pack(side=tk.LEFT)
-        
-        # Bind Enter key to search
-        search_entry.bind('<Return>', lambda e: self._search_customers())
-        
-        # Bind selection event
-        self.customer_tree.bind("<<TreeviewSelect>>", self._on_customer_select)
-        
-        # Load initial data
-        self._load_customers()
-
-    def _load_customers(self):
-        """Load customers into treeview"""
-        for item in self.customer_tree.get_children():
-            self.customer_tree.delete(item)
-        
-        try:
-            customers = self.db.get_all_customers()
-            for cust in customers:
-                self.customer_tree.insert("", tk.END, values=(
-                    cust["cust_id"],
-                    cust["name"],
-                    cust["dob"],
-                    cust["phone"],
-                    cust["email"],
-                    cust["address"],
-                    cust["branch_id"]
-                ))
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load customers: {str(e)}")
-
-    def _search_customers(self):
-        """Search customers by name, email or phone"""
-        search_term = self.customer_search_var.get().strip()
-        if not search_term:
-            self._load_customers()
-            return
-        
-        try:
-            for item in self.customer_tree.get_children():
-                self.customer_tree.delete(item)
-            
-            customers = self.db.search_customers(search_term)
-            for cust in customers:
-                self.customer_tree.insert("", tk.END, values=(
-                    cust["cust_id"],
-                    cust["name"],
-                    cust["dob"],
-                    cust["phone"],
-                    cust["email"],
-                    cust["address"],
-                    cust["branch_id"]
-                ))
-        except Exception as e:
-            messagebox.showerror("Error", f"Search failed: {str(e)}")
-
-    def _clear_customer_search(self):
-        """Clear customer search results"""
-        self.customer_search_var.set("")
-        self._load_customers()
-
-    def _on_customer_select(self, event):
-        """Handle customer selection in treeview"""
-        selected_items = self.customer_tree.selection()
-        if not selected_items:
-            return
-        
-        selected_item = selected_items[0]
-        cust_id = self.customer_tree.item(selected_item)["values"][0]
-        
-        try:
-            customer = self.db.get_customer_by_id(cust_id)
-            if customer:
-                self.current_customer_id = customer["cust_id"]
-                # Update form fields
-                for i, field in enumerate(["name", "dob", "phone", 
-                                          "email", "address", "branch_id"]):
-                    self.customer_entries[i].delete(0, tk.END)
-                    self.customer_entries[i].insert(0, customer[field])
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load customer details: {str(e)}")
-
-    def _update_customer(self):
-        """Update selected customer"""
-        if not hasattr(self, 'current_customer_id') or not self.current_customer_id:
-            messagebox.showwarning("Warning", "Please select a customer to update")
-            return
-        
-        data = [entry.get().strip() for entry in self.customer_entries]
-        if not all(data):
-            messagebox.showerror("Error", "All fields are required")
-            return
-        
-        # Validate date format
-        try:
-            datetime.strptime(data[1], "%Y-%m-%d")
-        except ValueError:
-            messagebox.showerror("Error", "Invalid date format. Use YYYY-MM-DD")
-            return
-        
-        try:
-            success = self.db.update_customer(
-                self.current_customer_id,
-                data[0],  # name
-                data[1],  # dob
-                data[2],  # phone
-                data[3],  # email
-                data[4],  # address
-                data[5]   # branch_id
-            )
-            if success:
-                messagebox.showinfo("Success", "Customer updated successfully")
-                self._load_customers()
-            else:
-                messagebox.showerror("Error", "Failed to update customer")
-        except Exception as e:
-            messagebox.showerror("Error", f"Update failed: {str(e)}")
-
-    def _new_customer(self):
-        """Clear form for new customer entry"""
-        self.current_customer_id = None
-        for entry in self.customer_entries:
-            entry.delete(0, tk.END)
-
-    def _delete_customer(self):
-        """Delete selected customer"""
-        selected_items = self.customer_tree.selection()
-        if not selected_items:
-            messagebox.showwarning("Warning", "Please select a customer to delete")
-            return
-        
-        selected_item = selected_items[0]
-        cust_id = self.customer_tree.item(selected_item)["values"][0]
-        cust_name = self.customer_tree.item(selected_item)["values"][1]
-        
-        if messagebox.askyesno("Confirm", f"Delete customer '{cust_name}'?"):
-            try:
-                if self.db.delete_customer(cust_id):
-                    messagebox.showinfo("Success", "Customer deleted")
-                    self._load_customers()
-                    self._new_customer()  # Clear form
-                else:
-                    messagebox.showerror("Error", "Failed to delete customer")
-            except Exception as e:
-                messagebox.showerror("Error", f"Delete failed: {str(e)}")
-
-    import tkinter as tk
-from tkinter import ttk, messagebox
-from configuration import DatabaseManager
-from datetime import datetime
-
-class BankManagementApp:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Bank Management System")
-        self.root.geometry("1000x700")
-        self.root.minsize(800, 600)
-        self.root.configure(bg="#A3D1C6")
-
-        # Initialize database connection
-        try:
-            self.db = DatabaseManager()
-        except Exception as e:
-            messagebox.showerror("Database Error", f"Failed to connect to database: {str(e)}")
-            root.destroy()
-            return
-
-        # Current user information
-        self.current_user = None
-        self.user_type = None
-
-        # Setup the login interface
-        self._setup_login_interface()
-
-    def _setup_login_interface(self):
-        """Create the login interface with admin, employee, and customer options"""
-        self.clear_window()
-        
-        # Main frame
-        login_frame = ttk.Frame(self.root, padding="30 15 30 15")
-        login_frame.pack(fill=tk.BOTH, expand=True)
-        
-        # Title
-        ttk.Label(login_frame, text="Bank Management System", 
-                 font=("Helvetica", 20, "bold")).pack(pady=20)
-        
-        # Login options frame
-        options_frame = ttk.Frame(login_frame)
-        options_frame.pack(pady=30)
-        
-        # Buttons for each user type
-        ttk.Button(options_frame, text="Admin Login", 
-                  command=lambda: self._show_admin_interface(), 
-                  width=20).pack(pady=10)
-        
-        ttk.Button(options_frame, text="Employee Login", 
-                  command=lambda: self._show_employee_interface(), 
-                  width=20).pack(pady=10)
-        
-        ttk.Button(options_frame, text="Customer Login", 
-                  command=lambda: self._show_customer_interface(), 
-                  width=20).pack(pady=10)
-
-    def _show_admin_interface(self):
-        """Show the admin interface with branch management"""
-        self.user_type = "admin"
-        self.clear_window()
-        
-        # Create notebook for tabs
-        self.notebook = ttk.Notebook(self.root)
-        self.notebook.pack(fill=tk.BOTH, expand=True)
-        
-        # Branch tab
-        self.branch_tab = ttk.Frame(self.notebook)
-        self.notebook.add(self.branch_tab, text="Branch Management")
-        
-        # Create branch management interface
-        self._create_branch_interface()
-        
-        # Back button
-        back_button = ttk.Button(self.root, text="Logout", 
-                                command=self._setup_login_interface)
-        back_button.pack(pady=10)
-
-    def _show_employee_interface(self):
-        """Show the employee interface with employee management"""
-        self.user_type = "employee"
-        self.clear_window()
-        
-        # Create notebook for tabs
-        self.notebook = ttk.Notebook(self.root)
-        self.notebook.pack(fill=tk.BOTH, expand=True)
-        
-        # Employee tab
-        self.employee_tab = ttk.Frame(self.notebook)
-        self.notebook.add(self.employee_tab, text="Employee Management")
-        
-        # Create employee management interface
-        self._create_employee_interface()
-        
-        # Back button
-        back_button = ttk.Button(self.root, text="Logout", 
-                                command=self._setup_login_interface)
-        back_button.pack(pady=10)
-
-    def _show_customer_interface(self):
-        """Show the customer interface with customer management"""
-        self.user_type = "customer"
-        self.clear_window()
-        
-        # Create notebook for tabs
-        self.notebook = ttk.Notebook(self.root)
-        self.notebook.pack(fill=tk.BOTH, expand=True)
-        
-        # Customer tab
-        self.customer_tab = ttk.Frame(self.notebook)
-        self.notebook.add(self.customer_tab, text="Customer Management")
-        
-        # Create customer management interface
-        self._create_customer_interface()
-        
-        # Back button
-        back_button = ttk.Button(self.root, text="Logout", 
-                                command=self._setup_login_interface)
-        back_button.pack(pady=10)
-
-    def _create_branch_interface(self):
-        """Create branch management interface in the branch tab"""
-        # Form for branch details
-        details_frame = ttk.LabelFrame(self.branch_tab, text="Branch Details", padding="10 5 10 10")
-        details_frame.pack(fill=tk.X, padx=10, pady=5)
-        
-        # Labels and entries for branch attributes
-        labels = ["Branch Name:", "Address:", "City:", "State:", "PIN Code:"]
-        self.branch_entries = []
-        
-        for i, label_text in enumerate(labels):
-            ttk.Label(details_frame, text=label_text).grid(row=i, column=0, sticky="e", padx=5, pady=3)
-            entry = ttk.Entry(details_frame, width=40)
-            entry.grid(row=i, column=1, sticky="w", padx=5, pady=3)
-            self.branch_entries.append(entry)
-        
-        # Buttons frame
-        btn_frame = ttk.Frame(details_frame)
-        btn_frame.grid(row=len(labels), columnspan=2, pady=10)
-        
-        ttk.Button(btn_frame, text="Save", command=self._save_branch).pack(side=tk.LEFT, padx=5)
-        ttk.Button(btn_frame, text="New", command=self._new_branch).pack(side=tk.LEFT, padx=5)
-        ttk.Button(btn_frame, text="Delete", command=self._delete_branch).pack(side=tk.LEFT, padx=5)
-        
-        # Branch list
-        list_frame = ttk.LabelFrame(self.branch_tab, text="Branch List", padding="10 5 10 10")
-        list_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
-        
-        # Treeview for displaying branches
-        columns = ("ID", "Name", "Address", "City", "State", "PIN Code")
-        self.branch_tree = ttk.Treeview(list_frame, columns=columns, show="headings")
-        
-        for col in columns:
-            self.branch_tree.heading(col, text=col)
-            self.branch_tree.column(col, width=120, anchor=tk.CENTER)
-        
-        # Scrollbars
-        y_scroll = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.branch_tree.yview)
-        x_scroll = ttk.Scrollbar(list_frame, orient=tk.HORIZONTAL, command=self.branch_tree.xview)
-        self.branch_tree.configure(yscroll=y_scroll.set, xscroll=x_scroll.set)
-        
-        # Grid layout
-        self.branch_tree.grid(row=0, column=0, sticky="nsew")
-        y_scroll.grid(row=0, column=1, sticky="ns")
-        x_scroll.grid(row=1, column=0, sticky="ew")
-        
-        list_frame.grid_rowconfigure(0, weight=1)
-        list_frame.grid_columnconfigure(0, weight=1)
-        
-        # Bind selection event
-        self.branch_tree.bind("<<TreeviewSelect>>", self._on_branch_select)
-        
-        # Load initial data
-        self._load_branches()
-
-    def _create_employee_interface(self):
-        """Create employee management interface in the employee tab"""
-        # Form for employee details
-        details_frame = ttk.LabelFrame(self.employee_tab, text="Employee Details", padding="10 5 10 10")
-        details_frame.pack(fill=tk.X, padx=10, pady=5)
-        
-        # Labels and entries for employee attributes
-        labels = [
-            "Name:", "Date of Birth (YYYY-MM-DD):", 
-            "Phone:", "Email:", 
-            "Position:", "Branch ID:"
-        ]
-        self.employee_entries = []
-        
-        for i, label_text in enumerate(labels):
-            ttk.Label(details_frame, text=label_text).grid(row=i, column=0, sticky="e", padx=5, pady=3)
-            entry = ttk.Entry(details_frame, width=40)
-            entry.grid(row=i, column=1, sticky="w", padx=5, pady=3)
-            self.employee_entries.append(entry)
-        
-        # Buttons frame
-        btn_frame = ttk.Frame(details_frame)
-        btn_frame.grid(row=len(labels), columnspan=2, pady=10)
-        
-        ttk.Button(btn_frame, text="Save", command=self._save_employee).pack(side=tk.LEFT, padx=5)
-        ttk.Button(btn_frame, text="New", command=self._new_employee).pack(side=tk.LEFT, padx=5)
-        ttk.Button(btn_frame, text="Delete", command=self._delete_employee).pack(side=tk.LEFT, padx=5)
-        
-        # Employee list
-        list_frame = ttk.LabelFrame(self.employee_tab, text="Employee List", padding="10 5 10 10")
-        list_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
-        
-        # Treeview for displaying employees
-        columns = ("ID", "Name", "DOB", "Phone", "Email", "Position", "Branch ID", "Branch Name")
-        self.employee_tree = ttk.Treeview(list_frame, columns=columns, show="headings")
-        
-        for col in columns:
-            self.employee_tree.heading(col, text=col)
-            self.employee_tree.column(col, width=120, anchor=tk.CENTER)
-        
-        # Scrollbars
-        y_scroll = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.employee_tree.yview)
-        x_scroll = ttk.Scrollbar(list_frame, orient=tk.HORIZONTAL, command=self.employee_tree.xview)
-        self.employee_tree.configure(yscroll=y_scroll.set, xscroll=x_scroll.set)
-        
-        # Grid layout
-        self.employee_tree.grid(row=0, column=0, sticky="nsew")
-        y_scroll.grid(row=0, column=1, sticky="ns")
-        x_scroll.grid(row=1, column=0, sticky="ew")
-        
-        list_frame.grid_rowconfigure(0, weight=1)
-        list_frame.grid_columnconfigure(0, weight=1)
-        
-        # Bind selection event
-        self.employee_tree.bind("<<TreeviewSelect>>", self._on_employee_select)
-        
-        # Load initial data
-        self._load_employees()
-
-    def _create_customer_interface(self):
-        """Create customer management interface in the customer tab"""
-        # Form for customer details
-        details_frame = ttk.LabelFrame(self.customer_tab, text="Customer Details", padding="10 5 10 10")
-        details_frame.pack(fill=tk.X, padx=10, pady=5)
-        
-        # Labels and entries for customer attributes
-        labels = [
-            "Name:", "Date of Birth (YYYY-MM-DD):", 
-            "Phone:", "Email:", 
-            "Address:", "Branch ID:"
-        ]
-        self.customer_entries = []
-        
-        for i, label_text in enumerate(labels):
-            ttk.Label(details_frame, text=label_text).grid(row=i, column=0, sticky="e", padx=5, pady=3)
-            entry = ttk.Entry(details_frame, width=40)
-            entry.grid(row=i, column=1, sticky="w", padx=5, pady=3)
-            self.customer_entries.append(entry)
-        
-        # Buttons frame
-        btn_frame = ttk.Frame(details_frame)
-        btn_frame.grid(row=len(labels), columnspan=2, pady=10)
-        
-        ttk.Button(btn_frame, text="Save", command=self._save_customer).pack(side=tk.LEFT, padx=5)
-        ttk.Button(btn_frame, text="New", command=self._new_customer).pack(side=tk.LEFT, padx=5)
-        ttk.Button(btn_frame, text="Delete", command=self._delete_customer).pack(side=tk.LEFT, padx=5)
-        
-        # Customer list
-        list_frame = ttk.LabelFrame(self.customer_tab, text="Customer List", padding="10 5 10 10")
-        list_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
-        
-        # Treeview for displaying customers
-        columns = ("ID", "Name", "DOB", "Phone", "Email", "Address", "Branch ID", "Branch Name")
-        self.customer_tree = ttk.Treeview(list_frame, columns=columns, show="headings")
-        
-        for col in columns:
-            self.customer_tree.heading(col, text=col)
-            self.customer_tree.column(col, width=120, anchor=tk.CENTER)
-        
-        # Scrollbars
-        y_scroll = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.customer_tree.yview)
-        x_scroll = ttk.Scrollbar(list_frame, orient=tk.HORIZONTAL, command=self.customer_tree.xview)
-        self.customer_tree.configure(yscroll=y_scroll.set, xscroll=x_scroll.set)
-        
-        # Grid layout
-        self.customer_tree.grid(row=0, column=0, sticky="nsew")
-        y_scroll.grid(row=0, column=1, sticky="ns")
-        x_scroll.grid(row=1, column=0, sticky="ew")
-        
-        list_frame.grid_rowconfigure(0, weight=1)
-        list_frame.grid_columnconfigure(0, weight=1)
-        
-        # Bind selection event
-        self.customer_tree.bind("<<TreeviewSelect>>", self._on_customer_select)
-        
-        # Load initial data
-        self._load_customers()
-
-    # ======================
-    # BRANCH METHODS
-    # ======================
-    
-    def _load_branches(self):
-        """Load branches from database into the treeview"""
-        for item in self.branch_tree.get_children():
-            self.branch_tree.delete(item)
-        
-        try:
-            branches = self.db.get_all_branches()
-            for branch in branches:
-                self.branch_tree.insert("", tk.END, values=(
-                    branch["branch_id"],
-                    branch["branch_name"],
-                    branch["branch_address"],
-                    branch["branch_city"],
-                    branch["branch_state"],
-                    branch["branch_zip"]
-                ))
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load branches: {str(e)}")
-
-    def _save_branch(self):
-        """Save branch details to database"""
-        data = [entry.get().strip() for entry in self.branch_entries]
-        
-        # Validate all fields are filled
-        if not all(data):
-            messagebox.showerror("Error", "All fields are required")
-            return
-        
-        try:
-            if hasattr(self, 'current_branch_id') and self.current_branch_id:
-                # Update existing branch
-                success = self.db.update_branch(
-                    self.current_branch_id, 
-                    data[0], data[1], data[2], data[3], data[4]
-                )
-                if success:
-                    messagebox.showinfo("Success", "Branch updated successfully")
-                else:
-                    messagebox.showerror("Error", "Failed to update branch")
-            else:
-                # Create new branch
-                branch_id = self.db.insert_branch(
-                    data[0], data[1], data[2], data[3], data[4]
-                )
-                if branch_id:
-                    messagebox.showinfo("Success", "Branch added successfully")
-                    self.current_branch_id = branch_id
-                else:
-                    messagebox.showerror("Error", "Failed to add branch")
-            
-            # Refresh the branch list and clear form
-            self._load_branches()
-            self._clear_branch_fields()
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
-
-    def _new_branch(self):
-        """Clear the form for a new branch"""
-        self.current_branch_id = None
-        self._clear_branch_fields()
-
-    def _delete_branch(self):
-        """Delete the selected branch"""
-        selected_items = self.branch_tree.selection()
-        if not selected_items:
-            messagebox.showinfo("Information", "Please select a branch to delete")
-            return
-        
-        selected_item = selected_items[0]
-        branch_id = self.branch_tree.item(selected_item)["values"][0]
-        branch_name = self.branch_tree.item(selected_item)["values"][1]
-        
-        # Confirm deletion
-        confirm = messagebox.askyesno(
-            "Confirm Deletion", 
-            f"Are you sure you want to delete branch '{branch_name}'?"
-        )
-        if not confirm:
-            return
-        
-        try:
-            success = self.db.delete_branch(branch_id)
-            if success:
-                messagebox.showinfo("Success", "Branch deleted successfully")
-                self._clear_branch_fields()
-                self._load_branches()
-            else:
-                messagebox.showerror("Error", "Failed to delete branch")
-        except Exception as e:
-            messagebox.showerror("Error", f"Could not delete branch: {str(e)}")
-
-    def _on_branch_select(self, event):
-        """Handle branch selection in treeview"""
-        selected_items = self.branch_tree.selection()
-        if not selected_items:
-            return
-        
-        selected_item = selected_items[0]
-        branch_id = self.branch_tree.item(selected_item)["values"][0]
-        
-        try:
-            branch = self.db.get_branch_by_id(branch_id)
-            if branch:
-                self.current_branch_id = branch["branch_id"]
-                self.branch_entries[0].delete(0, tk.END)
-                self.branch_entries[0].insert(0, branch["branch_name"])
-                self.branch_entries[1].delete(0, tk.END)
-                self.branch_entries[1].insert(0, branch["branch_address"])
-                self.branch_entries[2].delete(0, tk.END)
-                self.branch_entries[2].insert(0, branch["branch_city"])
-                self.branch_entries[3].delete(0, tk.END)
-                self.branch_entries[3].insert(0, branch["branch_state"])
-                self.branch_entries[4].delete(0, tk.END)
-                self.branch_entries[4].insert(0, branch["branch_zip"])
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load branch details: {str(e)}")
-
-    def _clear_branch_fields(self):
-        """Clear all branch form fields"""
-        for entry in self.branch_entries:
-            entry.delete(0, tk.END)
-        if hasattr(self, 'current_branch_id'):
-            del self.current_branch_id
-
-    # ======================
-    # EMPLOYEE METHODS
-    # ======================
-    
-    def _load_employees(self):
-        """Load employees from database into the treeview"""
-        for item in self.employee_tree.get_children():
-            self.employee_tree.delete(item)
-        
-        try:
-            employees = self.db.get_all_employees()
-            for emp in employees:
-                self.employee_tree.insert("", tk.END, values=(
-                    emp["emp_id"],
-                    emp["emp_name"],
-                    emp["emp_dob"],
-                    emp["emp_phone"],
-                    emp["emp_email"],
-                    emp["emp_position"],
-                    emp["branch_id"],
-                    emp["branch_name"]
-                ))
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load employees: {str(e)}")
-
-    def _save_employee(self):
-        """Save employee details to database"""
-        data = [entry.get().strip() for entry in self.employee_entries]
-        
-        # Validate all fields are filled
-        if not all(data):
-            messagebox.showerror("Error", "All fields are required")
-            return
-        
-        # Validate date format
-        try:
-            datetime.strptime(data[1], "%Y-%m-%d")
-        except ValueError:
-            messagebox.showerror("Error", "Invalid date format. Use YYYY-MM-DD")
-            return
-        
-        try:
-            if hasattr(self, 'current_employee_id') and self.current_employee_id:
-                # Update existing employee
-                success = self.db.update_employee(
-                    self.current_employee_id,
-                    data[0], data[1], data[2], data[3], data[4], data[5]
-                )
-                if success:
-                    messagebox.showinfo("Success", "Employee updated successfully")
-                else:
-                    messagebox.showerror("Error", "Failed to update employee")
-            else:
-                # Create new employee
-                emp_id = self.db.insert_employee(
-                    data[0], data[1], data[2], data[3], data[4], data[5]
-                )
-                if emp_id:
-                    messagebox.showinfo("Success", "Employee added successfully")
-                    self.current_employee_id = emp_id
-                else:
-                    messagebox.showerror("Error", "Failed to add employee")
-            
-            # Refresh the employee list and clear form
-            self._load_employees()
-            self._clear_employee_fields()
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
-
-    def _new_employee(self):
-        """Clear the form for a new employee"""
-        self.current_employee_id = None
-        self._clear_employee_fields()
-
-    def _delete_employee(self):
-        """Delete the selected employee"""
-        selected_items = self.employee_tree.selection()
-        if not selected_items:
-            messagebox.showinfo("Information", "Please select an employee to delete")
-            return
-        
-        selected_item = selected_items[0]
-        emp_id = self.employee_tree.item(selected_item)["values"][0]
-        emp_name = self.employee_tree.item(selected_item)["values"][1]
-        
-        # Confirm deletion
-        confirm = messagebox.askyesno(
-            "Confirm Deletion", 
-            f"Are you sure you want to delete employee '{emp_name}'?"
-        )
-        if not confirm:
-            return
-        
-        try:
-            success = self.db.delete_employee(emp_id)
-            if success:
-                messagebox.showinfo("Success", "Employee deleted successfully")
-                self._clear_employee_fields()
-                self._load_employees()
-            else:
-                messagebox.showerror("Error", "Failed to delete employee")
-        except Exception as e:
-            messagebox.showerror("Error", f"Could not delete employee: {str(e)}")
-
-    def _on_employee_select(self, event):
-        """Handle employee selection in treeview"""
-        selected_items = self.employee_tree.selection()
-        if not selected_items:
-            return
-        
-        selected_item = selected_items[0]
-        emp_id = self.employee_tree.item(selected_item)["values"][0]
-        
-        try:
-            employee = self.db.get_employee_by_id(emp_id)
-            if employee:
-                self.current_employee_id = employee["emp_id"]
-                self.employee_entries[0].delete(0, tk.END)
-                self.employee_entries[0].insert(0, employee["emp_name"])
-                self.employee_entries[1].delete(0, tk.END)
-                self.employee_entries[1].insert(0, employee["emp_dob"])
-                self.employee_entries[2].delete(0, tk.END)
-                self.employee_entries[2].insert(0, employee["emp_phone"])
-                self.employee_entries[3].delete(0, tk.END)
-                self.employee_entries[3].insert(0, employee["emp_email"])
-                self.employee_entries[4].delete(0, tk.END)
-                self.employee_entries[4].insert(0, employee["emp_position"])
-                self.employee_entries[5].delete(0, tk.END)
-                self.employee_entries[5].insert(0, employee["branch_id"])
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load employee details: {str(e)}")
-
-    def _clear_employee_fields(self):
-        """Clear all employee form fields"""
-        for entry in self.employee_entries:
-            entry.delete(0, tk.END)
-        if hasattr(self, 'current_employee_id'):
-            del self.current_employee_id
-
-    # ======================
-    # CUSTOMER METHODS
-    # ======================
-    
-    def _load_customers(self):
-        """Load customers from database into the treeview"""
-        for item in self.customer_tree.get_children():
-            self.customer_tree.delete(item)
-        
-        try:
-            customers = self.db.get_all_customers()
-            for cust in customers:
-                self.customer_tree.insert("", tk.END, values=(
-                    cust["cust_id"],
-                    cust["name"],
-                    cust["dob"],
-                    cust["phone"],
-                    cust["email"],
-                    cust["address"],
-                    cust["branch_id"],
-                    cust["branch_name"]
-                ))
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load customers: {str(e)}")
-
-    def _save_customer(self):
-        """Save customer details to database"""
-        data = [entry.get().strip() for entry in self.customer_entries]
-        
-        # Validate all fields are filled
-        if not all(data):
-            messagebox.showerror("Error", "All fields are required")
-            return
-        
-        # Validate date format
-        try:
-            datetime.strptime(data[1], "%Y-%m-%d")
-        except ValueError:
-            messagebox.showerror("Error", "Invalid date format. Use YYYY-MM-DD")
-            return
-        
-        try:
-            if hasattr(self, 'current_customer_id') and self.current_customer_id:
-                # Update existing customer
-                success = self.db.update_customer(
-                    self.current_customer_id,
-                    data[0], data[1], data[2], data[3], data[4], data[5]
-                )
-                if success:
-                    messagebox.showinfo("Success", "Customer updated successfully")
-                else:
-                    messagebox.showerror("Error", "Failed to update customer")
-            else:
-                # Create new customer
-                cust_id = self.db.insert_customer(
-                    data[0], data[1], data[2], data[3], data[4], data[5]
-                )
-                if cust_id:
-                    messagebox.showinfo("Success", "Customer added successfully")
-                    self.current_customer_id = cust_id
-                else:
-                    messagebox.showerror("Error", "Failed to add customer")
-            
-            # Refresh the customer list and clear form
-            self._load_customers()
-            self._clear_customer_fields()
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
-
-    def _new_customer(self):
-        """Clear the form for a new customer"""
-        self.current_customer_id = None
-        self._clear_customer_fields()
-
-    def _delete_customer(self):
-        """Delete the selected customer"""
-        selected_items = self.customer_tree.selection()
-        if not selected_items:
-            messagebox.showinfo("Information", "Please select a customer to delete")
-            return
-        
-        selected_item = selected_items[0]
-        cust_id = self.customer_tree.item(selected_item)["values"][0]
-        cust_name = self.customer_tree.item(selected_item)["values"][1]
-        
-        # Confirm deletion
-        confirm = messagebox.askyesno(
-            "Confirm Deletion", 
-            f"Are you sure you want to delete customer '{cust_name}'?"
-        )
-        if not confirm:
-            return
-        
-        try:
-            success = self.db.delete_customer(cust_id)
-            if success:
-                messagebox.showinfo("Success", "Customer deleted successfully")
-                self._clear_customer_fields()
-                self._load_customers()
-            else:
-                messagebox.showerror("Error", "Failed to delete customer")
-        except Exception as e:
-            messagebox.showerror("Error", f"Could not delete customer: {str(e)}")
-
-    def _on_customer_select(self, event):
-        """Handle customer selection in treeview"""
-        selected_items = self.customer_tree.selection()
-        if not selected_items:
-            return
-        
-        selected_item = selected_items[0]
-        cust_id = self.customer_tree.item(selected_item)["values"][0]
-        
-        try:
-            customer = self.db.get_customer_by_id(cust_id)
-            if customer:
-                self.current_customer_id = customer["cust_id"]
-                self.customer_entries[0].delete(0, tk.END)
-                self.customer_entries[0].insert(0, customer["name"])
-                self.customer_entries[1].delete(0, tk.END)
-                self.customer_entries[1].insert(0, customer["dob"])
-                self.customer_entries[2].delete(0, tk.END)
-                self.customer_entries[2].insert(0, customer["phone"])
-                self.customer_entries[3].delete(0, tk.END)
-                self.customer_entries[3].insert(0, customer["email"])
-                self.customer_entries[4].delete(0, tk.END)
-                self.customer_entries[4].insert(0, customer["address"])
-                self.customer_entries[5].delete(0, tk.END)
-                self.customer_entries[5].insert(0, customer["branch_id"])
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load customer details: {str(e)}")
-
-    def _clear_customer_fields(self):
-        """Clear all customer form fields"""
-        for entry in self.customer_entries:
-            entry.delete(0, tk.END)
-        if hasattr(self, 'current_customer_id'):
-            del self.current_customer_id
-
-    # ======================
-    # UTILITY METHODS
-    # ======================
-    
-    def clear_window(self):
-        """Clear all widgets from the root window"""
-        for widget in self.root.winfo_children():
-            widget.destroy()
-            
-    def __del__(self):
-        """Cleanup database connection"""
-        if hasattr(self, 'db'):
-            self.db.close()
+import tkinter as tk
+from tkinter import ttk, messagebox
+from datetime import datetime
+from configuration import DatabaseManager
+
+class BankManagementApp:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Bank Management System")
+        self.root.geometry("1200x800")
+        self.root.minsize(1000, 700)
+        
+        # Initialize database
+        try:
+            self.db = DatabaseManager()
+        except Exception as e:
+            messagebox.showerror("Database Error", f"Failed to connect to database: {str(e)}")
+            root.destroy()
+            return
+
+        # Current selection tracking
+        self.current_branch_id = None
+        self.current_employee_id = None
+        self.current_customer_id = None
+
+        # Configure styles
+        self._configure_styles()
+        
+        # Create login tabs interface
+        self._create_login_tabs()
+
+    def _configure_styles(self):
+        """Configure widget styles and colors"""
+        self.style = ttk.Style()
+        self.style.theme_use('clam')
+        
+        # Color scheme
+        self.bg_color = '#F0F8FF'  # Alice Blue
+        self.primary_color = '#4682B4'  # Steel Blue
+        self.secondary_color = '#5F9EA0'  # Cadet Blue
+        self.highlight_color = '#B0E0E6'  # Powder Blue
+        
+        # Configure styles
+        self.style.configure('TFrame', background=self.bg_color)
+        self.style.configure('TLabel', background=self.bg_color, font=('Helvetica', 10))
+        self.style.configure('TButton', font=('Helvetica', 10, 'bold'), padding=5)
+        self.style.configure('Treeview', font=('Helvetica', 9), rowheight=25, 
+                           fieldbackground=self.bg_color)
+        self.style.configure('Treeview.Heading', font=('Helvetica', 10, 'bold'))
+        self.style.map('Treeview', 
+                      background=[('selected', self.primary_color)],
+                      foreground=[('selected', 'white')])
+        self.style.configure('TLabelframe', background=self.bg_color)
+        self.style.configure('TLabelframe.Label', background=self.bg_color)
+
+    def _create_login_tabs(self):
+        """Create login interface with role selection tabs"""
+        self.login_notebook = ttk.Notebook(self.root)
+        self.login_notebook.pack(fill=tk.BOTH, expand=True)
+        
+        # Create tabs for each role
+        self._create_admin_login_tab()
+        self._create_employee_login_tab()
+        self._create_customer_login_tab()
+
+    def _create_admin_login_tab(self):
+        """Admin login tab"""
+        admin_tab = ttk.Frame(self.login_notebook)
+        self.login_notebook.add(admin_tab, text="Admin")
+        
+        # Admin tab content
+        content_frame = ttk.Frame(admin_tab)
+        content_frame.pack(expand=True, fill=tk.BOTH, padx=50, pady=50)
+        
+        ttk.Label(content_frame, text="Admin Panel", font=('Helvetica', 16, 'bold')).pack(pady=20)
+        ttk.Label(content_frame, text="Full access to all management functions").pack(pady=10)
+        
+        ttk.Button(content_frame, text="Enter Admin Dashboard", command=self._show_admin_interface,
+                  style='Primary.TButton').pack(pady=20)
+
+    def _create_employee_login_tab(self):
+        """Employee login tab"""
+        employee_tab = ttk.Frame(self.login_notebook)
+        self.login_notebook.add(employee_tab, text="Employee")
+        
+        # Employee tab content
+        content_frame = ttk.Frame(employee_tab)
+        content_frame.pack(expand=True, fill=tk.BOTH, padx=50, pady=50)
+        
+        ttk.Label(content_frame, text="Employee Panel", font=('Helvetica', 16, 'bold')).pack(pady=20)
+        ttk.Label(content_frame, text="Access to employee and customer management").pack(pady=10)
+        
+        ttk.Button(content_frame, text="Enter Employee Dashboard", command=self._show_employee_interface,
+                  style='Primary.TButton').pack(pady=20)
+
+    def _create_customer_login_tab(self):
+        """Customer login tab"""
+        customer_tab = ttk.Frame(self.login_notebook)
+        self.login_notebook.add(customer_tab, text="Customer")
+        
+        # Customer tab content
+        content_frame = ttk.Frame(customer_tab)
+        content_frame.pack(expand=True, fill=tk.BOTH, padx=50, pady=50)
+        
+        ttk.Label(content_frame, text="Customer Panel", font=('Helvetica', 16, 'bold')).pack(pady=20)
+        ttk.Label(content_frame, text="Access to customer management only").pack(pady=10)
+        
+        ttk.Button(content_frame, text="Enter Customer Dashboard", command=self._show_customer_interface,
+                  style='Primary.TButton').pack(pady=20)
+
+    def _show_admin_interface(self):
+        """Switch to admin interface"""
+        self.login_notebook.destroy()
+        self._setup_interface("admin")
+
+    def _show_employee_interface(self):
+        """Switch to employee interface"""
+        self.login_notebook.destroy()
+        self._setup_interface("employee")
+
+    def _show_customer_interface(self):
+        """Switch to customer interface"""
+        self.login_notebook.destroy()
+        self._setup_interface("customer")
+
+    def _setup_interface(self, role):
+        """Create the main interface components"""
+        self.notebook = ttk.Notebook(self.root)
+        self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        # Create tabs based on role
+        if role == "admin":
+            self._create_branch_tab()
+            self._create_employee_tab()
+            self._create_customer_tab()
+            self.notebook.select(0)  # Select first tab
+        elif role == "employee":
+            self._create_employee_tab()
+            self._create_customer_tab()
+            self.notebook.select(0)  # Select first tab
+        elif role == "customer":
+            self._create_customer_tab()
+
+    # ======================
+    # BRANCH TAB IMPLEMENTATION
+    # ======================
+    def _create_branch_tab(self):
+        """Create branch management tab"""
+        self.branch_tab = ttk.Frame(self.notebook)
+        self.notebook.add(self.branch_tab, text="Branch Management")
+        
+        # Main container
+        main_frame = ttk.Frame(self.branch_tab)
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        # Form frame
+        form_frame = ttk.LabelFrame(main_frame, text="Branch Details")
+        form_frame.pack(fill=tk.X, pady=5)
+        
+        # Form fields
+        fields = ["Name:", "Address:", "City:", "State:", "PIN Code:"]
+        self.branch_entries = []
+        for i, field in enumerate(fields):
+            ttk.Label(form_frame, text=field).grid(row=i, column=0, sticky="e", padx=5, pady=3)
+            entry = ttk.Entry(form_frame, width=40)
+            entry.grid(row=i, column=1, sticky="w", padx=5, pady=3)
+            self.branch_entries.append(entry)
+
+        # Form buttons (Save and Clear)
+        form_btn_frame = ttk.Frame(form_frame)
+        form_btn_frame.grid(row=len(fields), columnspan=2, pady=10)
+        
+        ttk.Button(form_btn_frame, text="Save", command=self._update_branch, 
+                  style='Primary.TButton').pack(side=tk.LEFT, padx=5)
+        ttk.Button(form_btn_frame, text="Clear", command=self._new_branch).pack(side=tk.LEFT, padx=5)
+
+        # Treeview frame
+        tree_frame = ttk.LabelFrame(main_frame, text="Branch List")
+        tree_frame.pack(fill=tk.BOTH, expand=True, pady=5)
+        
+        # Treeview
+        columns = ("ID", "Name", "Address", "City", "State", "PIN Code")
+        self.branch_tree = ttk.Treeview(tree_frame, columns=columns, show="headings", selectmode='browse')
+        
+        for col in columns:
+            self.branch_tree.heading(col, text=col)
+            self.branch_tree.column(col, width=120, anchor=tk.CENTER)
+        
+        # Scrollbars
+        y_scroll = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.branch_tree.yview)
+        x_scroll = ttk.Scrollbar(tree_frame, orient=tk.HORIZONTAL, command=self.branch_tree.xview)
+        self.branch_tree.configure(yscroll=y_scroll.set, xscroll=x_scroll.set)
+        
+        # Layout
+        self.branch_tree.grid(row=0, column=0, sticky="nsew")
+        y_scroll.grid(row=0, column=1, sticky="ns")
+        x_scroll.grid(row=1, column=0, sticky="ew")
+        
+        tree_frame.grid_rowconfigure(0, weight=1)
+        tree_frame.grid_columnconfigure(0, weight=1)
+        
+        # Treeview buttons (New, Update, Delete)
+        tree_btn_frame = ttk.Frame(tree_frame)
+        tree_btn_frame.grid(row=2, columnspan=2, pady=5)
+        
+        ttk.Button(tree_btn_frame, text="New", command=self._new_branch).pack(side=tk.LEFT, padx=5)
+        ttk.Button(tree_btn_frame, text="Update", command=self._update_branch, 
+                  style='Primary.TButton').pack(side=tk.LEFT, padx=5)
+        ttk.Button(tree_btn_frame, text="Delete", command=self._delete_branch, 
+                  style='Danger.TButton').pack(side=tk.LEFT, padx=5)
+
+        # Search frame (at bottom)
+        search_frame = ttk.Frame(main_frame)
+        search_frame.pack(fill=tk.X, pady=5)
+        
+        ttk.Label(search_frame, text="Search Branch:").pack(side=tk.LEFT, padx=5)
+        self.branch_search_var = tk.StringVar()
+        search_entry = ttk.Entry(search_frame, textvariable=self.branch_search_var, width=40)
+        search_entry.pack(side=tk.LEFT, padx=5)
+        ttk.Button(search_frame, text="Search", command=self._search_branches).pack(side=tk.LEFT, padx=5)
+        ttk.Button(search_frame, text="Clear", command=self._clear_branch_search).pack(side=tk.LEFT)
+        
+        # Bind Enter key to search
+        search_entry.bind('<Return>', lambda e: self._search_branches())
+        
+        # Bind selection event
+        self.branch_tree.bind("<<TreeviewSelect>>", self._on_branch_select)
+        
+        # Load initial data
+        self._load_branches()
+
+    def _load_branches(self):
+        """Load branches into treeview"""
+        for item in self.branch_tree.get_children():
+            self.branch_tree.delete(item)
+        
+        try:
+            branches = self.db.get_all_branches()
+            for branch in branches:
+                self.branch_tree.insert("", tk.END, values=(
+                    branch["branch_id"],
+                    branch["branch_name"],
+                    branch["branch_address"],
+                    branch["branch_city"],
+                    branch["branch_state"],
+                    branch["branch_zip"]
+                ))
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load branches: {str(e)}")
+
+    def _search_branches(self):
+        """Search branches by name, city or state"""
+        search_term = self.branch_search_var.get().strip()
+        if not search_term:
+            self._load_branches()
+            return
+        
+        try:
+            for item in self.branch_tree.get_children():
+                self.branch_tree.delete(item)
+            
+            branches = self.db.search_branches(search_term)
+            for branch in branches:
+                self.branch_tree.insert("", tk.END, values=(
+                    branch["branch_id"],
+                    branch["branch_name"],
+                    branch["branch_address"],
+                    branch["branch_city"],
+                    branch["branch_state"],
+                    branch["branch_zip"]
+                ))
+        except Exception as e:
+            messagebox.showerror("Error", f"Search failed: {str(e)}")
+
+    def _clear_branch_search(self):
+        """Clear search results"""
+        self.branch_search_var.set("")
+        self._load_branches()
+
+    def _on_branch_select(self, event):
+        """Handle branch selection in treeview"""
+        selected_items = self.branch_tree.selection()
+        if not selected_items:
+            return
+        
+        selected_item = selected_items[0]
+        branch_id = self.branch_tree.item(selected_item)["values"][0]
+        
+        try:
+            branch = self.db.get_branch_by_id(branch_id)
+            if branch:
+                self.current_branch_id = branch["branch_id"]
+                # Update form fields
+                for i, field in enumerate(["branch_name", "branch_address", 
+                                          "branch_city", "branch_state", "branch_zip"]):
+                    self.branch_entries[i].delete(0, tk.END)
+                    self.branch_entries[i].insert(0, branch[field])
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load branch details: {str(e)}")
+
+    def _update_branch(self):
+        """Update selected branch"""
+        if not hasattr(self, 'current_branch_id') or not self.current_branch_id:
+            messagebox.showwarning("Warning", "Please select a branch to update")
+            return
+        
+        data = [entry.get().strip() for entry in self.branch_entries]
+        if not all(data):
+            messagebox.showerror("Error", "All fields are required")
+            return
+        
+        try:
+            success = self.db.update_branch(
+                self.current_branch_id,
+                data[0],  # name
+                data[1],  # address
+                data[2],  # city
+                data[3],  # state
+                data[4]   # zip
+            )
+            if success:
+                messagebox.showinfo("Success", "Branch updated successfully")
+                self._load_branches()
+            else:
+                messagebox.showerror("Error", "Failed to update branch")
+        except Exception as e:
+            messagebox.showerror("Error", f"Update failed: {str(e)}")
+
+    def _new_branch(self):
+        """Clear form for new branch entry"""
+        self.current_branch_id = None
+        for entry in self.branch_entries:
+            entry.delete(0, tk.END)
+
+    def _delete_branch(self):
+        """Delete selected branch"""
+        selected_items = self.branch_tree.selection()
+        if not selected_items:
+            messagebox.showwarning("Warning", "Please select a branch to delete")
+            return
+        
+        selected_item = selected_items[0]
+        branch_id = self.branch_tree.item(selected_item)["values"][0]
+        branch_name = self.branch_tree.item(selected_item)["values"][1]
+        
+        if messagebox.askyesno("Confirm", f"Delete branch '{branch_name}'?"):
+            try:
+                if self.db.delete_branch(branch_id):
+                    messagebox.showinfo("Success", "Branch deleted")
+                    self._load_branches()
+                    self._new_branch()  # Clear form
+                else:
+                    messagebox.showerror("Error", "Failed to delete branch")
+            except Exception as e:
+                messagebox.showerror("Error", f"Delete failed: {str(e)}")
+
+    # ======================
+    # EMPLOYEE TAB IMPLEMENTATION
+    # ======================
+    def _create_employee_tab(self):
+        """Create employee management tab"""
+        self.employee_tab = ttk.Frame(self.notebook)
+        self.notebook.add(self.employee_tab, text="Employee Management")
+        
+        # Main container
+        main_frame = ttk.Frame(self.employee_tab)
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        # Form frame
+        form_frame = ttk.LabelFrame(main_frame, text="Employee Details")
+        form_frame.pack(fill=tk.X, pady=5)
+        
+        # Form fields
+        fields = [
+            "Name:", 
+            "Date of Birth (YYYY-MM-DD):", 
+            "Phone:", 
+            "Email:", 
+            "Position:", 
+            "Branch ID:"
+        ]
+        self.employee_entries = []
+        for i, field in enumerate(fields):
+            ttk.Label(form_frame, text=field).grid(row=i, column=0, sticky="e", padx=5, pady=3)
+            entry = ttk.Entry(form_frame, width=40)
+            entry.grid(row=i, column=1, sticky="w", padx=5, pady=3)
+            self.employee_entries.append(entry)
+
+        # Form buttons (Save and Clear)
+        form_btn_frame = ttk.Frame(form_frame)
+        form_btn_frame.grid(row=len(fields), columnspan=2, pady=10)
+        
+        ttk.Button(form_btn_frame, text="Save", command=self._update_employee, 
+                  style='Primary.TButton').pack(side=tk.LEFT, padx=5)
+        ttk.Button(form_btn_frame, text="Clear", command=self._new_employee).pack(side=tk.LEFT, padx=5)
+
+        # Treeview frame
+        tree_frame = ttk.LabelFrame(main_frame, text="Employee List")
+        tree_frame.pack(fill=tk.BOTH, expand=True, pady=5)
+        
+        # Treeview
+        columns = ("ID", "Name", "DOB", "Phone", "Email", "Position", "Branch ID")
+        self.employee_tree = ttk.Treeview(tree_frame, columns=columns, show="headings", selectmode='browse')
+        
+        for col in columns:
+            self.employee_tree.heading(col, text=col)
+            self.employee_tree.column(col, width=120, anchor=tk.CENTER)
+        
+        # Scrollbars
+        y_scroll = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.employee_tree.yview)
+        x_scroll = ttk.Scrollbar(tree_frame, orient=tk.HORIZONTAL, command=self.employee_tree.xview)
+        self.employee_tree.configure(yscroll=y_scroll.set, xscroll=x_scroll.set)
+        
+        # Layout
+        self.employee_tree.grid(row=0, column=0, sticky="nsew")
+        y_scroll.grid(row=0, column=1, sticky="ns")
+        x_scroll.grid(row=1, column=0, sticky="ew")
+        
+        tree_frame.grid_rowconfigure(0, weight=1)
+        tree_frame.grid_columnconfigure(0, weight=1)
+        
+        # Treeview buttons (New, Update, Delete)
+        tree_btn_frame = ttk.Frame(tree_frame)
+        tree_btn_frame.grid(row=2, columnspan=2, pady=5)
+        
+        ttk.Button(tree_btn_frame, text="New", command=self._new_employee).pack(side=tk.LEFT, padx=5)
+        ttk.Button(tree_btn_frame, text="Update", command=self._update_employee, 
+                  style='Primary.TButton').pack(side=tk.LEFT, padx=5)
+        ttk.Button(tree_btn_frame, text="Delete", command=self._delete_employee, 
+                  style='Danger.TButton').pack(side=tk.LEFT, padx=5)
+
+        # Search frame (at bottom)
+        search_frame = ttk.Frame(main_frame)
+        search_frame.pack(fill=tk.X, pady=5)
+        
+        ttk.Label(search_frame, text="Search Employee:").pack(side=tk.LEFT, padx=5)
+        self.employee_search_var = tk.StringVar()
+        search_entry = ttk.Entry(search_frame, textvariable=self.employee_search_var, width=40)
+        search_entry.pack(side=tk.LEFT, padx=5)
+        ttk.Button(search_frame, text="Search", command=self._search_employees).pack(side=tk.LEFT, padx=5)
+        ttk.Button(search_frame, text="Clear", command=self._clear_employee_search).pack(side=tk.LEFT)
+        
+        # Bind Enter key to search
+        search_entry.bind('<Return>', lambda e: self._search_employees())
+        
+        # Bind selection event
+        self.employee_tree.bind("<<TreeviewSelect>>", self._on_employee_select)
+        
+        # Load initial data
+        self._load_employees()
+
+    def _load_employees(self):
+        """Load employees into treeview"""
+        for item in self.employee_tree.get_children():
+            self.employee_tree.delete(item)
+        
+        try:
+            employees = self.db.get_all_employees()
+            for emp in employees:
+                self.employee_tree.insert("", tk.END, values=(
+                    emp["emp_id"],
+                    emp["emp_name"],
+                    emp["emp_dob"],
+                    emp["emp_phone"],
+                    emp["emp_email"],
+                    emp["emp_position"],
+                    emp["branch_id"]
+                ))
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load employees: {str(e)}")
+
+    def _search_employees(self):
+        """Search employees by name, email or position"""
+        search_term = self.employee_search_var.get().strip()
+        if not search_term:
+            self._load_employees()
+            return
+        
+        try:
+            for item in self.employee_tree.get_children():
+                self.employee_tree.delete(item)
+            
+            employees = self.db.search_employees(search_term)
+            for emp in employees:
+                self.employee_tree.insert("", tk.END, values=(
+                    emp["emp_id"],
+                    emp["emp_name"],
+                    emp["emp_dob"],
+                    emp["emp_phone"],
+                    emp["emp_email"],
+                    emp["emp_position"],
+                    emp["branch_id"]
+                ))
+        except Exception as e:
+            messagebox.showerror("Error", f"Search failed: {str(e)}")
+
+    def _clear_employee_search(self):
+        """Clear employee search results"""
+        self.employee_search_var.set("")
+        self._load_employees()
+
+    def _on_employee_select(self, event):
+        """Handle employee selection in treeview"""
+        selected_items = self.employee_tree.selection()
+        if not selected_items:
+            return
+        
+        selected_item = selected_items[0]
+        emp_id = self.employee_tree.item(selected_item)["values"][0]
+        
+        try:
+            employee = self.db.get_employee_by_id(emp_id)
+            if employee:
+                self.current_employee_id = employee["emp_id"]
+                # Update form fields
+                for i, field in enumerate(["emp_name", "emp_dob", "emp_phone", 
+                                          "emp_email", "emp_position", "branch_id"]):
+                    self.employee_entries[i].delete(0, tk.END)
+                    self.employee_entries[i].insert(0, employee[field])
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load employee details: {str(e)}")
+
+    def _update_employee(self):
+        """Update selected employee"""
+        if not hasattr(self, 'current_employee_id') or not self.current_employee_id:
+            messagebox.showwarning("Warning", "Please select an employee to update")
+            return
+        
+        data = [entry.get().strip() for entry in self.employee_entries]
+        if not all(data):
+            messagebox.showerror("Error", "All fields are required")
+            return
+        
+        # Validate date format
+        try:
+            datetime.strptime(data[1], "%Y-%m-%d")
+        except ValueError:
+            messagebox.showerror("Error", "Invalid date format. Use YYYY-MM-DD")
+            return
+        
+        try:
+            success = self.db.update_employee(
+                self.current_employee_id,
+                data[0],  # name
+                data[1],  # dob
+                data[2],  # phone
+                data[3],  # email
+                data[4],  # position
+                data[5]   # branch_id
+            )
+            if success:
+                messagebox.showinfo("Success", "Employee updated successfully")
+                self._load_employees()
+            else:
+                messagebox.showerror("Error", "Failed to update employee")
+        except Exception as e:
+            messagebox.showerror("Error", f"Update failed: {str(e)}")
+
+    def _new_employee(self):
+        """Clear form for new employee entry"""
+        self.current_employee_id = None
+        for entry in self.employee_entries:
+            entry.delete(0, tk.END)
+
+    def _delete_employee(self):
+        """Delete selected employee"""
+        selected_items = self.employee_tree.selection()
+        if not selected_items:
+            messagebox.showwarning("Warning", "Please select an employee to delete")
+            return
+        
+        selected_item = selected_items[0]
+        emp_id = self.employee_tree.item(selected_item)["values"][0]
+        emp_name = self.employee_tree.item(selected_item)["values"][1]
+        
+        if messagebox.askyesno("Confirm", f"Delete employee '{emp_name}'?"):
+            try:
+                if self.db.delete_employee(emp_id):
+                    messagebox.showinfo("Success", "Employee deleted")
+                    self._load_employees()
+                    self._new_employee()  # Clear form
+                else:
+                    messagebox.showerror("Error", "Failed to delete employee")
+            except Exception as e:
+                messagebox.showerror("Error", f"Delete failed: {str(e)}")
+
+    # ======================
+    # CUSTOMER TAB IMPLEMENTATION
+    # ======================
+    def _create_customer_tab(self):
+        """Create customer management tab"""
+        self.customer_tab = ttk.Frame(self.notebook)
+        self.notebook.add(self.customer_tab, text="Customer Management")
+        
+        # Main container
+        main_frame = ttk.Frame(self.customer_tab)
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        # Form frame
+        form_frame = ttk.LabelFrame(main_frame, text="Customer Details")
+        form_frame.pack(fill=tk.X, pady=5)
+        
+        # Form fields
+        fields = [
+            "Name:", 
+            "Date of Birth (YYYY-MM-DD):", 
+            "Phone:", 
+            "Email:", 
+            "Address:", 
+            "Branch ID:"
+        ]
+        self.customer_entries = []
+        for i, field in enumerate(fields):
+            ttk.Label(form_frame, text=field).grid(row=i, column=0, sticky="e", padx=5, pady=3)
+            entry = ttk.Entry(form_frame, width=40)
+            entry.grid(row=i, column=1, sticky="w", padx=5, pady=3)
+            self.customer_entries.append(entry)
+
+        # Form buttons (Save and Clear)
+        form_btn_frame = ttk.Frame(form_frame)
+        form_btn_frame.grid(row=len(fields), columnspan=2, pady=10)
+        
+        ttk.Button(form_btn_frame, text="Save", command=self._update_customer, 
+                  style='Primary.TButton').pack(side=tk.LEFT, padx=5)
+        ttk.Button(form_btn_frame, text="Clear", command=self._new_customer).pack(side=tk.LEFT, padx=5)
+
+        # Treeview frame
+        tree_frame = ttk.LabelFrame(main_frame, text="Customer List")
+        tree_frame.pack(fill=tk.BOTH, expand=True, pady=5)
+        
+        # Treeview
+        columns = ("ID", "Name", "DOB", "Phone", "Email", "Address", "Branch ID")
+        self.customer_tree = ttk.Treeview(tree_frame, columns=columns, show="headings", selectmode='browse')
+        
+        for col in columns:
+            self.customer_tree.heading(col, text=col)
+            self.customer_tree.column(col, width=120, anchor=tk.CENTER)
+        
+        # Scrollbars
+        y_scroll = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.customer_tree.yview)
+        x_scroll = ttk.Scrollbar(tree_frame, orient=tk.HORIZONTAL, command=self.customer_tree.xview)
+        self.customer_tree.configure(yscroll=y_scroll.set, xscroll=x_scroll.set)
+        
+        # Layout
+        self.customer_tree.grid(row=0, column=0, sticky="nsew")
+        y_scroll.grid(row=0, column=1, sticky="ns")
+        x_scroll.grid(row=1, column=0, sticky="ew")
+        
+        tree_frame.grid_rowconfigure(0, weight=1)
+        tree_frame.grid_columnconfigure(0, weight=1)
+        
+        # Treeview buttons (New, Update, Delete)
+        tree_btn_frame = ttk.Frame(tree_frame)
+        tree_btn_frame.grid(row=2, columnspan=2, pady=5)
+        
+        ttk.Button(tree_btn_frame, text="New", command=self._new_customer).pack(side=tk.LEFT, padx=5)
+        ttk.Button(tree_btn_frame, text="Update", command=self._update_customer, 
+                  style='Primary.TButton').pack(side=tk.LEFT, padx=5)
+        ttk.Button(tree_btn_frame, text="Delete", command=self._delete_customer, 
+                  style='Danger.TButton').pack(side=tk.LEFT, padx=5)
+
+        # Search frame (at bottom)
+        search_frame = ttk.Frame(main_frame)
+        search_frame.pack(fill=tk.X, pady=5)
+        
+        ttk.Label(search_frame, text="Search Customer:").pack(side=tk.LEFT, padx=5)
+        self.customer_search_var = tk.StringVar()
+        search_entry = ttk.Entry(search_frame, textvariable=self.customer_search_var, width=40)
+        search_entry.pack(side=tk.LEFT, padx=5)
+        ttk.Button(search_frame, text="Search", command=self._search_customers).pack(side=tk.LEFT, padx=5)
+        ttk.Button(search_frame, text="Clear", command=self._clear_customer_search).pack(side=tk.LEFT)
+        
+        # Bind Enter key to search
+        search_entry.bind('<Return>', lambda e: self._search_customers())
+        
+        # Bind selection event
+        self.customer_tree.bind("<<TreeviewSelect>>", self._on_customer_select)
+        
+        # Load initial data
+        self._load_customers()
+
+    def _load_customers(self):
+        """Load customers into treeview"""
+        for item in self.customer_tree.get_children():
+            self.customer_tree.delete(item)
+        
+        try:
+            customers = self.db.get_all_customers()
+            for cust in customers:
+                self.customer_tree.insert("", tk.END, values=(
+                    cust["cust_id"],
+                    cust["name"],
+                    cust["dob"],
+                    cust["phone"],
+                    cust["email"],
+                    cust["address"],
+                    cust["branch_id"]
+                ))
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load customers: {str(e)}")
+
+    def _search_customers(self):
+        """Search customers by name, email or phone"""
+        search_term = self.customer_search_var.get().strip()
+        if not search_term:
+            self._load_customers()
+            return
+        
+        try:
+            for item in self.customer_tree.get_children():
+                self.customer_tree.delete(item)
+            
+            customers = self.db.search_customers(search_term)
+            for cust in customers:
+                self.customer_tree.insert("", tk.END, values=(
+                    cust["cust_id"],
+                    cust["name"],
+                    cust["dob"],
+                    cust["phone"],
+                    cust["email"],
+                    cust["address"],
+                    cust["branch_id"]
+                ))
+        except Exception as e:
+            messagebox.showerror("Error", f"Search failed: {str(e)}")
+
+    def _clear_customer_search(self):
+        """Clear customer search results"""
+        self.customer_search_var.set("")
+        self._load_customers()
+
+    def _on_customer_select(self, event):
+        """Handle customer selection in treeview"""
+        selected_items = self.customer_tree.selection()
+        if not selected_items:
+            return
+        
+        selected_item = selected_items[0]
+        cust_id = self.customer_tree.item(selected_item)["values"][0]
+        
+        try:
+            customer = self.db.get_customer_by_id(cust_id)
+            if customer:
+                self.current_customer_id = customer["cust_id"]
+                # Update form fields
+                for i, field in enumerate(["name", "dob", "phone", 
+                                          "email", "address", "branch_id"]):
+                    self.customer_entries[i].delete(0, tk.END)
+                    self.customer_entries[i].insert(0, customer[field])
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load customer details: {str(e)}")
+
+    def _update_customer(self):
+        """Update selected customer"""
+        if not hasattr(self, 'current_customer_id') or not self.current_customer_id:
+            messagebox.showwarning("Warning", "Please select a customer to update")
+            return
+        
+        data = [entry.get().strip() for entry in self.customer_entries]
+        if not all(data):
+            messagebox.showerror("Error", "All fields are required")
+            return
+        
+        # Validate date format
+        try:
+            datetime.strptime(data[1], "%Y-%m-%d")
+        except ValueError:
+            messagebox.showerror("Error", "Invalid date format. Use YYYY-MM-DD")
+            return
+        
+        try:
+            success = self.db.update_customer(
+                self.current_customer_id,
+                data[0],  # name
+                data[1],  # dob
+                data[2],  # phone
+                data[3],  # email
+                data[4],  # address
+                data[5]   # branch_id
+            )
+            if success:
+                messagebox.showinfo("Success", "Customer updated successfully")
+                self._load_customers()
+            else:
+                messagebox.showerror("Error", "Failed to update customer")
+        except Exception as e:
+            messagebox.showerror("Error", f"Update failed: {str(e)}")
+
+    def _new_customer(self):
+        """Clear form for new customer entry"""
+        self.current_customer_id = None
+        for entry in self.customer_entries:
+            entry.delete(0, tk.END)
+
+    def _delete_customer(self):
+        """Delete selected customer"""
+        selected_items = self.customer_tree.selection()
+        if not selected_items:
+            messagebox.showwarning("Warning", "Please select a customer to delete")
+            return
+        
+        selected_item = selected_items[0]
+        cust_id = self.customer_tree.item(selected_item)["values"][0]
+        cust_name = self.customer_tree.item(selected_item)["values"][1]
+        
+        if messagebox.askyesno("Confirm", f"Delete customer '{cust_name}'?"):
+            try:
+                if self.db.delete_customer(cust_id):
+                    messagebox.showinfo("Success", "Customer deleted")
+                    self._load_customers()
+                    self._new_customer()  # Clear form
+                else:
+                    messagebox.showerror("Error", "Failed to delete customer")
+            except Exception as e:
+                messagebox.showerror("Error", f"Delete failed: {str(e)}")
+
+    import tkinter as tk
+from tkinter import ttk, messagebox
+from configuration import DatabaseManager, PRIMARY_KEYS, LIST_COLUMNS
+from change_poller import ChangePoller, ChangeSet
+from branch_stats import StatsReconciler
+from dedup import find_duplicates, load_records
+from fuzzy import FuzzyNameIndex
+from tree_filler import ProgressiveTreeFiller
+from query_cache import QueryCache
+from audit import AuditLog
+from memdiag import MemoryDiagnostics, result_bytes
+from snapshot import SnapshotStore
+from filters import FilterError, is_filter_query
+from branch_directory import BranchDirectory
+from cancellation import CancelToken
+from events import EventBus
+from datetime import datetime
+import os
+import queue
+import threading
+import time
+
+#List projections without branch_name; names come from the branch directory instead of a join
+VIEW_COLUMNS = {view: tuple(c for c in columns if c != "branch_name") for view, columns in LIST_COLUMNS.items()}
+
+class BankManagementApp:
+    def __init__(self, root, db=None, db_factory=None):
+        self.root = root
+        self.root.title("Bank Management System")
+        self.root.geometry("1000x700")
+        self.root.minsize(800, 600)
+        self.root.configure(bg="#A3D1C6")
+
+        # Initialize database connection; repeated lists and searches are served from a cache
+        # Background jobs open their own connections through db_factory
+        self.db_factory = db_factory or (lambda: DatabaseManager(create_tables=False))
+        self.memory = MemoryDiagnostics()       # No-op unless DB_MEMORY_DIAGNOSTICS is set
+        self.load_stats = os.getenv("DB_LOAD_STATS", "") not in ("", "0")
+        self.status_text = ""                   # Shown in the status bar while the database is healthy
+        try:
+            # An unreachable server starts the app in degraded mode instead of failing
+            self.db = db if db is not None else DatabaseManager(cache=self._make_query_cache(),
+                                                                allow_offline=True)
+        except Exception as e:
+            messagebox.showerror("Database Error", f"Failed to connect to database: {str(e)}")
+            root.destroy()
+            return
+
+        # Lists open at the last exit are shown again straight away, then caught up from change_log
+        self.snapshots = SnapshotStore.from_env(self._snapshot_source())
+        self._warm_views = set()                # Lists already loaded once this session
+        self._snapshot_rows = {}                # view -> SnapshotRows still mapped
+        self._replays = {}                      # view -> (snapshot seq, replay thread)
+
+        # All branches in memory for branch names, pickers and validation
+        self.branch_directory = BranchDirectory()
+
+        # Every committed write is audited with before/after values by a background writer
+        self.audit_log = AuditLog(db_factory=self.db_factory).start()
+        self.db.audit = self.audit_log
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+
+        # This session's writes reach every open list and in-memory cache as deltas, not reloads
+        self.db.events = EventBus()
+        self.db.events.subscribe(self._on_data_change, "branches", "employees", "customers")
+
+        # Current user information
+        self.current_user = None
+        self.user_type = None
+
+        # Branch the teller works in; employee and customer lists are scoped to it when set
+        branch = os.getenv("DB_BRANCH_ID")
+        self.scope_branch_id = int(branch) if branch else None
+
+        # Background poller that keeps open lists in step with other users' edits
+        self.change_poller = None
+        self.poll_interval = float(os.getenv("DB_POLL_INTERVAL", "2"))
+
+        # Admin sessions periodically rebuild the per-branch aggregates
+        self.stats_reconciler = None
+        self.stats_window_days = 30
+
+        # Typo-tolerant customer name index, built in the background
+        self.customer_name_index = FuzzyNameIndex()
+        self._build_customer_name_index()
+
+        # Status bar survives screen changes and reports when the database is unreachable
+        self.status_bar = tk.Label(self.root, text="", anchor="w", bg="#A3D1C6", padx=8)
+        self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        self._watch_database_health()
+
+        # List loads and searches run on their own connection with a Cancel control above the status bar
+        self._queries = {}                      # view -> (CancelToken, label) of the query still running
+        self.query_bar = tk.Frame(self.root, bg="#A3D1C6")
+        self.query_label = tk.Label(self.query_bar, text="", anchor="w", bg="#A3D1C6", padx=8)
+        self.query_label.pack(side=tk.LEFT)
+        ttk.Button(self.query_bar, text="Cancel", command=self._cancel_query).pack(side=tk.LEFT, padx=5)
+
+        # Setup the login interface
+        self._setup_login_interface()
+
+    def _make_query_cache(self):
+        """Query cache sized from DB_CACHE_TTL and DB_CACHE_MB; a TTL of 0 turns it off"""
+        ttl = float(os.getenv("DB_CACHE_TTL", "60"))
+        if ttl <= 0:
+            return None
+        return QueryCache(ttl=ttl, max_bytes=int(float(os.getenv("DB_CACHE_MB", "32")) * 1024 * 1024))
+
+    def _snapshot_source(self):
+        """Identifies the database, so a snapshot is never shown against another one"""
+        path = getattr(self.db, 'path', None)
+        if path:
+            return os.path.abspath(path)
+        return f"{os.getenv('DB_Host', 'localhost')}:{os.getenv('DB_Port', '3306')}/{os.getenv('DB_name', 'project')}"
+
+    def _watch_database_health(self):
+        """Show degraded mode while the circuit breaker is open, checked once a second"""
+        breaker = getattr(self.db, 'breaker', None)
+        if breaker is not None and breaker.degraded:
+            self.status_bar.config(text="Database unreachable \u2013 retrying\u2026", bg="#C0392B", fg="white")
+        else:
+            self.status_bar.config(text=self.status_text, bg="#A3D1C6", fg="black")
+        self.root.after(1000, self._watch_database_health)
+
+    def _report_load(self, view, rows, started):
+        """With DB_LOAD_STATS set, show how many rows and bytes a list load read and how long it took"""
+        if not self.load_stats:
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.status_text = (f"{view}: {len(rows)} rows, {result_bytes(rows) / 1024:.0f} KiB "
+                            f"in {elapsed_ms:.0f} ms")
+        print(f"Loaded {self.status_text}")
+        self.status_bar.config(text=self.status_text)
+
+    def _setup_login_interface(self):
+        """Create the login interface with admin, employee, and customer options"""
+        self._stop_change_poller()
+        self._stop_stats_reconciler()
+        self.clear_window()
+        self.memory.checkpoint("screen:login")
+        
+        # Main frame
+        login_frame = ttk.Frame(self.root, padding="30 15 30 15")
+        login_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Title
+        ttk.Label(login_frame, text="Bank Management System", 
+                 font=("Helvetica", 20, "bold")).pack(pady=20)
+        
+        # Login options frame
+        options_frame = ttk.Frame(login_frame)
+        options_frame.pack(pady=30)
+        
+        # Buttons for each user type
+        ttk.Button(options_frame, text="Admin Login", 
+                  command=lambda: self._show_admin_interface(), 
+                  width=20).pack(pady=10)
+        
+        ttk.Button(options_frame, text="Employee Login", 
+                  command=lambda: self._show_employee_interface(), 
+                  width=20).pack(pady=10)
+        
+        ttk.Button(options_frame, text="Customer Login", 
+                  command=lambda: self._show_customer_interface(), 
+                  width=20).pack(pady=10)
+
+    def _show_admin_interface(self):
+        """Show the admin interface with branch management"""
+        self.user_type = "admin"
+        self.db.audit_actor = self.user_type
+        self.clear_window()
+        self.memory.checkpoint("screen:admin")
+        self._start_change_poller()
+        
+        # Create notebook for tabs
+        self.notebook = ttk.Notebook(self.root)
+        self.notebook.pack(fill=tk.BOTH, expand=True)
+        
+        # Branch tab
+        self.branch_tab = ttk.Frame(self.notebook)
+        self.notebook.add(self.branch_tab, text="Branch Management")
+        
+        # Create branch management interface
+        self._create_branch_interface()
+
+        # Dashboard tab with per-branch counts
+        self.dashboard_tab = ttk.Frame(self.notebook)
+        self.notebook.add(self.dashboard_tab, text="Branch Dashboard")
+        self._create_dashboard_interface()
+
+        # Branch -> employees/customers tree, filled as nodes are opened
+        self.browse_tab = ttk.Frame(self.notebook)
+        self.notebook.add(self.browse_tab, text="Browse by Branch")
+        self._create_browse_interface()
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_admin_tab_changed)
+        self._start_stats_reconciler()
+        
+        # Back button
+        back_button = ttk.Button(self.root, text="Logout", 
+                                command=self._setup_login_interface)
+        back_button.pack(pady=10)
+
+    def _show_employee_interface(self):
+        """Show the employee interface with employee management"""
+        self.user_type = "employee"
+        self.db.audit_actor = self.user_type
+        self.clear_window()
+        self.memory.checkpoint("screen:employee")
+        self._start_change_poller()
+        
+        # Create notebook for tabs
+        self.notebook = ttk.Notebook(self.root)
+        self.notebook.pack(fill=tk.BOTH, expand=True)
+        
+        # Employee tab
+        self.employee_tab = ttk.Frame(self.notebook)
+        self.notebook.add(self.employee_tab, text="Employee Management")
+        
+        # Create employee management interface
+        self._create_employee_interface()
+        
+        # Back button
+        back_button = ttk.Button(self.root, text="Logout", 
+                                command=self._setup_login_interface)
+        back_button.pack(pady=10)
+
+    def _show_customer_interface(self):
+        """Show the customer interface with customer management"""
+        self.user_type = "customer"
+        self.db.audit_actor = self.user_type
+        self.clear_window()
+        self.memory.checkpoint("screen:customer")
+        self._start_change_poller()
+        
+        # Create notebook for tabs
+        self.notebook = ttk.Notebook(self.root)
+        self.notebook.pack(fill=tk.BOTH, expand=True)
+        
+        # Customer tab
+        self.customer_tab = ttk.Frame(self.notebook)
+        self.notebook.add(self.customer_tab, text="Customer Management")
+        
+        # Create customer management interface
+        self._create_customer_interface()
+        
+        # Back button
+        back_button = ttk.Button(self.root, text="Logout", 
+                                command=self._setup_login_interface)
+        back_button.pack(pady=10)
+
+    def _create_branch_interface(self):
+        """Create branch management interface in the branch tab"""
+        # Form for branch details
+        details_frame = ttk.LabelFrame(self.branch_tab, text="Branch Details", padding="10 5 10 10")
+        details_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        # Labels and entries for branch attributes
+        labels = ["Branch Name:", "Address:", "City:", "State:", "PIN Code:"]
+        self.branch_entries = []
+        
+        for i, label_text in enumerate(labels):
+            ttk.Label(details_frame, text=label_text).grid(row=i, column=0, sticky="e", padx=5, pady=3)
+            entry = ttk.Entry(details_frame, width=40)
+            entry.grid(row=i, column=1, sticky="w", padx=5, pady=3)
+            self.branch_entries.append(entry)
+        
+        # Buttons frame
+        btn_frame = ttk.Frame(details_frame)
+        btn_frame.grid(row=len(labels), columnspan=2, pady=10)
+        
+        ttk.Button(btn_frame, text="Save", command=self._save_branch).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="New", command=self._new_branch).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Delete", command=self._delete_branch).pack(side=tk.LEFT, padx=5)
+        
+        # Branch list
+        list_frame = ttk.LabelFrame(self.branch_tab, text="Branch List", padding="10 5 10 10")
+        list_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        # Treeview for displaying branches
+        columns = ("ID", "Name", "Address", "City", "State", "PIN Code")
+        self.branch_tree = ttk.Treeview(list_frame, columns=columns, show="headings")
+        self.branch_filler = ProgressiveTreeFiller(self.root, self.branch_tree)
+        
+        for col in columns:
+            self.branch_tree.heading(col, text=col)
+            self.branch_tree.column(col, width=120, anchor=tk.CENTER)
+        
+        # Scrollbars
+        y_scroll = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.branch_tree.yview)
+        x_scroll = ttk.Scrollbar(list_frame, orient=tk.HORIZONTAL, command=self.branch_tree.xview)
+        self.branch_tree.configure(yscroll=y_scroll.set, xscroll=x_scroll.set)
+        
+        # Grid layout
+        self.branch_tree.grid(row=0, column=0, sticky="nsew")
+        y_scroll.grid(row=0, column=1, sticky="ns")
+        x_scroll.grid(row=1, column=0, sticky="ew")
+        
+        list_frame.grid_rowconfigure(0, weight=1)
+        list_frame.grid_columnconfigure(0, weight=1)
+        
+        # Bind selection event
+        self.branch_tree.bind("<<TreeviewSelect>>", self._on_branch_select)
+        
+        # Load initial data
+        self._load_branches()
+
+    def _create_employee_interface(self):
+        """Create employee management interface in the employee tab"""
+        self._create_branch_selector(self.employee_tab)
+
+        # Form for employee details
+        details_frame = ttk.LabelFrame(self.employee_tab, text="Employee Details", padding="10 5 10 10")
+        details_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        # Labels and entries for employee attributes
+        labels = [
+            "Name:", "Date of Birth (YYYY-MM-DD):", 
+            "Phone:", "Email:", 
+            "Position:", "Branch:"
+        ]
+        self.employee_entries = []
+        
+        for i, label_text in enumerate(labels):
+            ttk.Label(details_frame, text=label_text).grid(row=i, column=0, sticky="e", padx=5, pady=3)
+            if label_text == "Branch:":
+                entry = self._make_branch_picker(details_frame, width=38)
+            else:
+                entry = ttk.Entry(details_frame, width=40)
+            entry.grid(row=i, column=1, sticky="w", padx=5, pady=3)
+            self.employee_entries.append(entry)
+        
+        # Buttons frame
+        btn_frame = ttk.Frame(details_frame)
+        btn_frame.grid(row=len(labels), columnspan=2, pady=10)
+        
+        ttk.Button(btn_frame, text="Save", command=self._save_employee).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="New", command=self._new_employee).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Delete", command=self._delete_employee).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Move to Branch",
+                   command=lambda: self._show_bulk_edit("employees", "branch_id")).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Bulk Edit",
+                   command=lambda: self._show_bulk_edit("employees")).pack(side=tk.LEFT, padx=5)
+        
+        # Employee list
+        list_frame = ttk.LabelFrame(self.employee_tab, text="Employee List", padding="10 5 10 10")
+        list_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        # Treeview for displaying employees
+        columns = ("ID", "Name", "DOB", "Phone", "Email", "Position", "Branch ID", "Branch Name")
+        self.employee_tree = ttk.Treeview(list_frame, columns=columns, show="headings", selectmode="extended")
+        self.employee_filler = ProgressiveTreeFiller(self.root, self.employee_tree)
+        
+        for col in columns:
+            self.employee_tree.heading(col, text=col)
+            self.employee_tree.column(col, width=120, anchor=tk.CENTER)
+        
+        # Scrollbars
+        y_scroll = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.employee_tree.yview)
+        x_scroll = ttk.Scrollbar(list_frame, orient=tk.HORIZONTAL, command=self.employee_tree.xview)
+        self.employee_tree.configure(yscroll=y_scroll.set, xscroll=x_scroll.set)
+        
+        # Grid layout
+        self.employee_tree.grid(row=0, column=0, sticky="nsew")
+        y_scroll.grid(row=0, column=1, sticky="ns")
+        x_scroll.grid(row=1, column=0, sticky="ew")
+        
+        list_frame.grid_rowconfigure(0, weight=1)
+        list_frame.grid_columnconfigure(0, weight=1)
+        
+        # Bind selection event
+        self.employee_tree.bind("<<TreeviewSelect>>", self._on_employee_select)
+
+        # Search frame (at bottom)
+        search_frame = ttk.Frame(self.employee_tab)
+        search_frame.pack(fill=tk.X, padx=10, pady=5)
+
+        ttk.Label(search_frame, text="Search Employee:").pack(side=tk.LEFT, padx=5)
+        self.employee_search_var = tk.StringVar()
+        search_entry = ttk.Entry(search_frame, textvariable=self.employee_search_var, width=40)
+        search_entry.pack(side=tk.LEFT, padx=5)
+        ttk.Button(search_frame, text="Search", command=self._search_employees).pack(side=tk.LEFT, padx=5)
+        ttk.Button(search_frame, text="Clear", command=self._clear_employee_search).pack(side=tk.LEFT)
+        self.employee_search_status = ttk.Label(search_frame, text="")
+        self.employee_search_status.pack(side=tk.LEFT, padx=10)
+
+        # Bind Enter key to search
+        search_entry.bind('<Return>', lambda e: self._search_employees())
+        
+        # Load initial data
+        self._load_employees()
+
+    def _create_customer_interface(self):
+        """Create customer management interface in the customer tab"""
+        self._create_branch_selector(self.customer_tab)
+
+        # Form for customer details
+        details_frame = ttk.LabelFrame(self.customer_tab, text="Customer Details", padding="10 5 10 10")
+        details_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        # Labels and entries for customer attributes
+        labels = [
+            "Name:", "Date of Birth (YYYY-MM-DD):", 
+            "Phone:", "Email:", 
+            "Address:", "Branch:"
+        ]
+        self.customer_entries = []
+        
+        for i, label_text in enumerate(labels):
+            ttk.Label(details_frame, text=label_text).grid(row=i, column=0, sticky="e", padx=5, pady=3)
+            if label_text == "Branch:":
+                entry = self._make_branch_picker(details_frame, width=38)
+            else:
+                entry = ttk.Entry(details_frame, width=40)
+            entry.grid(row=i, column=1, sticky="w", padx=5, pady=3)
+            self.customer_entries.append(entry)
+        
+        # Buttons frame
+        btn_frame = ttk.Frame(details_frame)
+        btn_frame.grid(row=len(labels), columnspan=2, pady=10)
+        
+        ttk.Button(btn_frame, text="Save", command=self._save_customer).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="New", command=self._new_customer).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Delete", command=self._delete_customer).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Move to Branch",
+                   command=lambda: self._show_bulk_edit("customers", "branch_id")).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Bulk Edit",
+                   command=lambda: self._show_bulk_edit("customers")).pack(side=tk.LEFT, padx=5)
+        
+        # Customer list
+        list_frame = ttk.LabelFrame(self.customer_tab, text="Customer List", padding="10 5 10 10")
+        list_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        # Treeview for displaying customers
+        columns = ("ID", "Name", "DOB", "Phone", "Email", "Branch ID", "Branch Name")
+        self.customer_tree = ttk.Treeview(list_frame, columns=columns, show="headings", selectmode="extended")
+        self.customer_filler = ProgressiveTreeFiller(self.root, self.customer_tree)
+        self.customer_tree.tag_configure("archived", foreground="gray")
+        
+        for col in columns:
+            self.customer_tree.heading(col, text=col)
+            self.customer_tree.column(col, width=120, anchor=tk.CENTER)
+        
+        # Scrollbars
+        y_scroll = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.customer_tree.yview)
+        x_scroll = ttk.Scrollbar(list_frame, orient=tk.HORIZONTAL, command=self.customer_tree.xview)
+        self.customer_tree.configure(yscroll=y_scroll.set, xscroll=x_scroll.set)
+        
+        # Grid layout
+        self.customer_tree.grid(row=0, column=0, sticky="nsew")
+        y_scroll.grid(row=0, column=1, sticky="ns")
+        x_scroll.grid(row=1, column=0, sticky="ew")
+        
+        list_frame.grid_rowconfigure(0, weight=1)
+        list_frame.grid_columnconfigure(0, weight=1)
+        
+        # Bind selection event
+        self.customer_tree.bind("<<TreeviewSelect>>", self._on_customer_select)
+
+        # Search frame (at bottom)
+        search_frame = ttk.Frame(self.customer_tab)
+        search_frame.pack(fill=tk.X, padx=10, pady=5)
+
+        ttk.Label(search_frame, text="Search Customer:").pack(side=tk.LEFT, padx=5)
+        self.customer_search_var = tk.StringVar()
+        search_entry = ttk.Entry(search_frame, textvariable=self.customer_search_var, width=40)
+        search_entry.pack(side=tk.LEFT, padx=5)
+        self.customer_fuzzy_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(search_frame, text="Fuzzy name match",
+                        variable=self.customer_fuzzy_var).pack(side=tk.LEFT, padx=5)
+        self.customer_archive_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(search_frame, text="Include archive",
+                        variable=self.customer_archive_var).pack(side=tk.LEFT, padx=5)
+        ttk.Button(search_frame, text="Search", command=self._search_customers).pack(side=tk.LEFT, padx=5)
+        ttk.Button(search_frame, text="Clear", command=self._clear_customer_search).pack(side=tk.LEFT)
+        self.customer_search_status = ttk.Label(search_frame, text="")
+        self.customer_search_status.pack(side=tk.LEFT, padx=10)
+
+        # Bind Enter key to search
+        search_entry.bind('<Return>', lambda e: self._search_customers())
+        
+        # Load initial data
+        self._load_customers()
+
+    def _create_branch_selector(self, parent):
+        """Current branch picker shown above the employee and customer lists"""
+        selector_frame = ttk.Frame(parent)
+        selector_frame.pack(fill=tk.X, padx=10, pady=(5, 0))
+        ttk.Label(selector_frame, text="Current Branch:").pack(side=tk.LEFT, padx=5)
+
+        choices = ["All branches"]
+        current = choices[0]
+        try:
+            choices += self._branches().labels()
+            if self.scope_branch_id in self.branch_directory:
+                current = self.branch_directory.label(self.scope_branch_id)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load branches: {str(e)}")
+
+        self.branch_choice_var = tk.StringVar(value=current)
+        selector = ttk.Combobox(selector_frame, textvariable=self.branch_choice_var,
+                                values=choices, state="readonly", width=40)
+        selector.pack(side=tk.LEFT, padx=5)
+        selector.bind("<<ComboboxSelected>>", self._on_branch_chosen)
+
+    def _on_branch_chosen(self, event):
+        """Switch the current branch and reload the scoped lists"""
+        choice = self.branch_choice_var.get()
+        self.scope_branch_id = None if choice == "All branches" else int(choice.split(" - ", 1)[0])
+        if getattr(self, "employee_tree", None) is not None and self.employee_tree.winfo_exists():
+            if self.employee_search_var.get().strip():
+                self._search_employees()
+            else:
+                self._load_employees()
+        if getattr(self, "customer_tree", None) is not None and self.customer_tree.winfo_exists():
+            if self.customer_search_var.get().strip():
+                self._search_customers()
+            else:
+                self._load_customers()
+
+    def _in_current_branch(self, rows):
+        """Rows that belong to the current branch, or all of them when no branch is chosen"""
+        if self.scope_branch_id is None:
+            return rows
+        return [row for row in rows if str(row["branch_id"]) == str(self.scope_branch_id)]
+
+    def _branches(self):
+        """The branch directory, read from the database the first time it is needed"""
+        if not self.branch_directory.loaded:
+            self.branch_directory.load(self.db.get_all_branches())
+        return self.branch_directory
+
+    def _with_branch_names(self, rows):
+        """List rows, read without the branches join, with branch_name filled in"""
+        return self._branches().fill_names(rows)
+
+    def _make_branch_picker(self, parent, **options):
+        """Branch field that completes ids and names as you type and flags unknown branches"""
+        ttk.Style(self.root).configure("Invalid.TCombobox", foreground="red")
+        picker = ttk.Combobox(parent, **options)
+        picker.bind("<KeyRelease>", lambda event: self._complete_branch(picker, event))
+        picker.bind("<FocusOut>", lambda event: self._check_branch(picker))
+        picker.bind("<<ComboboxSelected>>", lambda event: self._check_branch(picker))
+        return picker
+
+    def _complete_branch(self, picker, event):
+        """Offer the branches matching what has been typed so far"""
+        if event.keysym in ("Up", "Down", "Return", "Escape", "Tab"):
+            return
+        try:
+            picker["values"] = self._branches().complete(picker.get())
+        except Exception as e:
+            print(f"Branch completion unavailable: {e}")
+
+    def _check_branch(self, picker):
+        """Mark the field red when it names no known branch"""
+        text = picker.get().strip()
+        try:
+            unknown = bool(text) and self._branches().resolve(text) is None
+        except Exception:
+            unknown = False                     # Cannot tell while the database is unreachable
+        picker.configure(style="Invalid.TCombobox" if unknown else "TCombobox")
+
+    def _resolve_branch(self, text, parent=None):
+        """Branch id for a picker value, or None after telling the user it does not exist"""
+        branch_id = self._branches().resolve(text)
+        if branch_id is None:
+            messagebox.showerror("Error", f"Branch '{text}' does not exist", parent=parent)
+        return branch_id
+
+    def _create_dashboard_interface(self):
+        """Create the per-branch summary in the dashboard tab"""
+        list_frame = ttk.LabelFrame(self.dashboard_tab, text="Branch Summary", padding="10 5 10 10")
+        list_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+        # Treeview for displaying branch aggregates
+        columns = ("ID", "Branch", "Employees", "Customers",
+                   f"New ({self.stats_window_days}d)", "New / Day")
+        self.dashboard_tree = ttk.Treeview(list_frame, columns=columns, show="headings")
+
+        for col in columns:
+            self.dashboard_tree.heading(col, text=col)
+            self.dashboard_tree.column(col, width=120, anchor=tk.CENTER)
+
+        y_scroll = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.dashboard_tree.yview)
+        self.dashboard_tree.configure(yscroll=y_scroll.set)
+
+        self.dashboard_tree.grid(row=0, column=0, sticky="nsew")
+        y_scroll.grid(row=0, column=1, sticky="ns")
+
+        list_frame.grid_rowconfigure(0, weight=1)
+        list_frame.grid_columnconfigure(0, weight=1)
+
+        dashboard_btn_frame = ttk.Frame(list_frame)
+        dashboard_btn_frame.grid(row=1, columnspan=2, pady=5)
+        ttk.Button(dashboard_btn_frame, text="Refresh", command=self._load_dashboard).pack(side=tk.LEFT, padx=5)
+        ttk.Button(dashboard_btn_frame, text="Find Duplicate Customers",
+                   command=self._show_duplicate_window).pack(side=tk.LEFT, padx=5)
+        self.cache_status = ttk.Label(dashboard_btn_frame, text="")
+        self.cache_status.pack(side=tk.LEFT, padx=10)
+
+        self._load_dashboard()
+
+    # ======================
+    # DASHBOARD METHODS
+    # ======================
+
+    def _load_dashboard(self):
+        """Load per-branch aggregates; cost depends on branch count, not customer count"""
+        for item in self.dashboard_tree.get_children():
+            self.dashboard_tree.delete(item)
+
+        try:
+            for row in self.db.get_branch_dashboard(self.stats_window_days):
+                self.dashboard_tree.insert("", tk.END, iid=str(row["branch_id"]), values=(
+                    row["branch_id"],
+                    row["branch_name"],
+                    row["employee_count"],
+                    row["customer_count"],
+                    row["new_customers"],
+                    f"{row['new_customers'] / self.stats_window_days:.2f}"
+                ))
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load dashboard: {str(e)}")
+
+        if self.db.cache is not None:
+            stats = self.db.cache.stats()
+            self.cache_status.config(text=(
+                f"Query cache: {stats['hit_rate']:.0%} hits "
+                f"({stats['hits']}/{stats['hits'] + stats['misses']}), "
+                f"{stats['entries']} entries, {stats['bytes'] // 1024} KB"
+            ))
+
+    def _on_admin_tab_changed(self, event):
+        """Refresh the dashboard whenever it is brought to the front"""
+        if self.notebook.select() == str(self.dashboard_tab):
+            self._load_dashboard()
+
+    # ======================
+    # BRANCH BROWSER METHODS
+    # ======================
+
+    def _create_browse_interface(self):
+        """Create the branch tree; only branch counts are read until a group is opened"""
+        list_frame = ttk.LabelFrame(self.browse_tab, text="Branches", padding="10 5 10 10")
+        list_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+        columns = ("ID", "Name", "Phone", "Email", "Position / DOB")
+        self.browse_tree = ttk.Treeview(list_frame, columns=columns, show="tree headings")
+        self.browse_tree.heading("#0", text="Branch")
+        self.browse_tree.column("#0", width=220, anchor=tk.W)
+        for col in columns:
+            self.browse_tree.heading(col, text=col)
+            self.browse_tree.column(col, width=120, anchor=tk.CENTER)
+
+        y_scroll = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.browse_tree.yview)
+        self.browse_tree.configure(yscroll=y_scroll.set)
+
+        self.browse_tree.grid(row=0, column=0, sticky="nsew")
+        y_scroll.grid(row=0, column=1, sticky="ns")
+
+        list_frame.grid_rowconfigure(0, weight=1)
+        list_frame.grid_columnconfigure(0, weight=1)
+
+        browse_btn_frame = ttk.Frame(list_frame)
+        browse_btn_frame.grid(row=1, columnspan=2, pady=5)
+        ttk.Button(browse_btn_frame, text="Refresh", command=self._load_branch_tree).pack(side=tk.LEFT, padx=5)
+        self.browse_status = ttk.Label(browse_btn_frame, text="")
+        self.browse_status.pack(side=tk.LEFT, padx=10)
+
+        self.browse_tree.bind("<<TreeviewOpen>>", self._on_browse_open)
+        self.browse_tree.bind("<<TreeviewClose>>", self._on_browse_close)
+        self._browse_groups = {}                # group item id -> (table, branch_id)
+        self._browse_fillers = {}               # group item id -> filler of its loaded rows
+        self._load_branch_tree()
+
+    def _load_branch_tree(self):
+        """Branches with their employee/customer counts from branch_stats, all collapsed"""
+        for filler in self._browse_fillers.values():
+            filler.cancel()
+        self._browse_fillers = {}
+        self._browse_groups = {}
+        self.browse_tree.delete(*self.browse_tree.get_children())
+        try:
+            branches = self.db.get_branch_dashboard(self.stats_window_days)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load branches: {str(e)}")
+            return
+        for row in branches:
+            branch = f"branch:{row['branch_id']}"
+            self.browse_tree.insert("", tk.END, iid=branch, text=row["branch_name"],
+                                    values=(row["branch_id"],))
+            for table, label, count in (("employees", "Employees", row["employee_count"]),
+                                        ("customers", "Customers", row["customer_count"])):
+                group = f"{branch}:{table}"
+                self.browse_tree.insert(branch, tk.END, iid=group, text=f"{label} ({count})")
+                self._browse_groups[group] = (table, row["branch_id"])
+                if count:
+                    # Placeholder so the group shows an expander before its rows are read
+                    self.browse_tree.insert(group, tk.END, iid=f"{group}/loading", text="Loading...")
+        self.browse_status.config(text=f"{len(branches)} branches")
+
+    def _on_browse_open(self, event):
+        """Read a group's rows the first time it is opened"""
+        group = self.browse_tree.focus()
+        if group not in self._browse_groups or group in self._browse_fillers:
+            return
+        table, branch_id = self._browse_groups[group]
+        started = time.perf_counter()
+        try:
+            if table == "employees":
+                rows = self.db.get_employees_by_branch(branch_id, columns=VIEW_COLUMNS["employees"])
+            else:
+                rows = self.db.get_customers_by_branch(branch_id, columns=VIEW_COLUMNS["customers"])
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load {table}: {str(e)}")
+            return
+        self._report_load(f"branch {branch_id} {table}", rows, started)
+        filler = ProgressiveTreeFiller(self.root, self.browse_tree, parent=group)
+        self._browse_fillers[group] = filler
+        filler.fill(rows, self._browse_values, PRIMARY_KEYS[table])
+        self.browse_status.config(text=f"{len(rows)} {table} in branch {branch_id}")
+
+    def _on_browse_close(self, event):
+        """Drop the rows under a closed node so memory follows what is expanded"""
+        item = self.browse_tree.focus()
+        groups = [item] if item in self._browse_groups else \
+            [group for group in self.browse_tree.get_children(item) if group in self._browse_groups]
+        for group in groups:
+            filler = self._browse_fillers.pop(group, None)
+            if filler is None:
+                continue
+            filler.cancel()
+            self.browse_tree.delete(*self.browse_tree.get_children(group))
+            self.browse_tree.insert(group, tk.END, iid=f"{group}/loading", text="Loading...")
+            self.browse_tree.item(group, open=False)
+
+    def _browse_values(self, row):
+        """Browse tree values for an employee or customer row"""
+        if "emp_id" in row:
+            return (row["emp_id"], row["emp_name"], row["emp_phone"], row["emp_email"], row["emp_position"])
+        return (row["cust_id"], row["name"], row["phone"], row["email"], row["dob"])
+
+    # ======================
+    # DUPLICATE MERGE METHODS
+    # ======================
+
+    def _show_duplicate_window(self):
+        """Open the duplicate review window and start detection in the background"""
+        window = tk.Toplevel(self.root)
+        window.title("Duplicate Customers")
+        window.geometry("900x500")
+
+        self.duplicate_status = ttk.Label(window, text="Scanning customers...")
+        self.duplicate_status.pack(fill=tk.X, padx=10, pady=5)
+
+        columns = ("Score", "Keep ID", "Keep Name", "Duplicate ID", "Duplicate Name", "Matched On")
+        self.duplicate_tree = ttk.Treeview(window, columns=columns, show="headings")
+        for col in columns:
+            self.duplicate_tree.heading(col, text=col)
+            self.duplicate_tree.column(col, width=140, anchor=tk.CENTER)
+        self.duplicate_tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+        btn_frame = ttk.Frame(window)
+        btn_frame.pack(pady=5)
+        ttk.Button(btn_frame, text="Merge (keep left)",
+                   command=lambda: self._merge_duplicate(keep_left=True)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Merge (keep right)",
+                   command=lambda: self._merge_duplicate(keep_left=False)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Close", command=window.destroy).pack(side=tk.LEFT, padx=5)
+
+        # Detection reads the whole table, so it runs on its own connection off the Tk thread
+        results = queue.Queue()
+
+        def detect():
+            db = None
+            try:
+                db = self.db_factory()
+                results.put(find_duplicates(load_records(db, "customers"), limit=500))
+            except Exception as e:
+                results.put(e)
+            finally:
+                if db is not None:
+                    db.close()
+
+        threading.Thread(target=detect, name="dedup", daemon=True).start()
+        self._await_duplicates(window, results)
+
+    def _await_duplicates(self, window, results):
+        """Fill the duplicate list once the background scan has finished"""
+        if not window.winfo_exists():
+            return
+        try:
+            outcome = results.get_nowait()
+        except queue.Empty:
+            self.root.after(200, self._await_duplicates, window, results)
+            return
+        if isinstance(outcome, Exception):
+            self.duplicate_status.config(text=f"Duplicate scan failed: {outcome}")
+            return
+        for i, pair in enumerate(outcome):
+            self.duplicate_tree.insert("", tk.END, iid=str(i), values=(
+                f"{pair.score:.2f}",
+                pair.left[0],
+                pair.left[1].title(),
+                pair.right[0],
+                pair.right[1].title(),
+                ", ".join(pair.reasons)
+            ))
+        self.duplicate_status.config(text=f"{len(outcome)} candidate pairs, best matches first")
+
+    def _merge_duplicate(self, keep_left):
+        """Merge the selected candidate pair into one customer"""
+        selected_items = self.duplicate_tree.selection()
+        if not selected_items:
+            messagebox.showinfo("Information", "Please select a pair to merge")
+            return
+
+        values = self.duplicate_tree.item(selected_items[0])["values"]
+        keep_id, drop_id = (values[1], values[3]) if keep_left else (values[3], values[1])
+        if not messagebox.askyesno("Confirm Merge", f"Merge customer {drop_id} into {keep_id}?"):
+            return
+
+        try:
+            if self.db.merge_customers(keep_id, drop_id):
+                self.duplicate_tree.delete(selected_items[0])
+                self._load_dashboard()
+            else:
+                messagebox.showerror("Error", "Failed to merge customers")
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not merge customers: {str(e)}")
+
+    def _start_stats_reconciler(self):
+        """Start the periodic aggregate rebuild for this admin session"""
+        self._stop_stats_reconciler()
+        interval = float(os.getenv("DB_RECONCILE_INTERVAL", "3600"))
+        self.stats_reconciler = StatsReconciler(interval, self.stats_window_days, db_factory=self.db_factory)
+        self.stats_reconciler.start()
+
+    def _stop_stats_reconciler(self):
+        """Stop the aggregate rebuild job if one is running"""
+        if self.stats_reconciler is not None:
+            self.stats_reconciler.stop()
+            self.stats_reconciler = None
+
+    # ======================
+    # BRANCH METHODS
+    # ======================
+    
+    def _load_branches(self):
+        """Load branches from database into the treeview"""
+        self.branch_filler.cancel()
+        if self._fill_from_snapshot("branches", self.branch_filler, None):
+            return
+        try:
+            branches = self.db.get_all_branches()
+            self.branch_directory.load(branches)
+            self.branch_filler.fill(branches, self._branch_values, "branch_id")
+            self.memory.checkpoint("load:branches")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load branches: {str(e)}")
+
+    def _branch_values(self, branch):
+        """Treeview row values for a branch record"""
+        return (
+            branch["branch_id"],
+            branch["branch_name"],
+            branch["branch_address"],
+            branch["branch_city"],
+            branch["branch_state"],
+            branch["branch_zip"]
+        )
+
+    def _save_branch(self):
+        """Save branch details to database"""
+        data = [entry.get().strip() for entry in self.branch_entries]
+        
+        # Validate all fields are filled
+        if not all(data):
+            messagebox.showerror("Error", "All fields are required")
+            return
+        
+        try:
+            if hasattr(self, 'current_branch_id') and self.current_branch_id:
+                # Update existing branch
+                success = self.db.update_branch(
+                    self.current_branch_id, 
+                    data[0], data[1], data[2], data[3], data[4]
+                )
+                if success:
+                    messagebox.showinfo("Success", "Branch updated successfully")
+                else:
+                    messagebox.showerror("Error", "Failed to update branch")
+            else:
+                # Create new branch
+                branch_id = self.db.insert_branch(
+                    data[0], data[1], data[2], data[3], data[4]
+                )
+                if branch_id:
+                    messagebox.showinfo("Success", "Branch added successfully")
+                    self.current_branch_id = branch_id
+                else:
+                    messagebox.showerror("Error", "Failed to add branch")
+            
+            # The list picks the change up from the write's change event
+            self._clear_branch_fields()
+        except Exception as e:
+            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+
+    def _new_branch(self):
+        """Clear the form for a new branch"""
+        self.current_branch_id = None
+        self._clear_branch_fields()
+
+    def _delete_branch(self):
+        """Delete the selected branch"""
+        selected_items = self.branch_tree.selection()
+        if not selected_items:
+            messagebox.showinfo("Information", "Please select a branch to delete")
+            return
+        
+        selected_item = selected_items[0]
+        branch_id = self.branch_tree.item(selected_item)["values"][0]
+        branch_name = self.branch_tree.item(selected_item)["values"][1]
+        
+        # Confirm deletion
+        confirm = messagebox.askyesno(
+            "Confirm Deletion", 
+            f"Are you sure you want to delete branch '{branch_name}'?"
+        )
+        if not confirm:
+            return
+        
+        try:
+            success = self.db.delete_branch(branch_id)
+            if success:
+                messagebox.showinfo("Success", "Branch deleted successfully")
+                self._clear_branch_fields()
+            else:
+                messagebox.showerror("Error", "Failed to delete branch")
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not delete branch: {str(e)}")
+
+    def _on_branch_select(self, event):
+        """Handle branch selection in treeview"""
+        selected_items = self.branch_tree.selection()
+        if not selected_items:
+            return
+        
+        selected_item = selected_items[0]
+        branch_id = self.branch_tree.item(selected_item)["values"][0]
+        
+        try:
+            branch = self.db.get_branch_by_id(branch_id)
+            if branch:
+                self.current_branch_id = branch["branch_id"]
+                self.branch_entries[0].delete(0, tk.END)
+                self.branch_entries[0].insert(0, branch["branch_name"])
+                self.branch_entries[1].delete(0, tk.END)
+                self.branch_entries[1].insert(0, branch["branch_address"])
+                self.branch_entries[2].delete(0, tk.END)
+                self.branch_entries[2].insert(0, branch["branch_city"])
+                self.branch_entries[3].delete(0, tk.END)
+                self.branch_entries[3].insert(0, branch["branch_state"])
+                self.branch_entries[4].delete(0, tk.END)
+                self.branch_entries[4].insert(0, branch["branch_zip"])
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load branch details: {str(e)}")
+
+    def _clear_branch_fields(self):
+        """Clear all branch form fields"""
+        for entry in self.branch_entries:
+            entry.delete(0, tk.END)
+        if hasattr(self, 'current_branch_id'):
+            del self.current_branch_id
+
+    # ======================
+    # EMPLOYEE METHODS
+    # ======================
+    
+    def _load_employees(self):
+        """Load employees from database into the treeview"""
+        self.employee_filler.cancel()
+        if self._fill_from_snapshot("employees", self.employee_filler, self.scope_branch_id):
+            return
+        # Only the listed columns are read; the form reads the full row on selection
+        started = time.perf_counter()
+        branch_id = self.scope_branch_id
+
+        def load(db):
+            if branch_id is not None:
+                return db.get_employees_by_branch(branch_id, columns=VIEW_COLUMNS["employees"])
+            return db.get_all_employees(columns=VIEW_COLUMNS["employees"])
+
+        def show(employees):
+            employees = self._with_branch_names(employees)
+            self._report_load("employees", employees, started)
+            self.employee_filler.fill(employees, self._employee_values, "emp_id")
+            self.memory.checkpoint("load:employees")
+
+        self._run_query("employees", "Loading employees", load, show,
+                        lambda e: messagebox.showerror("Error", f"Failed to load employees: {str(e)}"))
+
+    def _employee_values(self, emp):
+        """Treeview row values for an employee record"""
+        return (
+            emp["emp_id"],
+            emp["emp_name"],
+            emp["emp_dob"],
+            emp["emp_phone"],
+            emp["emp_email"],
+            emp["emp_position"],
+            emp["branch_id"],
+            emp["branch_name"]
+        )
+
+    def _search_employees(self):
+        """Search employees by name, email or position, or with a filter such as 'position:Manager'"""
+        search_term = self.employee_search_var.get().strip()
+        if not search_term:
+            self._load_employees()
+            return
+
+        # A running fill or load would keep putting rows from the previous list
+        self.employee_filler.cancel()
+        self._cancel_query("employees")
+        self.employee_tree.delete(*self.employee_tree.get_children())
+
+        branch_id = self.scope_branch_id
+        if is_filter_query(search_term):
+            # Structured filter; see filters.py
+            if branch_id is not None:
+                search_term += f" branch:{branch_id}"
+
+            def search(db):
+                return db.filter_employees(search_term, columns=VIEW_COLUMNS["employees"])
+        else:
+            def search(db):
+                if branch_id is not None:
+                    return db.search_employees_in_branch(branch_id, search_term,
+                                                         columns=VIEW_COLUMNS["employees"])
+                return db.search_employees(search_term, columns=VIEW_COLUMNS["employees"])
+
+        def show(employees):
+            employees = self._with_branch_names(self._in_current_branch(employees))
+            self.employee_filler.fill(employees, self._employee_values, "emp_id")
+            self.employee_search_status.config(text=f"{len(employees)} matches")
+
+        def failed(e):
+            if isinstance(e, FilterError):
+                self.employee_search_status.config(text=str(e))
+            else:
+                messagebox.showerror("Error", f"Search failed: {str(e)}")
+
+        self._run_query("employees", "Searching employees", search, show, failed)
+
+    def _clear_employee_search(self):
+        """Clear employee search results"""
+        self.employee_search_var.set("")
+        self.employee_search_status.config(text="")
+        self._load_employees()
+
+    def _save_employee(self):
+        """Save employee details to database"""
+        data = [entry.get().strip() for entry in self.employee_entries]
+        
+        # Validate all fields are filled
+        if not all(data):
+            messagebox.showerror("Error", "All fields are required")
+            return
+        
+        # Validate date format
+        try:
+            datetime.strptime(data[1], "%Y-%m-%d")
+        except ValueError:
+            messagebox.showerror("Error", "Invalid date format. Use YYYY-MM-DD")
+            return
+        
+        try:
+            # Unknown branches are caught here instead of by a failed insert
+            data[5] = self._resolve_branch(data[5])
+            if data[5] is None:
+                return
+            if hasattr(self, 'current_employee_id') and self.current_employee_id:
+                # Update existing employee
+                success = self.db.update_employee(
+                    self.current_employee_id,
+                    data[0], data[1], data[2], data[3], data[4], data[5]
+                )
+                if success:
+                    messagebox.showinfo("Success", "Employee updated successfully")
+                else:
+                    messagebox.showerror("Error", "Failed to update employee")
+            else:
+                # Create new employee
+                emp_id = self.db.insert_employee(
+                    data[0], data[1], data[2], data[3], data[4], data[5]
+                )
+                if emp_id:
+                    messagebox.showinfo("Success", "Employee added successfully")
+                    self.current_employee_id = emp_id
+                else:
+                    messagebox.showerror("Error", "Failed to add employee")
+            
+            # The list picks the change up from the write's change event
+            self._clear_employee_fields()
+        except Exception as e:
+            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+
+    def _new_employee(self):
+        """Clear the form for a new employee"""
+        self.current_employee_id = None
+        self._clear_employee_fields()
+
+    def _delete_employee(self):
+        """Delete the selected employees"""
+        self._delete_selected("employees", self.employee_tree, "employee")
+        self._clear_employee_fields()
+
+    def _on_employee_select(self, event):
+        """Handle employee selection in treeview"""
+        selected_items = self.employee_tree.selection()
+        if not selected_items:
+            return
+        
+        selected_item = selected_items[0]
+        emp_id = self.employee_tree.item(selected_item)["values"][0]
+        
+        try:
+            employee = self.db.get_employee_by_id(emp_id)
+            if employee:
+                self.current_employee_id = employee["emp_id"]
+                self.employee_entries[0].delete(0, tk.END)
+                self.employee_entries[0].insert(0, employee["emp_name"])
+                self.employee_entries[1].delete(0, tk.END)
+                self.employee_entries[1].insert(0, employee["emp_dob"])
+                self.employee_entries[2].delete(0, tk.END)
+                self.employee_entries[2].insert(0, employee["emp_phone"])
+                self.employee_entries[3].delete(0, tk.END)
+                self.employee_entries[3].insert(0, employee["emp_email"])
+                self.employee_entries[4].delete(0, tk.END)
+                self.employee_entries[4].insert(0, employee["emp_position"])
+                self.employee_entries[5].delete(0, tk.END)
+                self.employee_entries[5].insert(0, self._branches().label(employee["branch_id"]))
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load employee details: {str(e)}")
+
+    def _clear_employee_fields(self):
+        """Clear all employee form fields"""
+        for entry in self.employee_entries:
+            entry.delete(0, tk.END)
+        self.employee_entries[5].configure(style="TCombobox")
+        if self.scope_branch_id is not None:
+            # New records default to the current branch
+            self.employee_entries[5].insert(0, self.branch_directory.label(self.scope_branch_id))
+        if hasattr(self, 'current_employee_id'):
+            del self.current_employee_id
+
+    # ======================
+    # CUSTOMER METHODS
+    # ======================
+    
+    def _load_customers(self):
+        """Load customers from database into the treeview"""
+        self.customer_filler.cancel()
+        if self._fill_from_snapshot("customers", self.customer_filler, self.scope_branch_id):
+            return
+        # Addresses and other wide columns are read when a customer is selected
+        started = time.perf_counter()
+        branch_id = self.scope_branch_id
+
+        def load(db):
+            if branch_id is not None:
+                return db.get_customers_by_branch(branch_id, columns=VIEW_COLUMNS["customers"])
+            return db.get_all_customers(columns=VIEW_COLUMNS["customers"])
+
+        def show(customers):
+            customers = self._with_branch_names(customers)
+            self._report_load("customers", customers, started)
+            self.customer_filler.fill(customers, self._customer_values, "cust_id")
+            self.memory.checkpoint("load:customers")
+
+        self._run_query("customers", "Loading customers", load, show,
+                        lambda e: messagebox.showerror("Error", f"Failed to load customers: {str(e)}"))
+
+    def _customer_values(self, cust):
+        """Treeview row values for a customer record"""
+        return (
+            cust["cust_id"],
+            cust["name"],
+            cust["dob"],
+            cust["phone"],
+            cust["email"],
+            cust["branch_id"],
+            cust["branch_name"]
+        )
+
+    def _customer_tags(self, cust):
+        """Archived rows are shown greyed out and cannot be edited"""
+        return ("archived",) if cust.get("archived_at") else ()
+
+    def _search_customers(self):
+        """Search customers by substring, or by name with typos when fuzzy mode is on"""
+        search_term = self.customer_search_var.get().strip()
+        if not search_term:
+            self._load_customers()
+            return
+
+        # A running fill or load would keep putting rows from the previous list
+        self.customer_filler.cancel()
+        self._cancel_query("customers")
+        self.customer_tree.delete(*self.customer_tree.get_children())
+
+        if self.customer_fuzzy_var.get():
+            try:
+                if not self.customer_name_index.ready:
+                    self.customer_search_status.config(text="Fuzzy index is still loading")
+                    return
+                start = time.perf_counter()
+                matches = self.customer_name_index.search(search_term, k=50)
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                rows = {row["cust_id"]: row for row in
+                        self.db.get_rows_by_ids("customers", [m[0] for m in matches])}
+                ranked = self._in_current_branch(
+                    [rows[cust_id] for cust_id, _, _ in matches if cust_id in rows])
+                self.customer_filler.fill(ranked, self._customer_values, "cust_id")
+                stats = self.customer_name_index.stats()
+                self.customer_search_status.config(
+                    text=f"{len(matches)} matches in {elapsed_ms:.1f} ms "
+                         f"(index: {stats['names']} names, {stats['bytes'] / 1048576:.0f} MB)")
+            except Exception as e:
+                messagebox.showerror("Error", f"Search failed: {str(e)}")
+            return
+
+        branch_id = self.scope_branch_id
+        include_archive = self.customer_archive_var.get()
+        if is_filter_query(search_term):
+            # Structured filter such as "city:Pune dob:1990..1999"; see filters.py
+            if branch_id is not None:
+                search_term += f" branch:{branch_id}"
+
+            def search(db):
+                return db.filter_customers(search_term, columns=VIEW_COLUMNS["customers"])
+
+            def show(customers):
+                customers = self._with_branch_names(customers)
+                self.customer_filler.fill(customers, self._customer_values, "cust_id")
+                self.customer_search_status.config(text=f"{len(customers)} matches")
+        else:
+            def search(db):
+                if branch_id is not None and not include_archive:
+                    return db.search_customers_in_branch(branch_id, search_term,
+                                                         columns=VIEW_COLUMNS["customers"])
+                return db.search_customers(search_term, include_archive=include_archive,
+                                           columns=VIEW_COLUMNS["customers"])
+
+            def show(customers):
+                customers = self._with_branch_names(self._in_current_branch(customers))
+                self.customer_filler.fill(customers, self._customer_values, "cust_id",
+                                          to_tags=self._customer_tags)
+                archived = sum(1 for cust in customers if cust.get("archived_at"))
+                self.customer_search_status.config(
+                    text=f"{len(customers)} matches" + (f", {archived} archived" if archived else ""))
+
+        def failed(e):
+            if isinstance(e, FilterError):
+                self.customer_search_status.config(text=str(e))
+            else:
+                messagebox.showerror("Error", f"Search failed: {str(e)}")
+
+        self._run_query("customers", "Searching customers", search, show, failed)
+
+    def _clear_customer_search(self):
+        """Clear customer search results"""
+        self.customer_search_var.set("")
+        self.customer_search_status.config(text="")
+        self._load_customers()
+
+    def _build_customer_name_index(self):
+        """Stream customer names into the fuzzy index on a background connection"""
+        def build():
+            db = None
+            try:
+                db = self.db_factory()
+                self.customer_name_index.build(db.iter_table("customers", ["name"]), "cust_id")
+                print(f"Fuzzy name index ready: {self.customer_name_index.stats()}")
+            except Exception as e:
+                print(f"Fuzzy name index unavailable: {e}")
+            finally:
+                if db is not None:
+                    db.close()
+
+        threading.Thread(target=build, name="fuzzy-index", daemon=True).start()
+
+    def _save_customer(self):
+        """Save customer details to database"""
+        data = [entry.get().strip() for entry in self.customer_entries]
+        
+        # Validate all fields are filled
+        if not all(data):
+            messagebox.showerror("Error", "All fields are required")
+            return
+        
+        # Validate date format
+        try:
+            datetime.strptime(data[1], "%Y-%m-%d")
+        except ValueError:
+            messagebox.showerror("Error", "Invalid date format. Use YYYY-MM-DD")
+            return
+        
+        try:
+            # Unknown branches are caught here instead of by a failed insert
+            data[5] = self._resolve_branch(data[5])
+            if data[5] is None:
+                return
+            if hasattr(self, 'current_customer_id') and self.current_customer_id:
+                # Update existing customer
+                success = self.db.update_customer(
+                    self.current_customer_id,
+                    data[0], data[1], data[2], data[3], data[4], data[5]
+                )
+                if success:
+                    messagebox.showinfo("Success", "Customer updated successfully")
+                else:
+                    messagebox.showerror("Error", "Failed to update customer")
+            else:
+                # Create new customer
+                cust_id = self.db.insert_customer(
+                    data[0], data[1], data[2], data[3], data[4], data[5]
+                )
+                if cust_id:
+                    messagebox.showinfo("Success", "Customer added successfully")
+                    self.current_customer_id = cust_id
+                else:
+                    messagebox.showerror("Error", "Failed to add customer")
+            
+            # The list and the fuzzy index pick the change up from the write's change event
+            self._clear_customer_fields()
+        except Exception as e:
+            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+
+    def _new_customer(self):
+        """Clear the form for a new customer"""
+        self.current_customer_id = None
+        self._clear_customer_fields()
+
+    def _delete_customer(self):
+        """Delete the selected customers"""
+        self._delete_selected("customers", self.customer_tree, "customer")
+        self._clear_customer_fields()
+
+    def _on_customer_select(self, event):
+        """Handle customer selection in treeview"""
+        selected_items = self.customer_tree.selection()
+        if not selected_items:
+            return
+        
+        selected_item = selected_items[0]
+        cust_id = self.customer_tree.item(selected_item)["values"][0]
+        if "archived" in self.customer_tree.item(selected_item, "tags"):
+            self._clear_customer_fields()
+            self.customer_search_status.config(text=f"Customer {cust_id} is archived and read-only")
+            return
+        
+        try:
+            customer = self.db.get_customer_by_id(cust_id)
+            if customer:
+                self.current_customer_id = customer["cust_id"]
+                self.customer_entries[0].delete(0, tk.END)
+                self.customer_entries[0].insert(0, customer["name"])
+                self.customer_entries[1].delete(0, tk.END)
+                self.customer_entries[1].insert(0, customer["dob"])
+                self.customer_entries[2].delete(0, tk.END)
+                self.customer_entries[2].insert(0, customer["phone"])
+                self.customer_entries[3].delete(0, tk.END)
+                self.customer_entries[3].insert(0, customer["email"])
+                self.customer_entries[4].delete(0, tk.END)
+                self.customer_entries[4].insert(0, customer["address"])
+                self.customer_entries[5].delete(0, tk.END)
+                self.customer_entries[5].insert(0, self._branches().label(customer["branch_id"]))
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load customer details: {str(e)}")
+
+    def _clear_customer_fields(self):
+        """Clear all customer form fields"""
+        for entry in self.customer_entries:
+            entry.delete(0, tk.END)
+        self.customer_entries[5].configure(style="TCombobox")
+        if self.scope_branch_id is not None:
+            # New records default to the current branch
+            self.customer_entries[5].insert(0, self.branch_directory.label(self.scope_branch_id))
+        if hasattr(self, 'current_customer_id'):
+            del self.current_customer_id
+
+    # ======================
+    # BULK OPERATIONS
+    # ======================
+
+    def _selected_ids(self, tree):
+        """Primary keys of the selected rows, leaving out read-only archived rows"""
+        return [int(iid) for iid in tree.selection() if "archived" not in tree.item(iid, "tags")]
+
+    def _delete_selected(self, table, tree, noun):
+        """Delete every selected row in one transaction and drop them from the list"""
+        ids = self._selected_ids(tree)
+        if not ids:
+            messagebox.showinfo("Information", f"Please select a {noun} to delete")
+            return
+        if len(ids) == 1:
+            question = f"Are you sure you want to delete {noun} '{tree.item(str(ids[0]), 'values')[1]}'?"
+        else:
+            question = f"Are you sure you want to delete {len(ids)} {noun}s?"
+        if not messagebox.askyesno("Confirm Deletion", question):
+            return
+
+        try:
+            deleted = self.db.delete_many(table, ids)
+            if deleted:
+                messagebox.showinfo("Success", f"{len(deleted)} {noun}(s) deleted successfully")
+            else:
+                messagebox.showerror("Error", f"Failed to delete {noun}s")
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not delete {noun}s: {str(e)}")
+
+    def _show_bulk_edit(self, table, column=None):
+        """Set one field on every selected row; column fixes the field, e.g. branch_id"""
+        tree = self.employee_tree if table == "employees" else self.customer_tree
+        ids = self._selected_ids(tree)
+        if not ids:
+            messagebox.showinfo("Information", "Please select the rows to change")
+            return
+
+        labels = {
+            "employees": {"Position": "emp_position", "Branch ID": "branch_id", "Date of Birth": "emp_dob"},
+            "customers": {"Address": "address", "Branch ID": "branch_id", "Date of Birth": "dob"},
+        }[table]
+        window = tk.Toplevel(self.root)
+        window.title("Move to Branch" if column == "branch_id" else "Bulk Edit")
+        window.transient(self.root)
+        frame = ttk.Frame(window, padding="10 10 10 10")
+        frame.pack(fill=tk.BOTH, expand=True)
+        ttk.Label(frame, text=f"{len(ids)} rows selected").grid(row=0, columnspan=2, pady=(0, 5))
+
+        field_var = tk.StringVar(value=next(l for l, c in labels.items() if c == (column or c)))
+        ttk.Label(frame, text="Field:").grid(row=1, column=0, sticky="e", padx=5, pady=3)
+        ttk.Combobox(frame, textvariable=field_var, values=list(labels), width=25,
+                     state="disabled" if column else "readonly").grid(row=1, column=1, sticky="w", padx=5, pady=3)
+        value_var = tk.StringVar()
+        ttk.Label(frame, text="New value:").grid(row=2, column=0, sticky="e", padx=5, pady=3)
+        if column == "branch_id":
+            value_entry = self._make_branch_picker(frame, textvariable=value_var, width=26)
+        else:
+            value_entry = ttk.Entry(frame, textvariable=value_var, width=28)
+        value_entry.grid(row=2, column=1, sticky="w", padx=5, pady=3)
+
+        def apply():
+            self._apply_bulk_edit(window, table, ids, labels[field_var.get()], value_var.get().strip())
+
+        ttk.Button(frame, text="Apply", command=apply).grid(row=3, columnspan=2, pady=10)
+
+    def _apply_bulk_edit(self, window, table, ids, column, value):
+        """Validate the value, run one set-based update and patch the list in place"""
+        if not value:
+            messagebox.showerror("Error", "A value is required", parent=window)
+            return
+        if column in ("dob", "emp_dob"):
+            try:
+                datetime.strptime(value, "%Y-%m-%d")
+            except ValueError:
+                messagebox.showerror("Error", "Invalid date format. Use YYYY-MM-DD", parent=window)
+                return
+        if column == "branch_id":
+            try:
+                value = self._resolve_branch(value, parent=window)
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to load branches: {str(e)}", parent=window)
+                return
+            if value is None:
+                return
+
+        try:
+            updated = self.db.bulk_update(table, ids, {column: value})
+            if not updated:
+                messagebox.showerror("Error", "Failed to update the selected rows", parent=window)
+                return
+            window.destroy()
+            messagebox.showinfo("Success", f"{len(updated)} rows updated")
+        except Exception as e:
+            messagebox.showerror("Error", f"Bulk update failed: {str(e)}", parent=window)
+
+    # ======================
+    # CHANGE POLLING
+    # ======================
+
+    def _start_change_poller(self):
+        """Take the watermark before the lists load, then follow changes from it"""
+        self._stop_change_poller()
+        try:
+            start_seq = self.db.get_latest_change_seq()
+        except Exception as e:
+            print(f"Change polling disabled: {e}")
+            return
+        if start_seq is None:
+            print("Change polling disabled: the database is unavailable")
+            return
+        self.change_poller = ChangePoller(start_seq, interval=self.poll_interval, db_factory=self.db_factory)
+        self.change_poller.start()
+        self._poll_after_id = self.root.after(int(self.poll_interval * 1000), self._apply_polled_changes)
+
+    def _stop_change_poller(self):
+        """Stop the poller and its drain callback"""
+        if getattr(self, '_poll_after_id', None):
+            self.root.after_cancel(self._poll_after_id)
+            self._poll_after_id = None
+        if self.change_poller is not None:
+            self._save_snapshots()
+            self.change_poller.stop()
+            self.change_poller = None
+
+    def _apply_polled_changes(self):
+        """Drain queued change sets on the Tk thread and apply them as deltas"""
+        for change_set in self.change_poller.drain():
+            self._apply_change_set(change_set)
+        self._poll_after_id = self.root.after(int(self.poll_interval * 1000), self._apply_polled_changes)
+
+    def _on_data_change(self, event):
+        """Apply one of this session's committed writes like a polled change set"""
+        if event.op == "D":
+            change_set = ChangeSet(event.table, [], list(event.ids), event.columns)
+        else:
+            change_set = ChangeSet(event.table, self.db.get_rows_by_ids(event.table, list(event.ids)), [],
+                                   event.columns)
+        self._apply_change_set(change_set)
+
+    def _apply_change_set(self, change_set):
+        """Update, insert or remove only the changed rows of an open treeview"""
+        if self.db.cache is not None:
+            # Cached lists and searches cannot see other users' writes on their own
+            self.db.cache.invalidate(change_set.table)
+
+        if change_set.table == "branches" and self.branch_directory.loaded:
+            self.branch_directory.apply(change_set.rows, change_set.deleted_ids)
+            if change_set.deleted_ids or change_set.columns is None or "branch_name" in change_set.columns:
+                self._apply_branch_names(change_set)
+
+        if change_set.table == "customers":
+            # Other users' customer writes keep the fuzzy index current too
+            for row_id in change_set.deleted_ids:
+                self.customer_name_index.remove(row_id)
+            for row in change_set.rows:
+                self.customer_name_index.add(row["cust_id"], row["name"])
+
+        # (tree, row values, search box, scoped to the current branch)
+        views = {
+            "branches": ("branch_tree", self._branch_values, None, False),
+            "employees": ("employee_tree", self._employee_values, "employee_search_var", True),
+            "customers": ("customer_tree", self._customer_values, "customer_search_var", True),
+        }
+        if change_set.table not in views:
+            return
+        tree_attr, to_values, search_attr, scoped = views[change_set.table]
+        tree = getattr(self, tree_attr, None)
+        if tree is None or not tree.winfo_exists():
+            return
+
+        # A filtered list should not grow rows that may not match the search
+        search_var = getattr(self, search_attr, None) if search_attr else None
+        filtered = search_var is not None and bool(search_var.get().strip())
+
+        key = PRIMARY_KEYS[change_set.table]
+        for row_id in change_set.deleted_ids:
+            if tree.exists(str(row_id)):
+                tree.delete(str(row_id))
+        for row in change_set.rows:
+            iid = str(row[key])
+            if scoped and not self._in_current_branch([row]):
+                # Moved to another branch
+                if tree.exists(iid):
+                    tree.delete(iid)
+                continue
+            if tree.exists(iid):
+                tree.item(iid, values=to_values(row))
+            elif not filtered:
+                # New rows from other users go to the end until the next full load re-sorts
+                tree.insert("", tk.END, iid=iid, values=to_values(row))
+
+    def _apply_branch_names(self, change_set):
+        """Show renamed or deleted branches in the other views that display branch names"""
+        names = {str(row["branch_id"]): row["branch_name"] for row in change_set.rows}
+        names.update({str(branch_id): None for branch_id in change_set.deleted_ids})
+        for tree_attr in ("employee_tree", "customer_tree"):
+            tree = getattr(self, tree_attr, None)
+            if tree is None or not tree.winfo_exists():
+                continue
+            for iid in tree.get_children():
+                branch_id = str(tree.set(iid, "Branch ID"))
+                if branch_id in names:
+                    tree.set(iid, "Branch Name", names[branch_id] or "")
+
+        dashboard = getattr(self, "dashboard_tree", None)
+        browse = getattr(self, "browse_tree", None)
+        for branch_id, name in names.items():
+            if dashboard is not None and dashboard.winfo_exists() and dashboard.exists(branch_id):
+                if name is None:
+                    dashboard.delete(branch_id)
+                else:
+                    dashboard.set(branch_id, "Branch", name)
+            node = f"branch:{branch_id}"
+            if browse is not None and browse.winfo_exists() and browse.exists(node):
+                if name is not None:
+                    browse.item(node, text=name)
+                    continue
+                for group in browse.get_children(node):
+                    filler = self._browse_fillers.pop(group, None)
+                    if filler is not None:
+                        filler.cancel()
+                    self._browse_groups.pop(group, None)
+                browse.delete(node)
+
+    # ======================
+    # CANCELLABLE QUERIES
+    # ======================
+
+    def _run_query(self, view, label, work, done, failed):
+        """Run work(db) off the Tk thread on its own connection while a Cancel control is shown
+
+        done(result) or failed(error) then runs on the Tk thread, unless the query
+        was cancelled. A new query for a view cancels the one still running for it.
+        """
+        self._cancel_query(view)
+        token = CancelToken()
+        results = queue.Queue()
+
+        def run():
+            db = None
+            try:
+                db = self.db_factory()
+                db.follow(self.db)              # Same cache, and replicas that have this session's writes
+                with db.cancellable(token):
+                    results.put((done, work(db)))
+            except Exception as e:
+                results.put((failed, e))
+            finally:
+                if db is not None:
+                    db.close()
+
+        self._queries[view] = (token, label)
+        self._show_queries()
+        threading.Thread(target=run, name=f"query-{view}", daemon=True).start()
+        self._await_query(view, token, results)
+
+    def _await_query(self, view, token, results):
+        """Hand the query's outcome to its callback once the worker has finished"""
+        if token.cancelled:
+            return
+        try:
+            callback, outcome = results.get_nowait()
+        except queue.Empty:
+            self.root.after(50, self._await_query, view, token, results)
+            return
+        del self._queries[view]
+        self._show_queries()
+        callback(outcome)
+
+    def _cancel_query(self, view=None):
+        """Stop the running query for view, or every running query; rows read so far are dropped"""
+        views = [view] if view is not None else list(getattr(self, '_queries', {}))
+        cancelled = [self._queries.pop(v)[0] for v in views if v in self._queries]
+        if not cancelled:
+            return
+        # KILL QUERY opens a connection of its own, so the Tk thread does not wait for it
+        for token in cancelled:
+            threading.Thread(target=token.cancel, name="query-cancel", daemon=True).start()
+        if view is None:
+            self.status_bar.config(text="Query cancelled")
+        self._show_queries()
+
+    def _show_queries(self):
+        """Show the Cancel control with what is running, or hide it when nothing is"""
+        if self._queries:
+            self.query_label.config(text=", ".join(label for _, label in self._queries.values()) + "\u2026")
+            self.query_bar.pack(side=tk.BOTTOM, fill=tk.X, after=self.status_bar)
+        else:
+            self.query_bar.pack_forget()
+
+    # ======================
+    # WARM START SNAPSHOTS
+    # ======================
+
+    def _fill_from_snapshot(self, view, filler, scope):
+        """Show the list saved at the last exit, once per session, and replay what changed since"""
+        if self.snapshots is None or view in self._warm_views:
+            return False
+        self._warm_views.add(view)
+        if self.change_poller is None:
+            return False                        # Nothing would bring the saved rows up to date
+        loaded = self.snapshots.load(view, scope)
+        if loaded is None:
+            return False
+        seq, rows = loaded
+        tree = filler.tree
+        if len(rows) and len(rows[0][1]) != len(tree["columns"]):
+            rows.close()                        # Saved before the list's columns changed
+            return False
+        start_seq = self.change_poller.start_seq
+        try:
+            oldest = self.db.get_oldest_change_seq() if seq < start_seq else None
+        except Exception as e:
+            print(f"Snapshot of {view} not used: {e}")
+            rows.close()
+            return False
+        if seq > start_seq or (seq < start_seq and (oldest is None or oldest > seq + 1)):
+            # Taken from another database state, or changes since then were pruned
+            rows.close()
+            return False
+        self._snapshot_rows[view] = rows
+        filler.fill(rows, lambda row: row[1], 0)
+        if seq < start_seq:
+            self._replays[view] = (seq, self.change_poller.replay(seq))
+        self.memory.checkpoint(f"load:{view}")
+        return True
+
+    def _save_snapshots(self):
+        """Save the open, fully loaded lists with the change seq they are current to"""
+        if self.snapshots is None or self.change_poller is None:
+            return
+        # (tree, filler, search box, scoped to the current branch)
+        views = {
+            "branches": ("branch_tree", "branch_filler", None, False),
+            "employees": ("employee_tree", "employee_filler", "employee_search_var", True),
+            "customers": ("customer_tree", "customer_filler", "customer_search_var", True),
+        }
+        watermark = self.change_poller.watermark
+        replaying = {view: since for view, (since, thread) in self._replays.items() if thread.is_alive()}
+        try:
+            # Changes up to the watermark may still be queued for the lists
+            for change_set in self.change_poller.drain():
+                self._apply_change_set(change_set)
+            for view, (tree_attr, filler_attr, search_attr, scoped) in views.items():
+                tree = getattr(self, tree_attr, None)
+                filler = getattr(self, filler_attr, None)
+                if tree is None or not tree.winfo_exists() or filler is None or filler.busy:
+                    continue
+                if search_attr and getattr(self, search_attr).get().strip():
+                    continue                    # Search results, not the list
+                rows = [(iid, tree.item(iid, "values")) for iid in tree.get_children()]
+                if view in self._snapshot_rows:
+                    self._snapshot_rows.pop(view).close()     # Unmapped before the file is replaced
+                self.snapshots.save(view, replaying.get(view, watermark),
+                                    self.scope_branch_id if scoped else None, rows)
+        except (tk.TclError, OSError) as e:
+            print(f"Could not save list snapshots: {e}")
+        self._replays = {}
+
+    # ======================
+    # UTILITY METHODS
+    # ======================
+    
+    def clear_window(self):
+        """Clear all widgets from the root window"""
+        self._cancel_query()
+        for filler in ("branch_filler", "employee_filler", "customer_filler"):
+            if hasattr(self, filler):
+                getattr(self, filler).cancel()
+        for filler in getattr(self, '_browse_fillers', {}).values():
+            filler.cancel()
+        self._browse_fillers = {}
+        kept = ("status_bar", "query_bar", "query_label")
+        for widget in self.root.winfo_children():
+            if widget not in [getattr(self, name, None) for name in kept]:
+                widget.destroy()
+        # Destroyed widgets stay in memory while attributes still point at them
+        for name, value in list(vars(self).items()):
+            if value is self.root or name in kept:
+                continue
+            if isinstance(value, list) and value and isinstance(value[0], tk.Misc):
+                value = value[0]
+            if isinstance(value, (tk.Misc, tk.Variable, ProgressiveTreeFiller)):
+                delattr(self, name)
+            
+    def _on_close(self):
+        """Flush background work before the window goes away"""
+        self.shutdown()
+        self.root.destroy()
+
+    def shutdown(self):
+        """Stop background threads, write out pending audit entries and close the connection"""
+        for token, _ in getattr(self, '_queries', {}).values():
+            token.cancel()
+        self._queries = {}
+        if getattr(self, 'change_poller', None) is not None:
+            self._save_snapshots()
+            self.change_poller.stop()
+            self.change_poller = None
+        if getattr(self, 'stats_reconciler', None) is not None:
+            self.stats_reconciler.stop()
+            self.stats_reconciler = None
+        for rows in getattr(self, '_snapshot_rows', {}).values():
+            rows.close()
+        self._snapshot_rows = {}
+        if getattr(self, 'audit_log', None) is not None:
+            self.audit_log.close()
+            self.audit_log = None
+            self.db.audit = None
+        if hasattr(self, 'db'):
+            self.db.close()
+        if hasattr(self, 'memory'):
+            self.memory.close()
+
+    def __del__(self):
+        """Cleanup database connection"""
+        self.shutdown()
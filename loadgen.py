@@ -0,0 +1,175 @@
+import argparse
+import contextlib
+import http.client
+import json
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+SEARCH_TERMS = ["sharma", "rao", "singh", "patel", "kumar", "iyer", "gupta", "das"]
+FIRST_NAMES = ["Aarav", "Asha", "Rahul", "Priya", "Vikram", "Sneha", "Rohan", "Kavya", "Arjun", "Meera"]
+LAST_NAMES = ["Sharma", "Rao", "Singh", "Patel", "Kumar", "Iyer", "Gupta", "Das", "Verma", "Nair"]
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class Worker(threading.Thread):
+    """One keep-alive client issuing a mix of reads until the deadline"""
+
+    def __init__(self, host, port, deadline, max_id, seed):
+        super().__init__(daemon=True)
+        self.host = host
+        self.port = port
+        self.deadline = deadline
+        self.max_id = max_id
+        self.random = random.Random(seed)
+        self.latencies = []
+        self.statuses = {}
+        self.errors = 0
+        self._etags = {}
+
+    def _request(self, connection, path, conditional=False):
+        headers = {}
+        if conditional and path in self._etags:
+            headers["If-None-Match"] = self._etags[path]
+        start = time.perf_counter()
+        connection.request("GET", path, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        self.latencies.append(time.perf_counter() - start)
+        self.statuses[response.status] = self.statuses.get(response.status, 0) + 1
+        etag = response.getheader("ETag")
+        if etag:
+            self._etags[path] = etag
+
+    def run(self):
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        while time.perf_counter() < self.deadline:
+            roll = self.random.random()
+            if roll < 0.5:
+                path, conditional = f"/customers/{self.random.randint(1, self.max_id)}", False
+            elif roll < 0.7:
+                path, conditional = f"/customers?after={self.random.randint(0, self.max_id)}&limit=50", False
+            elif roll < 0.85:
+                path, conditional = f"/customers/search?q={self.random.choice(SEARCH_TERMS)}&limit=20", False
+            else:
+                # Revalidate a page this client has already seen
+                path, conditional = "/customers?limit=50", True
+            try:
+                self._request(connection, path, conditional)
+            except (OSError, http.client.HTTPException):
+                self.errors += 1
+                connection.close()
+                connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        connection.close()
+
+
+@contextlib.contextmanager
+def seed_standin(rows, prefix="bank-loadgen-", employees=0):
+    """Temporary SQLite database with 20 branches, rows customers and the given number of employees
+
+    Yields its path; the directory holding it is removed when the block exits.
+    """
+    directory = tempfile.mkdtemp(prefix=prefix)
+    try:
+        yield _seed(os.path.join(directory, "standin.sqlite3"), rows, employees)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def _seed(path, rows, employees=0):
+    from sqlite_backend import SQLiteDatabaseManager
+
+    db = SQLiteDatabaseManager(path)
+    rng = random.Random(1)
+    branch_ids = [db.insert_branch(f"Branch {i}", f"{i} Main Road", "Pune", "MH", "411001") for i in range(1, 21)]
+    # Seed in one transaction; per-row commits would dominate start-up
+    db.cursor.executemany(
+        "INSERT INTO customers(name, dob, phone, email, address, branch_id) VALUES(%s, %s, %s, %s, %s, %s)",
+        [(f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", "1990-01-01",
+          str(9000000000 + i), f"user{i}@example.com", f"{i} Park Street", rng.choice(branch_ids))
+         for i in range(rows)]
+    )
+    db.cursor.executemany(
+        "INSERT INTO employees(emp_name, emp_dob, emp_phone, emp_email, emp_position, branch_id) "
+        "VALUES(%s, %s, %s, %s, %s, %s)",
+        [(f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", "1985-01-01", str(8000000000 + i),
+          f"staff{i}@example.com", rng.choice(["Teller", "Clerk", "Manager"]), rng.choice(branch_ids))
+         for i in range(employees)]
+    )
+    db.connection.commit()
+    db.close()
+    return path
+
+
+def start_standin(path, pool_size):
+    """Serve a seeded SQLite database on an ephemeral local port"""
+    from service import ApiServer, ConnectionPool, make_factory
+
+    server = ApiServer(("127.0.0.1", 0), ConnectionPool(make_factory(path), pool_size))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load generator for service.py")
+    parser.add_argument("--url", help="running service, e.g. http://127.0.0.1:8080 (default: SQLite stand-in)")
+    parser.add_argument("--rows", type=int, default=20000, help="customers seeded into the stand-in")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--max-id", type=int, help="highest customer id to request (default: --rows)")
+    args = parser.parse_args(argv)
+
+    with contextlib.ExitStack() as stack:
+        server = None
+        if args.url:
+            target = urlsplit(args.url)
+            host, port = target.hostname, target.port or 80
+        else:
+            server = start_standin(stack.enter_context(seed_standin(args.rows)), args.clients)
+            host, port = server.server_address
+        run_clients(host, port, args)
+        if server is not None:
+            server.shutdown()
+            server.pool.close()
+
+
+def run_clients(host, port, args):
+    "Run the workers against host:port and print the JSON report"
+
+    deadline = time.perf_counter() + args.duration
+    workers = [Worker(host, port, deadline, args.max_id or args.rows, seed) for seed in range(args.clients)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(l for w in workers for l in w.latencies)
+    statuses = {}
+    for worker in workers:
+        for status, count in worker.statuses.items():
+            statuses[status] = statuses.get(status, 0) + count
+    report = {
+        "requests": len(latencies),
+        "errors": sum(w.errors for w in workers),
+        "requests_per_sec": round(len(latencies) / elapsed, 1),
+        "latency_ms": {name: round(percentile(latencies, q) * 1000, 2)
+                       for name, q in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("p99.9", 0.999), ("max", 1.0))},
+        "statuses": statuses,
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+import argparse
+import contextlib
+import json
+import random
+import sys
+import threading
+import time
+from configuration import DatabaseManager, Error, LIST_COLUMNS
+from loadgen import FIRST_NAMES, LAST_NAMES, SEARCH_TERMS, percentile, seed_standin
+
+#Relative weights of the operations a teller performs
+DEFAULT_MIX = {"list": 5, "search": 15, "select": 45, "save": 20, "delete": 5, "hot": 10}
+#Contact fields updated one at a time through update_contact's read-then-write
+HOT_FIELDS = ("name", "phone", "email", "address")
+DEADLOCK = 1213
+LOCK_WAIT_TIMEOUT = 1205
+
+
+def parse_mix(text):
+    "'select=50,save=30,...' over DEFAULT_MIX's operations"
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"Unknown operation {name!r}; use {', '.join(DEFAULT_MIX)}")
+        mix[name] = float(weight)
+    return mix
+
+
+class Stats:
+    """Counters shared by all clients"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.deadlocks = 0
+        self.lock_timeouts = 0
+        self.errors = 0
+        self.error_samples = {}                 # message -> count, for the first few kinds
+
+    def record_error(self, error):
+        message = str(error)
+        with self._lock:
+            if getattr(error, "errno", None) == DEADLOCK:
+                self.deadlocks += 1
+            elif getattr(error, "errno", None) == LOCK_WAIT_TIMEOUT or "database is locked" in message:
+                self.lock_timeouts += 1
+            else:
+                self.errors += 1
+            if message in self.error_samples or len(self.error_samples) < 10:
+                self.error_samples[message] = self.error_samples.get(message, 0) + 1
+
+
+class CountingCursor:
+    """Cursor proxy that records statement errors DatabaseManager would only print"""
+
+    def __init__(self, cursor, stats):
+        self._cursor = cursor
+        self._stats = stats
+
+    def execute(self, query, params=()):
+        try:
+            self._cursor.execute(query, params)
+        except Error as e:
+            self._stats.record_error(e)
+            raise
+
+    def executemany(self, query, seq_params):
+        try:
+            self._cursor.executemany(query, seq_params)
+        except Error as e:
+            self._stats.record_error(e)
+            raise
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class Client(threading.Thread):
+    """One headless teller running the operation mix on its own DatabaseManager"""
+
+    def __init__(self, index, db, plan, deadline, seed, think=0.0):
+        super().__init__(name=f"loadtest-client-{index}", daemon=True)
+        self.index = index
+        self.db = db
+        self.plan = plan
+        self.deadline = deadline
+        self.think = think
+        self.random = random.Random(seed)
+        self.latencies = {name: [] for name in DEFAULT_MIX}
+        self.failed = {name: 0 for name in DEFAULT_MIX}
+        self.inserted = []                      # Customers this client created and has not deleted
+        self.acknowledged = {}                  # (contact id, field) -> last value update_contact accepted
+        self._writes = 0
+        self._owned = [pair for number, pair in enumerate(plan.hot_pairs) if number % plan.clients == index]
+        self._names, self._weights = zip(*[(name, weight) for name, weight in plan.mix.items() if weight > 0])
+
+    def run(self):
+        while time.perf_counter() < self.deadline:
+            name = self.random.choices(self._names, self._weights)[0]
+            started = time.perf_counter()
+            try:
+                ok = getattr(self, f"_{name}")()
+            except Exception as e:
+                # Errors DatabaseManager lets through, e.g. from a read
+                if not isinstance(e, Error):
+                    self.plan.stats.record_error(e)
+                ok = False
+            self.latencies[name].append(time.perf_counter() - started)
+            if not ok:
+                self.failed[name] += 1
+            if self.think:
+                time.sleep(self.random.uniform(0, 2 * self.think))
+
+    def _value(self, field):
+        self._writes += 1
+        tag = f"c{self.index}-{self._writes}"
+        return {"name": f"Load {tag}", "phone": tag, "email": f"{tag}@loadtest.invalid",
+                "address": f"{tag} Test Street"}.get(field, tag)
+
+    def _list(self):
+        rows = self.db.get_customers_by_branch(self.random.choice(self.plan.branch_ids),
+                                               columns=LIST_COLUMNS["customers"])
+        return rows is not None
+
+    def _search(self):
+        term = self.random.choice(SEARCH_TERMS)
+        if self.random.random() < 0.5:
+            rows = self.db.search_customers_in_branch(self.random.choice(self.plan.branch_ids), term,
+                                                      columns=LIST_COLUMNS["customers"])
+        else:
+            rows = self.db.search_customers(term, columns=LIST_COLUMNS["customers"])
+        return rows is not None
+
+    def _select(self):
+        self.db.get_customer_by_id(self.random.randint(1, self.plan.max_id))
+        return True
+
+    def _save(self):
+        if self.random.random() < 0.3 or not self.plan.work_ids:
+            name = f"{self.random.choice(FIRST_NAMES)} {self.random.choice(LAST_NAMES)}"
+            tag = f"c{self.index}-{len(self.inserted)}"
+            cust_id = self.db.insert_customer(name, "1990-01-01", "9" + str(self.random.randrange(10 ** 9)).zfill(9),
+                                              f"{tag}@loadtest.invalid", f"{tag} Test Street",
+                                              self.random.choice(self.plan.branch_ids))
+            if cust_id:
+                self.inserted.append(cust_id)
+            return bool(cust_id)
+        # Form save on a row other tellers are editing too: read it, change one field, write it all back
+        cust_id = self.random.choice(self.plan.work_ids)
+        current = self.db.get_customer_by_id(cust_id)
+        if current is None:
+            return False
+        return self.db.update_customer(cust_id, current["name"], current["dob"], current["phone"],
+                                       current["email"], self._value("address"), current["branch_id"])
+
+    def _delete(self):
+        if not self.inserted:
+            return self._save()
+        return self.db.delete_customer(self.inserted.pop(self.random.randrange(len(self.inserted))))
+
+    def _hot(self):
+        if not self._owned:
+            # More clients than hot fields: read the hot rows the others are writing
+            return self.db.get_contact_through_id(self.random.choice(self.plan.hot_ids)) is not None
+        contact_id, field = self.random.choice(self._owned)
+        value = self._value(field)
+        if self.db.update_contact(contact_id, **{field: value}):
+            self.acknowledged[(contact_id, field)] = value
+            return True
+        return False
+
+
+class Plan:
+    """What the clients share: the data they work on and the operation mix"""
+
+    def __init__(self, clients, mix, branch_ids, max_id, work_ids, hot_ids, stats):
+        self.clients = clients
+        self.mix = mix
+        self.branch_ids = branch_ids
+        self.max_id = max_id
+        self.work_ids = work_ids                # Customers created for saves to contend on
+        self.hot_ids = hot_ids                  # Contacts updated field by field
+        # Every (contact, field) pair has exactly one writing client, so any other value is a lost update
+        self.hot_pairs = [(contact_id, field) for contact_id in hot_ids for field in HOT_FIELDS]
+        self.stats = stats
+
+
+def prepare(db, clients, mix, work_rows, hot_rows, stats):
+    "Create the rows the test writes to, next to whatever data is already there"
+    branch_ids = [branch["branch_id"] for branch in db.get_all_branches()]
+    if not branch_ids:
+        raise SystemExit("The database has no branches; seed it first")
+    max_id = db._fetch_one("SELECT coalesce(max(cust_id), 0) as max_id from customers")["max_id"]
+    work_ids = [db.insert_customer(f"Loadtest Work {i}", "1990-01-01", str(9100000000 + i),
+                                   f"work{i}@loadtest.invalid", f"{i} Test Street", branch_ids[i % len(branch_ids)])
+                for i in range(work_rows)]
+    hot_ids = [db.create_contact(f"Loadtest Hot {i}", "other", str(9200000000 + i),
+                                 f"hot{i}@loadtest.invalid", f"{i} Test Street") for i in range(hot_rows)]
+    return Plan(clients, mix, branch_ids, max(max_id, 1), [i for i in work_ids if i], [i for i in hot_ids if i], stats)
+
+
+def cleanup(db, plan, clients):
+    "Remove every row the test created"
+    for cust_id in plan.work_ids + [cust_id for client in clients for cust_id in client.inserted]:
+        db.delete_customer(cust_id)
+    for contact_id in plan.hot_ids:
+        db.delete_contact(contact_id)
+
+
+def lost_updates(db, clients):
+    "Acknowledged hot-field writes that a later read-then-write by another client overwrote"
+    lost = []
+    for client in clients:
+        for (contact_id, field), value in client.acknowledged.items():
+            row = db.get_contact_through_id(contact_id)
+            if row is not None and row[field] != value:
+                lost.append({"contact": contact_id, "field": field, "written": value, "found": row[field]})
+    return lost
+
+
+def report(clients, stats, elapsed, lost, backend):
+    latencies = sorted(l for client in clients for values in client.latencies.values() for l in values)
+    by_operation = {}
+    for name in DEFAULT_MIX:
+        values = sorted(l for client in clients for l in client.latencies[name])
+        if not values:
+            continue
+        by_operation[name] = {
+            "count": len(values),
+            "failed": sum(client.failed[name] for client in clients),
+            "ops_per_sec": round(len(values) / elapsed, 1),
+            "latency_ms": {label: round(percentile(values, q) * 1000, 2)
+                           for label, q in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("max", 1.0))},
+        }
+    return {
+        "backend": backend,
+        "clients": len(clients),
+        "duration_s": round(elapsed, 2),
+        "operations": len(latencies),
+        "ops_per_sec": round(len(latencies) / elapsed, 1),
+        "latency_ms": {label: round(percentile(latencies, q) * 1000, 2)
+                       for label, q in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("p99.9", 0.999), ("max", 1.0))},
+        "by_operation": by_operation,
+        "deadlocks": stats.deadlocks,
+        "lock_timeouts": stats.lock_timeouts,
+        "errors": stats.errors,
+        "error_samples": stats.error_samples,
+        "hot_writes": sum(len(client.acknowledged) for client in clients),
+        "lost_updates": len(lost),
+        "lost_update_samples": lost[:5],
+    }
+
+
+def run(factory, args, backend, stats):
+    admin = factory(True)
+    try:
+        plan = prepare(admin, args.clients, args.mix, args.work_rows, args.hot_rows, stats)
+        # One manager per client, as every GUI session has; a manager's single cursor is not thread-safe
+        managers = [factory(False) for _ in range(args.clients)]
+        for db in managers:
+            db.cursor = CountingCursor(db.cursor, stats)
+
+        deadline = time.perf_counter() + args.duration
+        clients = [Client(i, db, plan, deadline, seed=i, think=args.think_ms / 1000)
+                   for i, db in enumerate(managers)]
+        started = time.perf_counter()
+        for client in clients:
+            client.start()
+        for client in clients:
+            client.join()
+        elapsed = time.perf_counter() - started
+        for db in managers:
+            db.close()
+
+        lost = lost_updates(admin, clients)
+        result = report(clients, stats, elapsed, lost, backend)
+        if not args.keep:
+            cleanup(admin, plan, clients)
+    finally:
+        admin.close()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Concurrent headless clients against one database: throughput, latency, "
+                    "deadlocks and lost updates",
+        epilog="Runs against a seeded SQLite stand-in unless --mysql is given. The test adds and "
+               "removes its own rows; point --mysql only at a local or test database.",
+    )
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--mix", type=parse_mix, default=dict(DEFAULT_MIX),
+                        help="operation weights, e.g. select=50,save=30,hot=20 (default: %(default)s)")
+    parser.add_argument("--rows", type=int, default=20000, help="customers seeded into the stand-in")
+    parser.add_argument("--work-rows", type=int, default=200, help="customers created for saves to contend on")
+    parser.add_argument("--hot-rows", type=int, default=10, help="contacts updated field by field")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="mean pause between operations")
+    parser.add_argument("--mysql", action="store_true", help="use the configured MySQL database")
+    parser.add_argument("--keep", action="store_true", help="leave the rows the test created")
+    args = parser.parse_args(argv)
+
+    with contextlib.ExitStack() as stack:
+        if args.mysql:
+            backend = "mysql"
+            factory = lambda create: DatabaseManager(create_tables=create)
+        else:
+            from sqlite_backend import SQLiteDatabaseManager
+            backend = "sqlite"
+            path = stack.enter_context(seed_standin(args.rows, prefix="bank-loadtest-"))
+            factory = lambda create: SQLiteDatabaseManager(path, create_tables=create)
+
+        stats = Stats()
+        # The report owns stdout; DatabaseManager's error prints go to stderr
+        with contextlib.redirect_stdout(sys.stderr):
+            result = run(factory, args, backend, stats)
+    print(json.dumps(result, indent=2, default=str))
+    return 1 if result["lost_updates"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
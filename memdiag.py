@@ -0,0 +1,90 @@
+import os
+import sys
+import time
+import tracemalloc
+
+
+def current_rss():
+    "Resident set size of this process in bytes, or None where it cannot be read"
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        # Peak rather than current outside Linux, still enough to spot steady growth
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        return None
+
+
+def result_bytes(rows):
+    "Approximate bytes decoded for a result set, counting each value as text"
+    total = 0
+    for row in rows:
+        for value in row.values():
+            if value is not None:
+                total += len(value) if isinstance(value, (str, bytes)) else len(str(value))
+    return total
+
+
+class MemoryDiagnostics:
+    """Opt-in tracemalloc checkpoints at role switches and table loads
+
+    Each checkpoint is diffed against the previous visit to the same label, so
+    a screen that leaks shows the same allocation sites growing every time it
+    is opened. Turned on with DB_MEMORY_DIAGNOSTICS=1; reports go to stderr or
+    to DB_MEMORY_LOG.
+    """
+
+    def __init__(self, enabled=None, top=10, frames=5, out=None):
+        if enabled is None:
+            enabled = os.getenv("DB_MEMORY_DIAGNOSTICS", "") not in ("", "0")
+        self.enabled = enabled
+        self.top = top
+        self._out = out
+        self._by_label = {}                     # label -> last snapshot taken there
+        self.history = []                       # (label, traced bytes, rss bytes)
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def _write(self, text):
+        if self._out is None:
+            path = os.getenv("DB_MEMORY_LOG")
+            self._out = open(path, "a", encoding="utf-8") if path else sys.stderr
+        self._out.write(text + "\n")
+        self._out.flush()
+
+    def checkpoint(self, label):
+        "Snapshot now and report what grew since this label was last seen"
+        if not self.enabled:
+            return
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ))
+        traced, _ = tracemalloc.get_traced_memory()
+        rss = current_rss()
+        self.history.append((label, traced, rss))
+
+        previous = self._by_label.get(label)
+        self._by_label[label] = snapshot
+        rss_text = f"{rss / 1048576:.1f} MB" if rss is not None else "n/a"
+        self._write(f"[{time.strftime('%H:%M:%S')}] {label}: traced {traced / 1048576:.1f} MB, RSS {rss_text}")
+        if previous is None:
+            return
+        for stat in snapshot.compare_to(previous, "traceback")[:self.top]:
+            if stat.size_diff <= 0:
+                break
+            frame = stat.traceback[-1]
+            self._write(f"    +{stat.size_diff / 1024:.1f} KiB in {stat.count_diff:+d} blocks "
+                        f"at {frame.filename}:{frame.lineno}")
+
+    def close(self):
+        if self._out is not None and self._out is not sys.stderr:
+            self._out.close()
+        self._out = None
+        if self.enabled and tracemalloc.is_tracing():
+            tracemalloc.stop()
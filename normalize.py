@@ -0,0 +1,72 @@
+import re
+import unicodedata
+
+# Country code assumed for local numbers without one
+DEFAULT_COUNTRY_CODE = "91"
+
+# Soundex digit for each consonant group
+_SOUNDEX_CODES = {}
+for _letters, _digit in (("BFPV", "1"), ("CGJKQSXZ", "2"), ("DT", "3"),
+                         ("L", "4"), ("MN", "5"), ("R", "6")):
+    for _letter in _letters:
+        _SOUNDEX_CODES[_letter] = _digit
+
+
+def normalize_phone(value, country_code=DEFAULT_COUNTRY_CODE):
+    """Phone number as E.164 digits without the '+', or None if it cannot be one"""
+    if value is None:
+        return None
+    digits = re.sub(r"\D", "", str(value))
+    if digits.startswith("00"):                 # International dialling prefix
+        digits = digits[2:]
+    elif len(digits) == 11 and digits.startswith("0"):
+        digits = country_code + digits[1:]      # Trunk prefix on a national number
+    elif len(digits) == 10:
+        digits = country_code + digits
+    if not 8 <= len(digits) <= 15:
+        return None
+    return digits
+
+
+def normalize_email(value):
+    """Email trimmed and lowercased, or None if empty"""
+    if value is None:
+        return None
+    email = str(value).strip().lower()
+    return email or None
+
+
+def email_local_part(value):
+    """Mailbox part of an email without any +tag"""
+    email = normalize_email(value)
+    if not email or "@" not in email:
+        return None
+    local = email.split("@", 1)[0].split("+", 1)[0]
+    return local or None
+
+
+def normalize_name(value):
+    """Name folded to lowercase ASCII letters and single spaces"""
+    if value is None:
+        return ""
+    text = unicodedata.normalize("NFKD", str(value))
+    text = text.encode("ascii", "ignore").decode("ascii").lower()
+    return " ".join(re.sub(r"[^a-z ]", " ", text).split())
+
+
+def soundex(word):
+    """American Soundex code of a single word, e.g. 'Sharma' -> 'S650'"""
+    word = re.sub(r"[^A-Z]", "", str(word).upper())
+    if not word:
+        return ""
+    code = word[0]
+    previous = _SOUNDEX_CODES.get(word[0], "")
+    for letter in word[1:]:
+        digit = _SOUNDEX_CODES.get(letter, "")
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        if letter not in "HW":                  # H and W do not separate equal codes
+            previous = digit
+    return code.ljust(4, "0")
@@ -0,0 +1,22 @@
+import argparse
+from configuration import DatabaseManager
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hash-partition employees and customers by branch_id")
+    parser.add_argument("tables", nargs="*", default=["customers", "employees"],
+                        help="customers and/or employees (default: both)")
+    parser.add_argument("--partitions", type=int, default=16)
+    args = parser.parse_args(argv)
+
+    db = DatabaseManager()
+    try:
+        for table in args.tables:
+            if db.partition_by_branch(table, args.partitions):
+                print(f"{table}: partitioned by branch_id")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+import os
+import sys
+
+APP_DIR_NAME = "bank-management"
+
+
+def user_dir(kind):
+    """Per-user directory for the app's local files; kind is "cache" or "state"
+
+    Cache files can be rebuilt from the database, state files cannot. Both stay
+    out of the working directory, which is the source checkout when the app runs
+    from it. The directory is not created here.
+    """
+    if sys.platform == "win32":
+        base = os.getenv("LOCALAPPDATA") or os.path.expanduser(r"~\AppData\Local")
+        return os.path.join(base, APP_DIR_NAME, kind)
+    if sys.platform == "darwin":
+        base = "~/Library/Caches" if kind == "cache" else "~/Library/Application Support"
+    elif kind == "cache":
+        base = os.getenv("XDG_CACHE_HOME") or "~/.cache"
+    else:
+        base = os.getenv("XDG_STATE_HOME") or "~/.local/state"
+    return os.path.join(os.path.expanduser(base), APP_DIR_NAME)
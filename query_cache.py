@@ -0,0 +1,159 @@
+import functools
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+
+def _normalize(value, fold_case=False):
+    # Extra spaces never change a result; case only does not where the SQL compares with LIKE
+    if isinstance(value, str):
+        value = " ".join(value.split())
+        return value.lower() if fold_case else value
+    if isinstance(value, list):
+        return tuple(value)                     # Column projections are passed as lists too
+    return value
+
+
+def _result_size(result):
+    "Rough in-memory size of a result set, counted once when it is stored"
+    if result is None:
+        return 0
+    rows = result if isinstance(result, list) else [result]
+    size = sys.getsizeof(rows)
+    for row in rows:
+        size += sys.getsizeof(row)
+        if isinstance(row, dict):
+            size += sum(sys.getsizeof(v) for v in row.values())
+    return size
+
+
+class QueryCache:
+    """Result sets of read methods keyed by method name and normalized parameters
+
+    Entries expire after ttl seconds, are evicted least recently used first when
+    max_entries or max_bytes is exceeded, and are dropped as soon as a table they
+    were read from is written. Cached rows are shared between callers and must
+    not be modified.
+    """
+
+    def __init__(self, ttl=60.0, max_entries=512, max_bytes=32 * 1024 * 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()           # key -> (expires, tables, result, size)
+        self._by_table = {}                     # table -> keys read from it
+        self._generations = {}                  # table -> write count, guards against stale stores
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    @staticmethod
+    def make_key(method, args, kwargs, fold_case=False):
+        return (method,
+                tuple(_normalize(a, fold_case) for a in args),
+                tuple(sorted((k, _normalize(v, fold_case)) for k, v in kwargs.items())))
+
+    def generation(self, tables):
+        with self._lock:
+            return tuple(self._generations.get(t, 0) for t in tables)
+
+    def get(self, key):
+        "(True, result) on a live hit, (False, None) otherwise"
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[2]
+            if entry is not None:
+                self._discard(key)
+            self.misses += 1
+            return False, None
+
+    def put(self, key, tables, result, generation=None):
+        "Store a result unless one of its tables was written since generation was taken"
+        size = _result_size(result)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if generation is not None and generation != tuple(self._generations.get(t, 0) for t in tables):
+                return
+            if key in self._entries:
+                self._discard(key)
+            self._entries[key] = (time.monotonic() + self.ttl, tables, result, size)
+            self._bytes += size
+            for table in tables:
+                self._by_table.setdefault(table, set()).add(key)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, *tables):
+        "Drop every entry read from any of the given tables"
+        with self._lock:
+            for table in tables:
+                self._generations[table] = self._generations.get(table, 0) + 1
+                for key in list(self._by_table.get(table, ())):
+                    self._discard(key)
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            for table in list(self._by_table):
+                self._generations[table] = self._generations.get(table, 0) + 1
+            self._entries.clear()
+            self._by_table.clear()
+            self._bytes = 0
+
+    def _discard(self, key):
+        _, tables, _, size = self._entries.pop(key)
+        self._bytes -= size
+        for table in tables:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[table]
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hit_rate, 3),
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+def cached(*tables, fold_case=False):
+    """Serve a DatabaseManager read method from self.cache when one is attached
+
+    tables lists every table the query reads, so a write to any of them drops the entry.
+    fold_case lets "Sharma" and "sharma" share an entry; only set it on methods
+    whose SQL compares strings case-insensitively (LIKE searches), not on filters.
+    """
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache = self.cache
+            if cache is None:
+                return method(self, *args, **kwargs)
+            key = cache.make_key(method.__name__, args, kwargs, fold_case)
+            found, result = cache.get(key)
+            if found:
+                return result
+            generation = cache.generation(tables)
+            result = method(self, *args, **kwargs)
+            cache.put(key, tables, result, generation)
+            return result
+        return wrapper
+    return decorate
@@ -0,0 +1,138 @@
+import os
+import random
+import time
+from mysql.connector import Error
+from resilience import CONNECTION_ERRORS, CircuitBreaker, is_unhealthy
+
+
+def parse_hosts(spec):
+    "host[:port] entries separated by commas, e.g. DB_REPLICAS=10.0.0.2,10.0.0.3:3307"
+    hosts = []
+    for entry in (spec or "").split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        host, _, port = entry.partition(":")
+        hosts.append((host, int(port) if port else 3306))
+    return hosts
+
+
+class Replica:
+    """One read replica with its own connection and a running latency estimate"""
+
+    def __init__(self, host, port, open_connection, probe_interval):
+        self.host = host
+        self.port = port
+        self.name = f"{host}:{port}"
+        self._open_connection = open_connection
+        self.connection = None
+        self.cursor = None
+        self.latency = None                     # Smoothed seconds per query; None until measured
+        self.seen_seq = 0                       # Newest change_log seq known to be applied here
+        self.reads = 0
+        self.breaker = CircuitBreaker(self._probe, failure_threshold=1, probe_interval=probe_interval,
+                                      name=f"Replica {self.name}")
+
+    def _connect(self):
+        self.connection, self.cursor = self._open_connection(self.host, self.port)
+        #Every read sees the newest replicated data instead of the snapshot of the first one
+        self.connection.autocommit = True
+
+    def _probe(self):
+        connection, cursor = self._open_connection(self.host, self.port)
+        try:
+            cursor.execute("SELECT 1")
+            cursor.fetchall()
+        finally:
+            connection.close()
+
+    def caught_up(self, floor):
+        "Whether this replica has applied change_log up to floor"
+        if self.seen_seq >= floor:
+            return True
+        self.cursor.execute("SELECT coalesce(max(seq), 0) as seq from change_log")
+        self.seen_seq = self.cursor.fetchone()["seq"]
+        return self.seen_seq >= floor
+
+    def disconnect(self):
+        if self.connection is not None:
+            try:
+                self.connection.close()
+            except Error:
+                pass
+        self.connection = self.cursor = None
+
+
+class ReplicaRouter:
+    """Sends reads to the fastest replica that has caught up with this session
+
+    Replicas are ordered by a moving average of their query times; a small share
+    of reads goes to a random replica so a replica that was slow once gets
+    measured again. A replica behind the session's read floor (the newest change
+    it wrote or saw) is skipped, and a replica that fails is left alone until its
+    breaker's background probe reaches it again. read() reports when no replica
+    could serve, and the caller then reads from the primary.
+    """
+
+    def __init__(self, hosts, open_connection, smoothing=0.2, explore=0.05, probe_interval=10.0):
+        self.replicas = [Replica(host, port, open_connection, probe_interval) for host, port in hosts]
+        self.smoothing = smoothing
+        self.explore = explore
+        self.primary_reads = 0
+
+    def _candidates(self):
+        healthy = [replica for replica in self.replicas if replica.breaker.allow()]
+        if len(healthy) > 1 and random.random() < self.explore:
+            random.shuffle(healthy)
+            return healthy
+        # Unmeasured replicas first, so each one gets a latency estimate
+        return sorted(healthy, key=lambda replica: -1 if replica.latency is None else replica.latency)
+
+    def read(self, run, floor=0):
+        "Returns (True, run(cursor)) from a replica, or (False, None) to read from the primary"
+        for replica in self._candidates():
+            try:
+                if replica.connection is None:
+                    replica._connect()
+                if not replica.caught_up(floor):
+                    continue
+                started = time.perf_counter()
+                result = run(replica.cursor)
+            except Error as e:
+                if not is_unhealthy(e):
+                    raise                       # A bad statement fails on the primary too
+                print(f"Replica {replica.name} unavailable: {e}")
+                if getattr(e, "errno", None) in CONNECTION_ERRORS:
+                    replica.disconnect()
+                replica.breaker.record_failure(e)
+                continue
+            elapsed = time.perf_counter() - started
+            replica.latency = elapsed if replica.latency is None else \
+                replica.latency + self.smoothing * (elapsed - replica.latency)
+            replica.reads += 1
+            return True, result
+        self.primary_reads += 1
+        return False, None
+
+    def stats(self):
+        return {
+            "primary_reads": self.primary_reads,
+            "replicas": [{
+                "name": replica.name, "reads": replica.reads, "seen_seq": replica.seen_seq,
+                "latency_ms": None if replica.latency is None else round(replica.latency * 1000, 2),
+                "healthy": replica.breaker.allow(),
+            } for replica in self.replicas],
+        }
+
+    def close(self):
+        for replica in self.replicas:
+            replica.disconnect()
+
+
+def make_router(open_connection):
+    "Router for DB_REPLICAS, or None when no replicas are configured"
+    hosts = parse_hosts(os.getenv("DB_REPLICAS"))
+    if not hosts:
+        return None
+    return ReplicaRouter(hosts, open_connection,
+                         probe_interval=float(os.getenv("DB_REPLICA_PROBE_INTERVAL", "10")))
@@ -0,0 +1,159 @@
+import random
+import threading
+import time
+from mysql.connector import Error
+
+#MySQL client/server error numbers that mean "try again", not "this statement is wrong"
+CONNECTION_ERRORS = {
+    2003,       # Can't connect to MySQL server
+    2005,       # Unknown host (DNS hiccup)
+    2006,       # MySQL server has gone away
+    2013,       # Lost connection during query
+    2055,       # Lost connection (socket error)
+}
+TRANSIENT_ERRORS = CONNECTION_ERRORS | {
+    1205,       # Lock wait timeout exceeded
+    1213,       # Deadlock found; the transaction was rolled back
+}
+QUERY_TIMEOUT = 3024    # max_execution_time exceeded
+
+
+class DatabaseUnavailable(Error):
+    """Raised without touching the network while the circuit breaker is open"""
+
+
+def is_transient(error):
+    return getattr(error, "errno", None) in TRANSIENT_ERRORS
+
+
+def is_unhealthy(error):
+    "Errors that say something about the server rather than about the statement"
+    return getattr(error, "errno", None) in CONNECTION_ERRORS or getattr(error, "errno", None) == QUERY_TIMEOUT
+
+
+def backoff_delays(attempts, base=0.2, cap=2.0):
+    "Full-jitter exponential delays to sleep between attempts"
+    for attempt in range(attempts - 1):
+        yield random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def retry(call, attempts=3, base=0.2, cap=2.0, should_retry=is_transient):
+    "Run call(), retrying transient errors with jittered backoff"
+    delays = backoff_delays(attempts, base, cap)
+    while True:
+        try:
+            return call()
+        except Error as e:
+            delay = next(delays, None)
+            if delay is None or isinstance(e, DatabaseUnavailable) or not should_retry(e):
+                raise
+            time.sleep(delay)
+
+
+class CircuitBreaker:
+    """Fails fast after repeated failures and probes for recovery in the background
+
+    Closed: calls go through, and failure_threshold consecutive failures open
+    the breaker. Open: allow() is False, so callers fail immediately instead of
+    waiting on timeouts. A probe thread calls probe() every probe_interval
+    seconds (with jitter) and closes the breaker when it succeeds.
+    """
+
+    def __init__(self, probe, failure_threshold=3, probe_interval=5.0, name="Database"):
+        self.probe = probe
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = None
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._probing = False
+
+    @property
+    def degraded(self):
+        return self.state == "open"
+
+    def allow(self):
+        return self.state == "closed"
+
+    def record_success(self):
+        if self.failures:
+            with self._lock:
+                self.failures = 0
+
+    def record_failure(self, error=None):
+        with self._lock:
+            self.failures += 1
+            self.last_error = error
+            if self.state == "closed" and self.failures >= self.failure_threshold:
+                self._open()
+
+    def trip(self, error=None):
+        "Open straight away, e.g. when the first connection attempt fails"
+        with self._lock:
+            self.last_error = error
+            if self.state == "closed":
+                self._open()
+
+    def _open(self):
+        self.state = "open"
+        self.opened_at = time.monotonic()
+        print(f"{self.name} circuit opened: {self.last_error}")
+        if not self._probing:
+            self._probing = True
+            threading.Thread(target=self._probe_until_healthy, name="db-probe", daemon=True).start()
+
+    def _probe_until_healthy(self):
+        while True:
+            time.sleep(self.probe_interval * random.uniform(0.8, 1.2))
+            try:
+                self.probe()
+            except Exception as e:
+                self.last_error = e
+                continue
+            with self._lock:
+                self.state = "closed"
+                self.failures = 0
+                self._probing = False
+            print(f"{self.name} circuit closed: server reachable again")
+            return
+
+
+class GuardedCursor:
+    """Cursor wrapper that sends every statement through the manager's health checks
+
+    The underlying cursor is swapped on reconnect, so DatabaseManager code can
+    keep using self.cursor unchanged.
+    """
+
+    def __init__(self, manager):
+        self._manager = manager
+        self._cursor = None
+
+    def attach(self, cursor):
+        self._cursor = cursor
+
+    def _run(self, call):
+        self._manager._before_query()
+        try:
+            call()
+        except Error as e:
+            self._manager._query_failed(e)
+            raise
+        self._manager.breaker.record_success()
+
+    def execute(self, query, params=()):
+        self._run(lambda: self._cursor.execute(query, params))
+
+    def executemany(self, query, seq_params):
+        self._run(lambda: self._cursor.executemany(query, seq_params))
+
+    def close(self):
+        if self._cursor is not None:
+            self._cursor.close()
+
+    def __getattr__(self, name):
+        # fetchone/fetchall/lastrowid/rowcount/description of the live cursor
+        return getattr(self._cursor, name)
@@ -0,0 +1,355 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+from itertools import accumulate
+from configuration import DatabaseManager, Error
+
+#Rows generated per random stream; fixed so the data does not depend on the load batch size
+BLOCK = 10000
+
+CITIES = [                                      # (city, state, zip prefix, weight)
+    ("Mumbai", "MH", "400", 16), ("Delhi", "DL", "110", 15), ("Bengaluru", "KA", "560", 12),
+    ("Hyderabad", "TS", "500", 8), ("Chennai", "TN", "600", 8), ("Pune", "MH", "411", 7),
+    ("Kolkata", "WB", "700", 7), ("Ahmedabad", "GJ", "380", 5), ("Jaipur", "RJ", "302", 4),
+    ("Lucknow", "UP", "226", 3), ("Kochi", "KL", "682", 3), ("Indore", "MP", "452", 3),
+    ("Nagpur", "MH", "440", 2), ("Bhopal", "MP", "462", 2), ("Coimbatore", "TN", "641", 2),
+    ("Chandigarh", "CH", "160", 2), ("Mysuru", "KA", "570", 1), ("Nashik", "MH", "422", 1),
+]
+AREAS = ["Central", "North", "South", "East", "West", "Main Road", "Market", "Station Road",
+         "Civil Lines", "Camp", "Old Town", "Ring Road", "MG Road", "Nagar", "Colony", "Park"]
+MALE_NAMES = ["Aarav", "Rahul", "Vikram", "Rohan", "Arjun", "Amit", "Suresh", "Rajesh", "Karan", "Sanjay",
+              "Anil", "Deepak", "Manoj", "Nikhil", "Pranav", "Vivek", "Aditya", "Harsh", "Imran", "Joseph"]
+FEMALE_NAMES = ["Asha", "Priya", "Sneha", "Kavya", "Meera", "Anjali", "Pooja", "Neha", "Divya", "Lakshmi",
+                "Sunita", "Ritu", "Swati", "Nisha", "Fatima", "Shreya", "Ananya", "Isha", "Mary", "Rekha"]
+LAST_NAMES = ["Sharma", "Patel", "Singh", "Kumar", "Gupta", "Rao", "Reddy", "Iyer", "Nair", "Das",
+              "Verma", "Joshi", "Mehta", "Shah", "Khan", "Menon", "Pillai", "Banerjee", "Chopra", "Desai",
+              "Kulkarni", "Bose", "Mishra", "Pandey", "Agarwal", "Fernandes", "Thomas", "Yadav", "Jain", "Ghosh"]
+STREETS = ["MG Road", "Station Road", "Gandhi Nagar", "Nehru Street", "Park Street", "Lake View", "Hill Road",
+           "Temple Street", "Church Road", "Market Lane", "Ring Road", "Sector 5", "Civil Lines", "Link Road"]
+EMAIL_DOMAINS = [("gmail.com", 55), ("yahoo.co.in", 14), ("outlook.com", 10), ("rediffmail.com", 6),
+                 ("hotmail.com", 5), ("icloud.com", 3), ("company.in", 7)]
+POSITIONS = [("Teller", 35), ("Clerk", 20), ("Relationship Manager", 14), ("Loan Officer", 10),
+             ("Cashier", 9), ("Assistant Manager", 7), ("Manager", 5)]
+
+TABLE_COLUMNS = {
+    "branches": ("branch_id", "branch_name", "branch_address", "branch_city", "branch_state", "branch_zip"),
+    "employees": ("emp_id", "emp_name", "emp_dob", "emp_phone", "emp_email", "emp_position", "branch_id",
+                  "phone_norm", "email_norm"),
+    "customers": ("cust_id", "name", "dob", "phone", "email", "address", "branch_id", "created_date",
+                  "phone_norm", "email_norm"),
+    "contacts": ("id", "name", "gender", "phone", "email", "address", "phone_norm", "email_norm"),
+}
+PRIMARY_COLUMNS = {table: columns[0] for table, columns in TABLE_COLUMNS.items()}
+
+
+def zipf_weights(count, exponent=1.0):
+    "Weights 1/rank^exponent: a few very common values and a long tail"
+    return [1 / (rank ** exponent) for rank in range(1, count + 1)]
+
+
+class Chooser:
+    """Weighted picks of k values at once from one list"""
+
+    def __init__(self, values, weights=None):
+        self.values = values
+        self.cum_weights = list(accumulate(weights)) if weights else None
+
+    def pick(self, rng, k):
+        return rng.choices(self.values, cum_weights=self.cum_weights, k=k)
+
+
+MALE = Chooser(MALE_NAMES, zipf_weights(len(MALE_NAMES), 0.7))
+FEMALE = Chooser(FEMALE_NAMES, zipf_weights(len(FEMALE_NAMES), 0.7))
+SURNAME = Chooser(LAST_NAMES, zipf_weights(len(LAST_NAMES), 0.8))
+STREET = Chooser(STREETS)
+DOMAIN = Chooser([d for d, _ in EMAIL_DOMAINS], [w for _, w in EMAIL_DOMAINS])
+POSITION = Chooser([p for p, _ in POSITIONS], [w for _, w in POSITIONS])
+CITY = Chooser(CITIES, [c[3] for c in CITIES])
+
+
+class Generator:
+    """Deterministic synthetic rows: the same seed and as-of date always give the same data
+
+    Every block of BLOCK rows of a table has its own random stream, so rows do
+    not depend on how many rows other tables get or on the load batch size.
+    Names, cities, branches and email domains are skewed the way real customer
+    bases are; dates are relative to as_of. Each column of a block is drawn in
+    one weighted choices() call from a precomputed pool, which keeps generation
+    ahead of the bulk loader.
+    """
+
+    def __init__(self, seed, as_of, years=6):
+        self.seed = seed
+        self.as_of = as_of
+        self.customer_dobs = self._birth_dates(18, 85)
+        self.employee_dobs = self._birth_dates(21, 60)
+        # Join dates over the last years, more of them recent than long ago
+        days = range(years * 365)
+        self.join_days = Chooser([(as_of - timedelta(days=d)).isoformat() for d in days],
+                                 [(1 - d / len(days)) ** 0.6 for d in days])
+        self.join_times = Chooser([f"{h:02d}:{m:02d}:{s:02d}" for h in range(9, 18)
+                                   for m in range(60) for s in range(0, 60, 7)])
+        self.house_numbers = Chooser([str(n) for n in range(1, 1000)])
+        self.email_suffixes = Chooser([""] + [str(n) for n in range(1000)], [400] + [0.6] * 1000)
+
+    def _birth_dates(self, youngest, oldest):
+        "Chooser of birth dates, skewed towards working age (beta(2.2, 3.5) over the age range)"
+        days = range(int(youngest * 365.25), int(oldest * 365.25))
+        span = len(days)
+        return Chooser([(self.as_of - timedelta(days=d)).isoformat() for d in days],
+                       [((i + 0.5) / span) ** 1.2 * (1 - (i + 0.5) / span) ** 2.5 for i in range(span)])
+
+    def _rng(self, table, block):
+        return random.Random(f"{self.seed}/{table}/{block}")
+
+    def _people(self, rng, k):
+        "(names, genders, firsts, lasts) for k people, half of them women"
+        genders = rng.choices(("male", "female", "other"), cum_weights=(49, 98, 100), k=k)
+        firsts = [female if gender == "female" else male
+                  for gender, male, female in zip(genders, MALE.pick(rng, k), FEMALE.pick(rng, k))]
+        lasts = SURNAME.pick(rng, k)
+        return [f"{first} {last}" for first, last in zip(firsts, lasts)], genders, firsts, lasts
+
+    def _phones(self, rng, k):
+        "(as typed, E.164 digits) in the formats people actually enter"
+        numbers = [str(rng.randrange(6000000000, 10000000000)) for _ in range(k)]
+        styles = rng.choices((0, 1, 2, 3), cum_weights=(60, 80, 90, 100), k=k)
+        typed = [n if style == 0 else f"+91 {n[:5]} {n[5:]}" if style == 1 else "0" + n if style == 2
+                 else f"{n[:5]}-{n[5:]}" for n, style in zip(numbers, styles)]
+        return typed, ["91" + n for n in numbers]
+
+    def _emails(self, rng, firsts, lasts, missing=0.05):
+        "(as typed, lowercased); a share of people have none"
+        k = len(firsts)
+        forms = rng.choices((0, 1, 2), k=k)
+        present = rng.choices((True, False), cum_weights=(1 - missing, 1), k=k)
+        typed = [None if not has else
+                 f"{first}.{last}" if form == 0 else f"{first}{last[0]}" if form == 1
+                 else f"{first.lower()}_{last.lower()}"
+                 for first, last, form, has in zip(firsts, lasts, forms, present)]
+        typed = [None if local is None else f"{local}{suffix}@{domain}"
+                 for local, suffix, domain in zip(typed, self.email_suffixes.pick(rng, k), DOMAIN.pick(rng, k))]
+        return typed, [None if email is None else email.lower() for email in typed]
+
+    def _addresses(self, rng, cities):
+        k = len(cities)
+        return [f"{number}, {street}, {city}"
+                for number, street, city in zip(self.house_numbers.pick(rng, k), STREET.pick(rng, k), cities)]
+
+    def rows(self, table, count, first_id, **context):
+        "Yield lists of row tuples for table, one block at a time"
+        make = getattr(self, f"_{table}")
+        for block, start in enumerate(range(0, count, BLOCK)):
+            size = min(BLOCK, count - start)
+            yield make(self._rng(table, block), first_id + start, size, **context)
+
+    def _branches(self, rng, first_id, k):
+        cities = CITY.pick(rng, k)
+        areas = rng.choices(AREAS, k=k)
+        addresses = self._addresses(rng, [city[0] for city in cities])
+        return [(first_id + i, f"{city} {area} {first_id + i}", address, city, state,
+                 f"{zip_prefix}{rng.randrange(1000):03d}")
+                for i, ((city, state, zip_prefix, _), area, address) in enumerate(zip(cities, areas, addresses))]
+
+    def _employees(self, rng, first_id, k, branch_ids, branch_weights):
+        names, _, firsts, lasts = self._people(rng, k)
+        phones, phone_norms = self._phones(rng, k)
+        emails, email_norms = self._emails(rng, firsts, lasts, missing=0.0)
+        return list(zip(range(first_id, first_id + k), names, self.employee_dobs.pick(rng, k), phones, emails,
+                        POSITION.pick(rng, k), rng.choices(branch_ids, cum_weights=branch_weights, k=k),
+                        phone_norms, email_norms))
+
+    def _customers(self, rng, first_id, k, branch_ids, branch_weights, branch_cities):
+        names, _, firsts, lasts = self._people(rng, k)
+        phones, phone_norms = self._phones(rng, k)
+        emails, email_norms = self._emails(rng, firsts, lasts)
+        branches = rng.choices(branch_ids, cum_weights=branch_weights, k=k)
+        joined = [f"{day} {at}" for day, at in zip(self.join_days.pick(rng, k), self.join_times.pick(rng, k))]
+        return list(zip(range(first_id, first_id + k), names, self.customer_dobs.pick(rng, k), phones, emails,
+                        self._addresses(rng, [branch_cities[branch] for branch in branches]), branches, joined,
+                        phone_norms, email_norms))
+
+    def _contacts(self, rng, first_id, k):
+        names, genders, firsts, lasts = self._people(rng, k)
+        phones, phone_norms = self._phones(rng, k)
+        emails, email_norms = self._emails(rng, firsts, lasts, missing=0.2)
+        addresses = self._addresses(rng, [city[0] for city in CITY.pick(rng, k)])
+        return list(zip(range(first_id, first_id + k), names, genders, phones, emails, addresses,
+                        phone_norms, email_norms))
+
+
+class SQLiteLoader:
+    """Batched executemany in one transaction per batch, with secondary indexes rebuilt afterwards"""
+
+    def __init__(self, db):
+        self.db = db
+        self.db.cursor.execute("PRAGMA synchronous = OFF")
+
+    def begin(self, table):
+        # Building an index once at the end beats updating it on every insert
+        indexes = self.db._fetch_all(
+            "SELECT name, sql from sqlite_master where type = 'index' and tbl_name = %s and sql is not null", (table,))
+        self._indexes = [index["sql"] for index in indexes]
+        for index in indexes:
+            self.db.cursor.execute(f"DROP INDEX {index['name']}")
+
+    def load(self, table, columns, rows):
+        self.db.cursor.executemany(
+            f"INSERT INTO {table}({', '.join(columns)}) VALUES({', '.join(['%s'] * len(columns))})", rows)
+        self.db.connection.commit()
+
+    def finish(self, table):
+        # A failed batch is rolled back rather than committed along with the indexes
+        self.db.connection.rollback()
+        for sql in self._indexes:
+            self.db.cursor.execute(sql)
+        self.db.connection.commit()
+
+    def close(self):
+        self.db.cursor.execute("PRAGMA synchronous = NORMAL")
+
+
+class MySQLLoader:
+    """LOAD DATA LOCAL INFILE from a tab-separated temp file per batch
+
+    Needs local_infile enabled on the server; without it the loader falls back to
+    multi-row executemany inserts.
+    """
+
+    def __init__(self, db):
+        self.connection, self.cursor = db._open_connection(allow_local_infile=True)
+        self.cursor.execute("SET SESSION unique_checks = 0")
+        self.use_infile = True
+
+    def begin(self, table):
+        pass
+
+    def load(self, table, columns, rows):
+        if self.use_infile:
+            try:
+                self._load_infile(table, columns, rows)
+                return
+            except Error as e:
+                self.connection.rollback()
+                print(f"LOAD DATA LOCAL INFILE unavailable ({e}); using batched inserts")
+                self.use_infile = False
+        self.cursor.executemany(
+            f"INSERT INTO {table}({', '.join(columns)}) VALUES({', '.join(['%s'] * len(columns))})", rows)
+        self.connection.commit()
+
+    def _load_infile(self, table, columns, rows):
+        # Generated values never contain tabs, newlines or backslashes; NULL is \N
+        handle, path = tempfile.mkstemp(prefix=f"seed-{table}-", suffix=".tsv")
+        try:
+            with os.fdopen(handle, "w", encoding="utf-8", newline="\n") as out:
+                for row in rows:
+                    out.write("\t".join("\\N" if value is None else str(value) for value in row))
+                    out.write("\n")
+            self.cursor.execute(f"""
+                LOAD DATA LOCAL INFILE %s INTO TABLE {table}
+                CHARACTER SET utf8mb4 FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n'
+                ({', '.join(columns)})
+            """, (path,))
+            self.connection.commit()
+        finally:
+            os.remove(path)
+
+    def finish(self, table):
+        pass
+
+    def close(self):
+        self.connection.close()
+
+
+def _next_id(db, table):
+    key = PRIMARY_COLUMNS[table]
+    return db._fetch_one(f"SELECT coalesce(max({key}), 0) + 1 as next_id from {table}")["next_id"]
+
+
+def seed(db, loader, generator, counts, batch_size=50000, log=print):
+    "Generate and bulk-load counts[table] rows per table; returns {table: (rows, seconds)}"
+    timings = {}
+
+    def load(table, **context):
+        count = counts.get(table, 0)
+        if not count:
+            return
+        started = time.perf_counter()
+        columns = TABLE_COLUMNS[table]
+        loader.begin(table)
+        try:
+            pending = []
+            for block in generator.rows(table, count, _next_id(db, table), **context):
+                pending.extend(block)
+                if len(pending) >= batch_size:
+                    loader.load(table, columns, pending)
+                    pending = []
+            if pending:
+                loader.load(table, columns, pending)
+        finally:
+            # Indexes dropped by begin() come back even when a batch fails
+            loader.finish(table)
+        elapsed = time.perf_counter() - started
+        timings[table] = (count, elapsed)
+        log(f"{table}: {count} rows in {elapsed:.1f}s ({count / elapsed:,.0f} rows/s)")
+
+    load("branches")
+    branches = db.get_all_branches()
+    if not branches and (counts.get("employees") or counts.get("customers")):
+        raise SystemExit("No branches to attach employees and customers to; seed some with --branches")
+    branch_ids = sorted(branch["branch_id"] for branch in branches)
+    # Big-city branches get most of the customers
+    branch_weights = list(accumulate(zipf_weights(len(branch_ids), 0.6)))
+    branch_cities = {branch["branch_id"]: branch["branch_city"] or "" for branch in branches}
+    load("employees", branch_ids=branch_ids, branch_weights=branch_weights)
+    load("customers", branch_ids=branch_ids, branch_weights=branch_weights, branch_cities=branch_cities)
+    load("contacts")
+    if counts.get("employees") or counts.get("customers"):
+        db.reconcile_branch_stats()             # The dashboard aggregates are not kept by bulk loads
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Bulk-load deterministic synthetic branches, employees, customers and contacts",
+        epilog="The same --seed and --as-of always produce the same rows; ids continue after existing rows.",
+    )
+    parser.add_argument("--branches", type=int, default=200)
+    parser.add_argument("--employees", type=int, default=20000)
+    parser.add_argument("--customers", type=int, default=1000000)
+    parser.add_argument("--contacts", type=int, default=200000)
+    parser.add_argument("--seed", default="1")
+    parser.add_argument("--as-of", type=date.fromisoformat, default=date.today(),
+                        help="date the generated ages and join dates are relative to (default: today)")
+    parser.add_argument("--batch-size", type=int, default=50000, help="rows per LOAD DATA file or insert batch")
+    parser.add_argument("--mysql", action="store_true", help="load into the configured MySQL database")
+    parser.add_argument("--sqlite", default=os.getenv("DB_SQLITE_PATH", "bank.sqlite3"),
+                        help="SQLite file to load into without --mysql (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    if args.mysql:
+        db = DatabaseManager()
+        loader = MySQLLoader(db)
+    else:
+        from sqlite_backend import SQLiteDatabaseManager
+        db = SQLiteDatabaseManager(args.sqlite)
+        loader = SQLiteLoader(db)
+    counts = {"branches": args.branches, "employees": args.employees,
+              "customers": args.customers, "contacts": args.contacts}
+    print(f"Seed {args.seed!r}, as of {args.as_of.isoformat()}")
+    try:
+        timings = seed(db, loader, Generator(args.seed, args.as_of), counts, args.batch_size)
+    finally:
+        loader.close()
+        db.close()
+    rows = sum(count for count, _ in timings.values())
+    seconds = sum(elapsed for _, elapsed in timings.values())
+    if seconds:
+        print(f"Total: {rows} rows in {seconds:.1f}s ({rows / seconds:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+import argparse
+import base64
+import contextlib
+import hashlib
+import json
+import queue
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+from configuration import DatabaseManager, SEARCH_COLUMNS
+from cli import ENTITIES, run_operation
+from query_cache import QueryCache
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def _page_size(query):
+    "limit from the query string, 1..MAX_PAGE_SIZE"
+    limit = int(query.get("limit", DEFAULT_PAGE_SIZE))
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def _encode_cursor(name, row_id):
+    return base64.urlsafe_b64encode(json.dumps([name, row_id]).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(text):
+    "(name, id) from a search page's next_after"
+    try:
+        name, row_id = json.loads(base64.urlsafe_b64decode(text + "=" * (-len(text) % 4)))
+    except (ValueError, TypeError) as e:
+        raise ValueError("after is not a next_after value from a search page") from e
+    return name, row_id
+
+
+class ConnectionPool:
+    """Fixed set of DatabaseManager connections shared by request threads"""
+
+    def __init__(self, factory, size=8):
+        self.factory = factory
+        self._idle = queue.Queue()
+        for _ in range(size):
+            self._idle.put(None)                # Opened lazily on first use
+
+    @contextlib.contextmanager
+    def connection(self, timeout=30):
+        db = self._idle.get(timeout=timeout)
+        try:
+            if db is None:
+                db = self.factory()
+            yield db
+        except Exception:
+            # The connection may be broken; replace it on next use
+            if db is not None:
+                try:
+                    db.connection.rollback()
+                except Exception:
+                    with contextlib.suppress(Exception):
+                        db.close()
+                    db = None
+            raise
+        finally:
+            self._idle.put(db)
+
+    def close(self):
+        while not self._idle.empty():
+            db = self._idle.get_nowait()
+            if db is not None:
+                db.close()
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """JSON API over DatabaseManager
+
+    GET    /<entity>?after=<id>&limit=<n>   keyset page in id order
+    GET    /<entity>/search?q=<term>&after=<next_after>&limit=<n>   keyset page in name order
+    GET    /<entity>/<id>
+    POST   /<entity>                       body: {"field": value, ...}
+    PATCH  /<entity>/<id>                  partial update, PUT is accepted too
+    DELETE /<entity>/<id>
+    GET    /_stats                         query cache metrics
+    """
+
+    protocol_version = "HTTP/1.1"               # Keep-alive with Content-Length on every response
+    disable_nagle_algorithm = True              # Headers and body go out as separate writes
+    server_version = "BankService/1.0"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    # ----- plumbing
+
+    def _send_json(self, status, payload, etag=None):
+        body = json.dumps(payload, default=str, separators=(",", ":")).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_not_modified(self, etag):
+        self.send_response(304)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length))
+
+    def _route(self):
+        parts = urlsplit(self.path)
+        segments = [s for s in parts.path.split("/") if s]
+        if not segments or segments[0] not in ENTITIES or len(segments) > 2:
+            return None, None, None
+        query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        return segments[0], (segments[1] if len(segments) == 2 else None), query
+
+    def _handle(self, method):
+        if method == "GET" and urlsplit(self.path).path == "/_stats":
+            cache = self.server.cache
+            self._send_json(200, {"cache": cache.stats() if cache is not None else None})
+            return
+        entity, target, query = self._route()
+        if entity is None:
+            self._send_json(404, {"error": "not found"})
+            return
+        try:
+            with self.server.pool.connection() as db:
+                if method == "GET":
+                    self._get(db, entity, target, query)
+                elif method == "POST" and target is None:
+                    # A create the database refuses raises OperationFailed, a 500, so 201 always carries an id
+                    self._send_json(201, run_operation(db, entity, "create", fields=self._read_body()))
+                elif method in ("PATCH", "PUT") and target is not None:
+                    result = run_operation(db, entity, "update", target, fields=self._read_body())
+                    self._send_json(200 if result["updated"] else 404, result)
+                elif method == "DELETE" and target is not None:
+                    result = run_operation(db, entity, "delete", target)
+                    self._send_json(200 if result["deleted"] else 404, result)
+                else:
+                    self._send_json(405, {"error": "method not allowed"})
+        except (ValueError, KeyError) as e:
+            self._send_json(400, {"error": str(e)})
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+
+    def _get(self, db, entity, target, query):
+        # Every write appends to change_log, so the latest seq versions every response
+        seq = db.get_latest_change_seq()
+        if seq is None:
+            self._send_json(503, {"error": "database unavailable"})
+            return
+        etag = '"' + hashlib.sha1(f"{seq}:{self.path}".encode()).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self._send_not_modified(etag)
+            return
+
+        limit = _page_size(query)
+        key = ENTITIES[entity].key
+        if target is None:
+            after = int(query.get("after", 0))
+            if after < 0:
+                raise ValueError("after must not be negative")
+            items = db.get_page(entity, after, limit)
+            next_after = items[-1][key] if len(items) == limit else None
+            self._send_json(200, {"items": items, "next_after": next_after}, etag)
+        elif target == "search":
+            # Keyset pages on (name, id): each page is one bounded query however deep it is
+            after = _decode_cursor(query["after"]) if "after" in query else None
+            items = db.search_page(entity, query.get("q", ""), after, limit)
+            name = SEARCH_COLUMNS[entity][0]
+            next_after = _encode_cursor(items[-1][name], items[-1][key]) if len(items) == limit else None
+            self._send_json(200, {"items": items, "next_after": next_after}, etag)
+        else:
+            row = run_operation(db, entity, "get", target)
+            if row is None:
+                self._send_json(404, {"error": "not found"})
+            else:
+                self._send_json(200, row, etag)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PATCH(self):
+        self._handle("PATCH")
+
+    def do_PUT(self):
+        self._handle("PUT")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+
+class ApiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, pool, verbose=False, cache=None):
+        super().__init__(address, ApiHandler)
+        self.pool = pool
+        self.verbose = verbose
+        self.cache = cache
+
+
+def make_factory(sqlite_path=None, cache=None):
+    """Connection factory for MySQL, or for the SQLite stand-in when a path is given
+
+    Every pooled connection shares one cache, so a write on any of them invalidates it.
+    """
+    if sqlite_path:
+        from sqlite_backend import SQLiteDatabaseManager
+        return lambda: SQLiteDatabaseManager(sqlite_path, create_tables=False, cache=cache)
+    return lambda: DatabaseManager(create_tables=False, cache=cache)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local JSON HTTP service for the bank database")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--pool-size", type=int, default=8)
+    parser.add_argument("--sqlite", metavar="PATH", help="serve a SQLite stand-in instead of MySQL")
+    parser.add_argument("--cache-ttl", type=float, default=0.0,
+                        help="seconds to cache list/search results; writes through other clients "
+                             "are only seen after this long (default: no cache)")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    # Create the schema once up front; pooled connections skip it
+    if args.sqlite:
+        from sqlite_backend import SQLiteDatabaseManager
+        SQLiteDatabaseManager(args.sqlite).close()
+    else:
+        DatabaseManager().close()
+
+    cache = QueryCache(ttl=args.cache_ttl) if args.cache_ttl > 0 else None
+    pool = ConnectionPool(make_factory(args.sqlite, cache), args.pool_size)
+    server = ApiServer((args.host, args.port), pool, args.verbose, cache)
+    print(f"Serving on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import mmap
+import os
+import struct
+from array import array
+from collections.abc import Sequence
+from paths import user_dir
+
+MAGIC = b"BMSNAP01"
+# magic, change seq the rows are current to, branch scope (-1 = all), row count, source length
+HEADER = struct.Struct("<8sqqqI")
+FIELD_SEP = "\x1f"
+
+
+class SnapshotRows(Sequence):
+    """Rows of a snapshot file, decoded from the memory map only when read
+
+    Each row is (item id, treeview values). Slicing decodes just that slice, so
+    the first screenful shows before the rest of the file has been touched.
+    """
+
+    def __init__(self, mapped, offsets, data_start):
+        self._mapped = mapped
+        self._offsets = offsets
+        self._data_start = data_start
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def _decode(self, index):
+        start = self._data_start + self._offsets[index]
+        end = self._data_start + self._offsets[index + 1]
+        fields = self._mapped[start:end].decode("utf-8").split(FIELD_SEP)
+        return fields[0], tuple(fields[1:])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._decode(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self._decode(index)
+
+    def close(self):
+        self._offsets = array("Q", [0])
+        self._mapped.close()
+
+
+class SnapshotStore:
+    """One snapshot file per list view, written atomically and read through mmap
+
+    A snapshot remembers the change seq its rows were current to, the branch the
+    list was scoped to and the database it came from; load() ignores snapshots
+    that do not match.
+    """
+
+    def __init__(self, directory, source):
+        self.directory = directory
+        self.source = source
+
+    @classmethod
+    def from_env(cls, source):
+        "Store in DB_SNAPSHOT_DIR (default: the user's cache dir), or None when that is set empty"
+        directory = os.getenv("DB_SNAPSHOT_DIR", os.path.join(user_dir("cache"), "snapshots"))
+        return cls(directory, source) if directory else None
+
+    def _path(self, view):
+        return os.path.join(self.directory, f"{view}.snap")
+
+    def save(self, view, seq, scope, rows):
+        "Write rows of (item id, values) for view; values are stored as text"
+        encoded = [FIELD_SEP.join([str(iid)] + ["" if v is None else str(v) for v in values]).encode("utf-8")
+                   for iid, values in rows]
+        offsets = array("Q", [0])
+        for row in encoded:
+            offsets.append(offsets[-1] + len(row))
+        source = self.source.encode("utf-8")
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(view)
+        temp = path + ".tmp"
+        with open(temp, "wb") as out:
+            out.write(HEADER.pack(MAGIC, seq, -1 if scope is None else scope, len(encoded), len(source)))
+            out.write(source)
+            offsets.tofile(out)
+            out.write(b"".join(encoded))
+        os.replace(temp, path)                  # Readers never see a half-written file
+
+    def load(self, view, scope):
+        "(seq, SnapshotRows) for a matching snapshot, else None"
+        try:
+            with open(self._path(view), "rb") as snap:
+                mapped = mmap.mmap(snap.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):           # Missing, unreadable or empty
+            return None
+        try:
+            magic, seq, stored_scope, count, source_length = HEADER.unpack_from(mapped, 0)
+            position = HEADER.size
+            source = mapped[position:position + source_length].decode("utf-8")
+            position += source_length
+            if (magic != MAGIC or source != self.source
+                    or stored_scope != (-1 if scope is None else scope)):
+                mapped.close()
+                return None
+            offsets = array("Q")
+            offsets.frombytes(mapped[position:position + 8 * (count + 1)])
+            data_start = position + 8 * (count + 1)
+            if len(offsets) != count + 1 or data_start + offsets[-1] > len(mapped):
+                raise ValueError("truncated snapshot")
+            return seq, SnapshotRows(mapped, offsets, data_start)
+        except (struct.error, UnicodeDecodeError, ValueError):
+            mapped.close()
+            return None
@@ -0,0 +1,119 @@
+import argparse
+import contextlib
+import statistics
+import sys
+import time
+import tkinter as tk
+from memdiag import MemoryDiagnostics, current_rss
+
+
+#Each role's screen and the list it loads
+SCREENS = (("_show_admin_interface", "branch_tree"),
+           ("_show_employee_interface", "employee_tree"),
+           ("_show_customer_interface", "customer_tree"))
+
+
+def pump(root, app, timeout=30.0):
+    """Run the event loop until the open screen's list queries are delivered and its fills finish
+
+    Returns False on timeout. Employee and customer lists load on a worker
+    thread and arrive through after() polling, so idle fillers alone do not
+    mean the lists are in.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        root.update()
+        fillers = [getattr(app, name, None) for name in ("branch_filler", "employee_filler", "customer_filler")]
+        if not app._queries and not any(filler is not None and filler.busy for filler in fillers):
+            return True
+        time.sleep(0.001)
+    return False
+
+
+def run_cycles(app, root, cycles, sample_every, log=print):
+    """Cycle login -> each role's screen -> logout, sampling RSS after each cycle
+
+    Raises RuntimeError when a screen's list does not load, since a run
+    that never fills the lists says nothing about their memory.
+    """
+    samples = []
+    for cycle in range(1, cycles + 1):
+        for show, tree in SCREENS:
+            getattr(app, show)()
+            if not pump(root, app):
+                raise RuntimeError(f"{show} was still loading after 30s")
+            if not getattr(app, tree).get_children():
+                raise RuntimeError(f"{tree} is empty after {show}")
+            app._setup_login_interface()
+            pump(root, app)
+        if cycle % sample_every == 0:
+            rss = current_rss()
+            samples.append(rss)
+            log(f"cycle {cycle}: RSS {rss / 1048576:.1f} MB")
+    return samples
+
+
+def is_growing(samples, warmup, tolerance_mb):
+    """Whether RSS after warm-up keeps rising instead of levelling off
+
+    Compares the median of the first and last thirds of the post-warm-up
+    samples, so single allocator spikes do not fail the run.
+    """
+    steady = samples[warmup:]
+    if len(steady) < 3:
+        return False, 0.0
+    third = max(1, len(steady) // 3)
+    growth = statistics.median(steady[-third:]) - statistics.median(steady[:third])
+    return growth > tolerance_mb * 1048576, growth / 1048576
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cycle login/load/logout and fail if RSS keeps growing")
+    parser.add_argument("--cycles", type=int, default=2000)
+    parser.add_argument("--sample-every", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=3, help="samples ignored while caches fill")
+    parser.add_argument("--tolerance-mb", type=float, default=20.0)
+    parser.add_argument("--rows", type=int, default=2000, help="customers seeded into the SQLite stand-in")
+    parser.add_argument("--mysql", action="store_true", help="use the configured MySQL database instead")
+    parser.add_argument("--trace", action="store_true", help="also print tracemalloc diffs per screen")
+    args = parser.parse_args(argv)
+
+    if current_rss() is None:
+        print("Cannot read RSS on this platform", file=sys.stderr)
+        return 2
+
+    from interface import BankManagementApp
+    with contextlib.ExitStack() as stack:
+        if args.mysql:
+            db, db_factory = None, None
+        else:
+            from loadgen import seed_standin
+            from sqlite_backend import SQLiteDatabaseManager
+            path = stack.enter_context(seed_standin(args.rows, prefix="bank-soak-", employees=200))
+            db = SQLiteDatabaseManager(path)
+            db_factory = lambda: SQLiteDatabaseManager(path, create_tables=False)
+
+        root = tk.Tk()
+        app = BankManagementApp(root, db=db, db_factory=db_factory)
+        if args.trace:
+            app.memory = MemoryDiagnostics(enabled=True)
+        try:
+            samples = run_cycles(app, root, args.cycles, args.sample_every)
+        except RuntimeError as e:
+            print(f"FAIL: {e}")
+            return 1
+        finally:
+            app.shutdown()
+            root.destroy()
+
+    growing, growth_mb = is_growing(samples, args.warmup, args.tolerance_mb)
+    print(f"RSS growth after warm-up: {growth_mb:.1f} MB (tolerance {args.tolerance_mb} MB)")
+    if growing:
+        print("FAIL: memory keeps growing across screen switches")
+        return 1
+    print("PASS")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
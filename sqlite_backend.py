@@ -0,0 +1,335 @@
+import os
+import re
+import sqlite3
+import threading
+from configuration import DatabaseManager, Error, ARCHIVE_POLICIES, PRIMARY_KEYS
+
+# MySQL spellings used by DatabaseManager and their SQLite equivalents
+_REWRITES = [
+    (re.compile(r"\bfor update\b", re.I), ""),
+    (re.compile(r"curdate\(\) - interval %s day", re.I), "date('now', '-' || %s || ' days')"),
+    (re.compile(r"now\(\) - interval %s day", re.I), "datetime('now', '-' || %s || ' days')"),
+    (re.compile(r"curdate\(\)", re.I), "date('now')"),
+    (re.compile(r"now\(\)", re.I), "datetime('now')"),
+    (re.compile(r"%s"), "?"),
+]
+
+
+def _translate(query, _cache={}):
+    translated = _cache.get(query)
+    if translated is None:
+        translated = query
+        for pattern, replacement in _REWRITES:
+            translated = pattern.sub(replacement, translated)
+        _cache[query] = translated
+    return translated
+
+
+def _dict_row(cursor, row):
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+class _SQLiteCursor:
+    """Cursor with the mysql.connector surface DatabaseManager relies on"""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, query, params=()):
+        try:
+            self._cursor.execute(_translate(query), tuple(params))
+        except sqlite3.Error as e:
+            raise Error(msg=str(e)) from e
+
+    def executemany(self, query, seq_params):
+        try:
+            self._cursor.executemany(_translate(query), [tuple(p) for p in seq_params])
+        except sqlite3.Error as e:
+            raise Error(msg=str(e)) from e
+
+    def fetchone(self):
+        return self._fetch(self._cursor.fetchone)
+
+    def fetchall(self):
+        return self._fetch(self._cursor.fetchall)
+
+    def fetchmany(self, size):
+        return self._fetch(self._cursor.fetchmany, size)
+
+    def _fetch(self, fetch, *args):
+        # Rows are stepped through lazily, so an interrupt() can surface here too
+        try:
+            return fetch(*args)
+        except sqlite3.Error as e:
+            raise Error(msg=str(e)) from e
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def close(self):
+        self._cursor.close()
+
+
+class _SQLiteConnection:
+    """Connection with the mysql.connector surface DatabaseManager relies on"""
+
+    def __init__(self, path):
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._connection.row_factory = _dict_row
+        self._connection.execute("PRAGMA journal_mode=WAL")      # Readers do not block the writer
+        self._connected = True
+
+    def cursor(self, dictionary=True):
+        return _SQLiteCursor(self._connection.cursor())
+
+    def commit(self):
+        self._connection.commit()
+
+    def rollback(self):
+        self._connection.rollback()
+
+    def is_connected(self):
+        return self._connected
+
+    def interrupt(self):
+        self._connection.interrupt()
+
+    def close(self):
+        self._connection.close()
+        self._connected = False
+
+
+class SQLiteDatabaseManager(DatabaseManager):
+    """DatabaseManager on a local SQLite file, a stand-in for MySQL in load tests and tools
+
+    Queries are shared with the MySQL implementation; only the schema and the
+    statements SQLite cannot express the same way are overridden.
+    """
+
+    _schema_lock = threading.Lock()
+
+    def __init__(self, path=None, create_tables=True, cache=None):
+        self.path = path or os.getenv("DB_SQLITE_PATH", "bank.sqlite3")
+        self._init_hooks(cache)
+        try:
+            self.connection = _SQLiteConnection(self.path)
+            self.cursor = self.connection.cursor(dictionary=True)
+            if create_tables:
+                with self._schema_lock:
+                    self._create_table()
+        except sqlite3.Error as e:
+            print(f"Error opening SQLite database: {e}")
+            raise Error(msg=str(e)) from e
+
+    def _create_table(self):
+        statements = [
+            """create table if not exists contacts(
+                id integer primary key autoincrement,
+                name varchar(100) not null,
+                gender varchar(20),
+                phone varchar(20),
+                email varchar(100),
+                address varchar(200),
+                created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                phone_norm varchar(15),
+                email_norm varchar(100)
+            )""",
+            """create table if not exists branches(
+                branch_id integer primary key autoincrement,
+                branch_name varchar(100) not null,
+                branch_address varchar(200),
+                branch_city varchar(100),
+                branch_state varchar(100),
+                branch_zip varchar(10),
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )""",
+            """create table if not exists employees(
+                emp_id integer primary key autoincrement,
+                emp_name varchar(100) not null,
+                emp_dob date,
+                emp_phone varchar(20),
+                emp_email varchar(100),
+                emp_position varchar(50),
+                branch_id int,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                phone_norm varchar(15),
+                email_norm varchar(100)
+            )""",
+            """create table if not exists customers(
+                cust_id integer primary key autoincrement,
+                name varchar(100) not null,
+                dob date,
+                phone varchar(20),
+                email varchar(100),
+                address varchar(200),
+                branch_id int,
+                created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                phone_norm varchar(15),
+                email_norm varchar(100)
+            )""",
+            """create table if not exists change_log(
+                seq integer primary key autoincrement,
+                table_name varchar(30) not null,
+                row_id int not null,
+                op char(1) not null,
+                changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )""",
+            """create table if not exists branch_stats(
+                branch_id int primary key,
+                employee_count int not null default 0,
+                customer_count int not null default 0
+            )""",
+            """create table if not exists branch_daily_new_customers(
+                branch_id int not null,
+                day date not null,
+                new_customers int not null default 0,
+                primary key (branch_id, day)
+            )""",
+            """create table if not exists audit_log(
+                id integer primary key autoincrement,
+                logged_at TIMESTAMP not null,
+                actor varchar(100),
+                table_name varchar(30) not null,
+                row_id int not null,
+                op char(1) not null,
+                before_data text,
+                after_data text
+            )""",
+            "create index if not exists idx_audit_log_row on audit_log (table_name, row_id)",
+            "create index if not exists idx_employees_branch on employees (branch_id)",
+            "create index if not exists idx_customers_branch on customers (branch_id)",
+            "create index if not exists idx_employees_branch_name on employees (branch_id, emp_name)",
+            "create index if not exists idx_customers_branch_name on customers (branch_id, name)",
+            "create index if not exists idx_customers_name on customers (name)",
+            "create index if not exists idx_customers_dob on customers (dob)",
+            "create index if not exists idx_customers_created on customers (created_date)",
+            "create index if not exists idx_employees_name on employees (emp_name)",
+            "create index if not exists idx_employees_position on employees (emp_position)",
+            "create index if not exists idx_employees_dob on employees (emp_dob)",
+            "create index if not exists idx_branches_city on branches (branch_city)",
+        ]
+        # LIKE is case-insensitive here as in MySQL, and only uses NOCASE indexes
+        for table, column in (("customers", "name"), ("employees", "emp_name"),
+                              ("employees", "emp_position"), ("branches", "branch_city")):
+            statements.append(f"create index if not exists idx_{table}_{column}_nocase "
+                              f"on {table} ({column} collate nocase)")
+        for table in ("contacts", "employees", "customers"):
+            statements.append(f"create index if not exists idx_{table}_phone_norm on {table} (phone_norm)")
+            statements.append(f"create index if not exists idx_{table}_email_norm on {table} (email_norm)")
+        for statement in statements:
+            self.cursor.execute(statement)
+        for table in ARCHIVE_POLICIES:
+            archive = f"{table}_archive"
+            self.cursor.execute(f"create table if not exists {archive} as SELECT * from {table} where 0")
+            if "archived_at" not in self._table_columns(archive):
+                self.cursor.execute(f"alter table {archive} add column archived_at TIMESTAMP")
+            key = PRIMARY_KEYS[table]
+            self.cursor.execute(f"create index if not exists idx_{archive}_{key} on {archive} ({key})")
+        self.connection.commit()
+
+    def partition_by_branch(self, table, partitions=16):
+        print("SQLite has no table partitioning; the (branch_id, name) indexes serve branch-scoped queries")
+        return False
+
+    def explain_filter(self, table, text):
+        "Same shape as DatabaseManager.explain_filter, from EXPLAIN QUERY PLAN"
+        query, params = self._filter_query(table, text)
+        steps = []
+        for step in self._fetch_all(f"EXPLAIN QUERY PLAN {query}", params):
+            words = step["detail"].split()
+            # SCAN/SEARCH lines name a table; the rest are temp b-trees and subquery markers
+            if len(words) < 2 or words[0] not in ("SCAN", "SEARCH"):
+                continue
+            index = re.search(r"USING (?:COVERING |INTEGER PRIMARY KEY)?(?:INDEX (\w+))?", step["detail"])
+            steps.append({"table": words[1], "access": words[0],
+                          "index": index.group(1) if index else None, "full_scan": words[0] == "SCAN"})
+        return steps
+
+    def _query_killer(self, cursor):
+        "interrupt() stops whatever statement the connection is running; it is safe from any thread"
+        return self.connection.interrupt
+
+    def _table_columns(self, table):
+        self.cursor.execute(f"PRAGMA table_info({table})")
+        return [row["name"] for row in self.cursor.fetchall()]
+
+    def _bump_branch_stats(self, branch_id, employees=0, customers=0):
+        if branch_id in (None, ""):
+            return
+        self.cursor.execute("""
+            INSERT INTO branch_stats(branch_id, employee_count, customer_count)
+            VALUES(%s, %s, %s)
+            on conflict(branch_id) do update set
+                employee_count = employee_count + excluded.employee_count,
+                customer_count = customer_count + excluded.customer_count
+        """, (branch_id, employees, customers))
+
+    def _bump_new_customers(self, branch_id, delta, day=None):
+        if branch_id in (None, ""):
+            return
+        self.cursor.execute("""
+            INSERT INTO branch_daily_new_customers(branch_id, day, new_customers)
+            VALUES(%s, coalesce(%s, date('now')), %s)
+            on conflict(branch_id, day) do update set
+                new_customers = new_customers + excluded.new_customers
+        """, (branch_id, day, delta))
+
+    def merge_contacts(self, keep_id, drop_id):
+        try:
+            before = self._audit_before("contacts", keep_id)
+            self.cursor.execute("""
+                UPDATE contacts set
+                    gender = coalesce(nullif(contacts.gender, ''), d.gender),
+                    phone_norm = coalesce(contacts.phone_norm, d.phone_norm),
+                    email_norm = coalesce(contacts.email_norm, d.email_norm),
+                    phone = coalesce(nullif(contacts.phone, ''), d.phone),
+                    email = coalesce(nullif(contacts.email, ''), d.email),
+                    address = coalesce(nullif(contacts.address, ''), d.address)
+                from contacts d where d.id = %s and contacts.id = %s
+            """, (drop_id, keep_id))
+            if self.cursor.rowcount > 0:
+                self._log_change("contacts", keep_id, "U", before)
+            return self.delete_contact(drop_id)
+        except Error as e:
+            print(f"Error merging contacts: {e}")
+            self._rollback()
+            return False
+
+    def merge_customers(self, keep_id, drop_id):
+        try:
+            before = self._audit_before("customers", keep_id)
+            self.cursor.execute("""
+                UPDATE customers set
+                    dob = coalesce(customers.dob, d.dob),
+                    phone_norm = coalesce(customers.phone_norm, d.phone_norm),
+                    email_norm = coalesce(customers.email_norm, d.email_norm),
+                    phone = coalesce(nullif(customers.phone, ''), d.phone),
+                    email = coalesce(nullif(customers.email, ''), d.email),
+                    address = coalesce(nullif(customers.address, ''), d.address),
+                    branch_id = coalesce(customers.branch_id, d.branch_id),
+                    created_date = min(customers.created_date, d.created_date)
+                from customers d where d.cust_id = %s and customers.cust_id = %s
+            """, (drop_id, keep_id))
+            if self.cursor.rowcount > 0:
+                self._log_change("customers", keep_id, "U", before)
+            return self.delete_customer(drop_id)
+        except Error as e:
+            print(f"Error merging customers: {e}")
+            self._rollback()
+            return False
+
+    def close(self):
+        if hasattr(self, 'connection') and self.connection.is_connected():
+            self.cursor.close()
+            self.connection.close()
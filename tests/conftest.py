@@ -0,0 +1,15 @@
+import pytest
+from sqlite_backend import SQLiteDatabaseManager
+
+
+@pytest.fixture
+def db(tmp_path):
+    "An empty SQLite stand-in, without a query cache"
+    db = SQLiteDatabaseManager(str(tmp_path / "bank.sqlite3"))
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def branch_id(db):
+    return db.insert_branch("Main Branch", "1 MG Road", "Pune", "MH", "411001")
@@ -0,0 +1,34 @@
+from archive import archive_table
+
+
+def add_customers(db, branch_id, names, created):
+    ids = [db.insert_customer(name, "1990-01-01", None, None, None, branch_id) for name in names]
+    db.cursor.execute(f"UPDATE customers set created_date = %s where cust_id in ({', '.join(['%s'] * len(ids))})",
+                      (created, *ids))
+    db.connection.commit()
+    return ids
+
+
+def test_aged_rows_move_to_the_archive_in_batches(db, branch_id):
+    old = add_customers(db, branch_id, ["Asha Rao", "Ravi Das", "Priya Iyer"], "2015-01-01 10:00:00")
+    young = add_customers(db, branch_id, ["Asha Sharma"], "2099-01-01 10:00:00")
+    assert archive_table(db, "customers", 730, batch_size=2, pause=0) == 3
+    assert [row["cust_id"] for row in db.get_all_customers()] == young
+    archived = db._fetch_all("SELECT cust_id, archived_at from customers_archive order by cust_id")
+    assert [row["cust_id"] for row in archived] == old and all(row["archived_at"] for row in archived)
+    stats = db._fetch_one("SELECT customer_count from branch_stats where branch_id = %s", (branch_id,))
+    assert stats["customer_count"] == 1         # branch_stats counts the hot table only
+
+
+def test_archived_rows_are_searched_only_when_asked(db, branch_id):
+    add_customers(db, branch_id, ["Asha Rao"], "2015-01-01 10:00:00")
+    archive_table(db, "customers", 730, pause=0)
+    assert db.search_customers("asha") == []
+    [row] = db.search_customers("asha", include_archive=True)
+    assert row["name"] == "Asha Rao" and row["archived_at"]
+
+
+def test_max_rows_caps_one_run(db, branch_id):
+    add_customers(db, branch_id, ["Asha Rao", "Ravi Das", "Priya Iyer"], "2015-01-01 10:00:00")
+    assert archive_table(db, "customers", 730, batch_size=2, pause=0, max_rows=1) == 1
+    assert len(db.get_all_customers()) == 2
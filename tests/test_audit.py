@@ -0,0 +1,78 @@
+import glob
+import json
+import os
+import pytest
+from audit import AuditEntry, AuditLog, replay_spill
+from sqlite_backend import SQLiteDatabaseManager
+
+
+def audit_rows(db):
+    return db._fetch_all("SELECT actor, table_name, row_id, op, before_data, after_data from audit_log order by id")
+
+
+@pytest.fixture
+def factory(db):
+    return lambda: SQLiteDatabaseManager(db.path, create_tables=False)
+
+
+def unreachable():
+    raise OSError("database unreachable")
+
+
+def test_committed_writes_are_audited_with_before_and_after(db, branch_id, factory):
+    db.audit = AuditLog(db_factory=factory, flush_interval=0.05).start()
+    db.audit_actor = "teller"
+    cust_id = db.insert_customer("Asha Rao", "1990-01-01", "9876543210", None, None, branch_id)
+    db.update_customer(cust_id, "Asha Sharma", "1990-01-01", "9876543210", None, None, branch_id)
+    db.audit.close()
+    inserted, updated = [row for row in audit_rows(db) if row["table_name"] == "customers"]
+    assert (inserted["actor"], inserted["op"], inserted["before_data"]) == ("teller", "I", None)
+    assert json.loads(updated["before_data"])["name"] == "Asha Rao"
+    assert json.loads(updated["after_data"])["name"] == "Asha Sharma"
+    assert db.audit.written == 2
+
+
+def test_unreachable_database_spills_and_replay_loads_it(db, tmp_path):
+    spill = str(tmp_path / "state" / "audit_spill.jsonl")
+    audit = AuditLog(db_factory=unreachable, spill_path=spill)
+    for row_id in range(1, 4):
+        audit.log("teller", "contacts", row_id, "U", {"name": "old"}, {"name": "new"})
+    audit.close()                               # Never started: close() writes what is queued
+    assert audit.spilled == 3 and os.path.exists(spill)
+    assert replay_spill(db, spill) == 3
+    assert [row["row_id"] for row in audit_rows(db)] == [1, 2, 3]
+    assert not os.path.exists(spill)
+
+
+def test_full_queue_spills_instead_of_blocking(tmp_path):
+    audit = AuditLog(db_factory=unreachable, max_queue=1, spill_path=str(tmp_path / "spill.jsonl"))
+    audit.log("teller", "contacts", 1, "D", {"name": "a"}, None)
+    audit.log("teller", "contacts", 2, "D", {"name": "b"}, None)
+    assert audit.spilled == 1
+    audit.close()
+
+
+def test_rotated_spill_files_are_kept_and_replayed_oldest_first(db, tmp_path):
+    spill = str(tmp_path / "spill.jsonl")
+    audit = AuditLog(db_factory=unreachable, spill_path=spill, spill_max_bytes=300)
+    entries = [AuditEntry("teller", "contacts", row_id, "U", {"name": "x" * 40}, None) for row_id in range(1, 13)]
+    audit._spill_entries(entries)
+    audit.close()
+    assert len(glob.glob(spill + ".*")) >= 3    # Nothing rotated out was deleted
+    assert replay_spill(db, spill) == 12
+    assert [row["row_id"] for row in audit_rows(db)] == list(range(1, 13))
+    assert glob.glob(spill + "*") == []
+
+
+def test_partial_contact_update_locks_the_row_once(db, factory):
+    db.audit = AuditLog(db_factory=factory, flush_interval=0.05).start()
+    contact_id = db.create_contact("Asha Rao", phone="9876543210")
+    reads = []
+    fetch_one = db._fetch_one
+    db._fetch_one = lambda query, params=(): reads.append(query) or fetch_one(query, params)
+    assert db.update_contact(contact_id, email="asha@example.com")
+    db.audit.close()
+    assert sum("for update" in query for query in reads) == 1
+    row = audit_rows(db)[-1]
+    assert json.loads(row["before_data"])["email"] is None
+    assert json.loads(row["after_data"])["email"] == "asha@example.com"
@@ -0,0 +1,60 @@
+import pytest
+
+
+def stats(db):
+    rows = db._fetch_all("SELECT branch_id, employee_count, customer_count from branch_stats order by branch_id")
+    return {row["branch_id"]: (row["employee_count"], row["customer_count"]) for row in rows}
+
+
+def new_customers(db):
+    rows = db._fetch_all("SELECT branch_id, sum(new_customers) as total from branch_daily_new_customers "
+                         "group by branch_id order by branch_id")
+    return {row["branch_id"]: row["total"] for row in rows if row["total"]}
+
+
+@pytest.fixture
+def branches(db, branch_id):
+    other = db.insert_branch("City Branch", "2 FC Road", "Pune", "MH", "411004")
+    customers = [db.insert_customer(f"Customer {i}", "1990-01-01", None, None, None, branch_id) for i in range(5)]
+    employees = [db.insert_employee(f"Employee {i}", "1980-01-01", None, None, "Teller", branch_id) for i in range(3)]
+    return branch_id, other, customers, employees
+
+
+def test_reassign_moves_rows_and_counters(db, branches):
+    main, other, customers, employees = branches
+    db.reassign_branch("customers", customers[:2], other)
+    # Already in the target branch: moved again, counted once
+    assert sorted(db.reassign_branch("customers", customers[:3], other, chunk_size=2)) == customers[:3]
+    db.reassign_branch("employees", employees[:1], other)
+    assert stats(db) == {main: (2, 2), other: (1, 3)}
+    assert new_customers(db) == {main: 2, other: 3}
+    assert {row["cust_id"] for row in db.get_customers_by_branch(other)} == set(customers[:3])
+
+
+def test_delete_many_skips_missing_ids_and_updates_counters(db, branches):
+    main, _, customers, employees = branches
+    assert sorted(db.delete_many("customers", customers[:3] + [999], chunk_size=2)) == customers[:3]
+    assert db.delete_many("employees", employees) == employees
+    assert stats(db)[main] == (0, 2)
+    assert new_customers(db) == {main: 2}
+    deletes = db._fetch_all("SELECT row_id from change_log where table_name = 'customers' and op = 'D'")
+    assert sorted(row["row_id"] for row in deletes) == customers[:3]
+
+
+def test_counters_match_a_full_reconcile(db, branches):
+    main, other, customers, employees = branches
+    db.reassign_branch("customers", customers[:2], other)
+    db.delete_many("customers", customers[1:3])
+    db.bulk_update("employees", employees[1:], {"branch_id": other, "emp_position": "Clerk"})
+    incremental = stats(db)
+    db.reconcile_branch_stats()
+    assert {branch: counts for branch, counts in stats(db).items() if any(counts)} == \
+        {branch: counts for branch, counts in incremental.items() if any(counts)}
+
+
+def test_bulk_update_normalizes_and_rejects_unknown_columns(db, branches):
+    _, _, customers, _ = branches
+    db.bulk_update("customers", customers[:2], {"email": " Shared@Example.com "})
+    assert [row["cust_id"] for row in db.find_customers_by_email("shared@example.com")] == customers[:2]
+    with pytest.raises(ValueError):
+        db.bulk_update("customers", customers, {"cust_id": 1})
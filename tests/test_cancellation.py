@@ -0,0 +1,59 @@
+import threading
+import pytest
+from mysql.connector import Error
+from cancellation import CancelToken, QueryCancelled
+
+#Counts to a billion: minutes of work unless it is interrupted
+SLOW_QUERY = """WITH RECURSIVE numbers(n) AS (SELECT 1 UNION ALL SELECT n + 1 from numbers where n < 1000000000)
+SELECT count(*) as total from numbers"""
+
+
+def test_a_cancelled_token_stops_the_next_read_before_it_runs(db, branch_id):
+    token = CancelToken()
+    token.cancel()
+    with pytest.raises(QueryCancelled), db.cancellable(token):
+        db.get_all_branches()
+    assert db._cancel_token is None
+    assert [row["branch_id"] for row in db.get_all_branches()] == [branch_id]
+
+
+def test_cancel_from_another_thread_interrupts_a_running_read(db, branch_id):
+    token = CancelToken()
+    timer = threading.Timer(0.2, token.cancel)
+    timer.start()
+    try:
+        with pytest.raises(QueryCancelled), db.cancellable(token):
+            db._fetch_all(SLOW_QUERY)
+    finally:
+        timer.cancel()
+    # The connection is still usable afterwards
+    assert [row["branch_id"] for row in db.get_all_branches()] == [branch_id]
+
+
+def test_a_late_cancel_does_not_reach_the_next_statement():
+    kills = []
+    token = CancelToken()
+    token.arm(lambda: kills.append(1))
+    token.disarm()
+    token.cancel()
+    assert token.cancelled and kills == []
+
+
+def test_a_failing_killer_still_marks_the_token_cancelled():
+    def killer():
+        raise Error(msg="side connection refused")
+    token = CancelToken()
+    token.arm(killer)
+    token.cancel()
+    assert token.cancelled
+    with pytest.raises(QueryCancelled):
+        token.arm(killer)
+
+
+def test_cancellable_blocks_nest(db):
+    outer, inner = CancelToken(), CancelToken()
+    with db.cancellable(outer):
+        with db.cancellable(inner):
+            assert db._cancel_token is inner
+        assert db._cancel_token is outer
+    assert db._cancel_token is None
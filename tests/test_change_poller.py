@@ -0,0 +1,44 @@
+from change_poller import ChangePoller
+from configuration import DatabaseManager
+
+
+def test_poll_queues_net_changes_per_table(db, branch_id):
+    poller = ChangePoller(db.get_latest_change_seq(), db_factory=lambda: db)
+    kept = db.insert_customer("Asha Rao", "1990-01-01", "9876543210", None, None, branch_id)
+    dropped = db.insert_customer("Ravi Das", "1985-01-01", "9876543211", None, None, branch_id)
+    db.update_customer(kept, "Asha Sharma", "1990-01-01", "9876543210", None, None, branch_id)
+    db.delete_customer(dropped)
+    poller.poll_once(db)
+    [change_set] = poller.drain()
+    assert change_set.table == "customers"
+    assert [row["name"] for row in change_set.rows] == ["Asha Sharma"]
+    assert change_set.deleted_ids == [dropped]
+    assert poller.watermark == db.get_latest_change_seq()
+
+
+class Unreachable:
+    def get_changes_since(self, seq, limit=1000):
+        return None
+
+    def close(self):
+        pass
+
+
+def test_unreachable_database_holds_the_watermark():
+    poller = ChangePoller(7, db_factory=Unreachable)
+    poller.poll_once(Unreachable())
+    assert poller.watermark == 7 and poller.drain() == []
+    poller.replay(3).join()
+    assert poller.drain() == []
+
+
+def test_offline_manager_reads_no_change_log(monkeypatch):
+    # Nothing listens on port 1, so the first connection fails and the breaker opens
+    monkeypatch.setenv("DB_Host", "127.0.0.1")
+    monkeypatch.setenv("DB_Port", "1")
+    monkeypatch.setenv("DB_RETRIES", "1")
+    monkeypatch.setenv("DB_BREAKER_PROBE_INTERVAL", "3600")
+    db = DatabaseManager(allow_offline=True)
+    assert db.connection is None
+    assert db.get_latest_change_seq() is None
+    assert db.get_changes_since(0) is None
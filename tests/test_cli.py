@@ -0,0 +1,51 @@
+import io
+import json
+import pytest
+from cli import OperationFailed, run_batch, run_operation
+
+
+def batch(db, *ops):
+    out = io.StringIO()
+    failures = run_batch(db, [json.dumps(op) for op in ops], out)
+    return failures, [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+def test_batch_runs_every_line_on_one_connection(db, branch_id):
+    failures, results = batch(
+        db,
+        {"entity": "customers", "action": "create",
+         "fields": {"name": "Asha Rao", "dob": "1990-04-01", "phone": "9876543210", "branch_id": branch_id}},
+        {"entity": "customers", "action": "update", "id": 1, "fields": {"email": "asha@example.com"}},
+        {"entity": "customers", "action": "search", "term": "rao"},
+    )
+    assert failures == 0
+    assert results[0] == {"ok": True, "result": {"cust_id": 1}}
+    assert results[1] == {"ok": True, "result": {"updated": True}}
+    [found] = results[2]["result"]
+    # The update was partial: fields it did not name kept their values
+    assert (found["email"], found["phone"], found["branch_id"]) == ("asha@example.com", "9876543210", branch_id)
+
+
+def test_bad_lines_are_reported_and_the_rest_still_run(db):
+    out = io.StringIO()
+    failures = run_batch(db, ["not json", json.dumps({"entity": "contacts", "action": "list"})], out)
+    results = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert failures == 1
+    assert results[0]["ok"] is False
+    assert results[1] == {"ok": True, "result": []}
+
+
+def test_refused_create_is_a_failure(db):
+    # name is NOT NULL, so the insert fails and returns no id
+    failures, results = batch(db, {"entity": "contacts", "action": "create", "fields": {"phone": "9876543210"}})
+    assert failures == 1
+    assert results[0]["ok"] is False
+    with pytest.raises(OperationFailed):
+        run_operation(db, "contacts", "create", fields={"phone": "9876543210"})
+
+
+def test_unknown_fields_and_actions_are_rejected(db):
+    with pytest.raises(ValueError):
+        run_operation(db, "customers", "create", fields={"colour": "red"})
+    with pytest.raises(ValueError):
+        run_operation(db, "contacts", "filter", term="name:Asha")
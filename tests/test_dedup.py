@@ -0,0 +1,42 @@
+from dedup import blocking_keys, find_duplicates, load_records, score_pair
+
+
+def test_blocking_keys_meet_across_swapped_names_and_email_tags():
+    left = blocking_keys((1, "rahul sharma", "919876543210", "rahul+bank@example.com"))
+    right = blocking_keys((2, "sharma rahul", None, "rahul@mail.example"))
+    assert "p:919876543210" in left
+    assert set(left) & set(right) >= {"e:rahul", next(k for k in left if k.startswith("n:"))}
+
+
+def test_score_counts_agreeing_fields():
+    score, reasons = score_pair((1, "rahul sharma", "919876543210", None),
+                                (2, "sharma rahul", "919876543210", None))
+    assert score > 0.8 and reasons == ["name 1.00", "phone"]
+
+
+def test_duplicates_are_found_and_ranked(db, branch_id):
+    db.insert_customer("Rahul Sharma", "1990-01-01", "98765 43210", "rahul@example.com", None, branch_id)
+    db.insert_customer("Sharma Rahul", None, "+91 98765-43210", "RAHUL@example.com", None, branch_id)
+    db.insert_customer("Rahul Sarma", "1990-01-01", None, None, None, branch_id)
+    db.insert_customer("Priya Iyer", "1992-02-02", "9123456780", "priya@example.com", None, branch_id)
+    pairs = find_duplicates(load_records(db, "customers"), workers=1)
+    assert [(pair.left[0], pair.right[0]) for pair in pairs][0] in ((1, 2), (2, 1))
+    assert all(4 not in (pair.left[0], pair.right[0]) for pair in pairs)
+
+
+def test_oversized_blocks_compare_only_sorted_neighbours():
+    # 30 records in one name block: 435 pairs in full, at most 29 + 28 within a window of 3
+    records = [(i, "asha sharma", None, None) for i in range(1, 31)]
+    assert len(find_duplicates(records, threshold=0.5, window=50, workers=1)) == 435
+    assert 0 < len(find_duplicates(records, threshold=0.5, window=3, workers=1)) <= 57
+
+
+def test_merge_fills_empty_fields_and_deletes_the_duplicate(db, branch_id):
+    keep = db.insert_customer("Rahul Sharma", "1990-01-01", "9876543210", None, None, branch_id)
+    drop = db.insert_customer("Sharma Rahul", None, None, "rahul@example.com", "2 Park St", branch_id)
+    assert db.merge_customers(keep, drop)
+    kept = db.get_customer_by_id(keep)
+    assert (kept["email"], kept["address"], kept["dob"]) == ("rahul@example.com", "2 Park St", "1990-01-01")
+    assert db.get_customer_by_id(drop) is None
+    stats = db._fetch_one("SELECT customer_count from branch_stats where branch_id = %s", (branch_id,))
+    assert stats["customer_count"] == 1
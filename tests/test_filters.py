@@ -0,0 +1,40 @@
+import pytest
+from filters import SAMPLE_FILTERS, FilterError, compile_filter, full_scans
+from loadgen import seed_standin
+from sqlite_backend import SQLiteDatabaseManager
+
+SAMPLES = [(table, text) for table, filters in SAMPLE_FILTERS.items() for text in filters]
+
+
+@pytest.fixture(scope="module")
+def db():
+    "A seeded SQLite stand-in with the same indexes as the MySQL schema"
+    with seed_standin(2000, prefix="bank-filters-test-") as path:
+        db = SQLiteDatabaseManager(path)
+        yield db
+        db.close()
+
+
+@pytest.mark.parametrize("table,text", SAMPLES)
+def test_sample_filter_uses_an_index(db, table, text):
+    plan = db.explain_filter(table, text)
+    assert plan, f"no plan steps for {table}: {text}"
+    assert not full_scans(plan), f"{table}: {text} scans {full_scans(plan)}"
+
+
+def test_missing_index_is_reported_as_full_scan():
+    #The check above is only worth something if a whole-table read is caught
+    with seed_standin(200, prefix="bank-filters-test-") as path:
+        db = SQLiteDatabaseManager(path)
+        try:
+            db.cursor.execute("drop index idx_customers_dob")
+            assert full_scans(db.explain_filter("customers", "dob:1990..1999"))
+        finally:
+            db.close()
+
+
+@pytest.mark.parametrize("table,text", [("customers", "colour:red"), ("customers", "dob:1990-13-01"),
+                                        ("employees", "branch:x")])
+def test_bad_filters_are_rejected(table, text):
+    with pytest.raises(FilterError):
+        compile_filter(table, text)
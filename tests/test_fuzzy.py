@@ -0,0 +1,54 @@
+import pytest
+from fuzzy import FuzzyNameIndex, edit_distance
+
+
+@pytest.mark.parametrize("a,b,distance", [("john", "john", 0), ("jonh", "john", 1), ("jon", "john", 1),
+                                          ("sharma", "shrama", 1), ("asha", "usha", 1), ("das", "dass", 1)])
+def test_edit_distance(a, b, distance):
+    assert edit_distance(a, b, 3) == distance
+
+
+def test_edit_distance_stops_past_the_limit():
+    assert edit_distance("alexander", "al", 2) == 3
+
+
+@pytest.fixture
+def index():
+    index = FuzzyNameIndex()
+    index.build([{"cust_id": 1, "name": "John Smith"}, {"cust_id": 2, "name": "Johnny Smyth"},
+                 {"cust_id": 3, "name": "Asha Sharma"}, {"cust_id": 4, "name": "Priya Iyer"}], "cust_id")
+    return index
+
+
+def test_typos_are_found_and_ranked_by_distance(index):
+    assert index.ready and len(index) == 4
+    assert index.search("Jonh Smith") == [(1, "John Smith", 1)]
+    assert [row_id for row_id, _, _ in index.search("smith")] == [1, 2]
+    assert index.search("Shrama") == [(3, "Asha Sharma", 1)]
+    assert index.search("nobody") == []
+
+
+def test_every_query_token_must_match(index):
+    assert index.search("asha iyer") == []
+
+
+def test_writes_update_the_index(index):
+    index.add(3, "Asha Rao")
+    assert index.search("sharma") == []
+    assert index.search("raw") == [(3, "Asha Rao", 1)]
+    index.remove(3)
+    assert index.search("asha") == []
+    assert "sharma" not in index._tokens and not any("sharma" in t for t in index._deletes.values())
+
+
+def test_writes_during_a_build_win_over_the_scan():
+    index = FuzzyNameIndex()
+
+    def rows():
+        yield {"cust_id": 1, "name": "Old Name"}
+        index.add(2, "Fresh Name")              # Written after the scan read row 2
+        yield {"cust_id": 2, "name": "Stale Name"}
+
+    index.build(rows(), "cust_id")
+    assert index.search("fresh") == [(2, "Fresh Name", 0)]
+    assert index.search("stale") == []
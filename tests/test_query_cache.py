@@ -0,0 +1,54 @@
+import pytest
+from query_cache import QueryCache
+from sqlite_backend import SQLiteDatabaseManager
+
+
+@pytest.fixture
+def cached_db(tmp_path):
+    db = SQLiteDatabaseManager(str(tmp_path / "bank.sqlite3"), cache=QueryCache())
+    branch_id = db.insert_branch("Main Branch", "1 MG Road", "Pune", "MH", "411001")
+    db.insert_employee("Ravi Rao", "1980-01-01", "9876543210", "ravi@example.com", "Manager", branch_id)
+    db.insert_customer("Asha Sharma", "1990-01-01", "9123456780", "asha@example.com", "2 Park St", branch_id)
+    yield db
+    db.close()
+
+
+def test_searches_share_an_entry_across_case_and_spaces(cached_db):
+    assert len(cached_db.search_customers("sharma")) == 1
+    assert len(cached_db.search_customers("  SHARMA ")) == 1
+    assert cached_db.cache.hits == 1
+
+
+def test_filters_are_keyed_by_case(cached_db):
+    # field:value compiles to a case-sensitive =, so a miss must not be served for another case
+    assert cached_db.filter_employees("position:manager") == []
+    assert len(cached_db.filter_employees("position:Manager")) == 1
+    assert cached_db.cache.hits == 0
+
+
+def test_write_drops_entries_of_the_table(cached_db):
+    assert len(cached_db.search_customers("sharma")) == 1
+    cached_db.insert_customer("Ravi Sharma", "1985-05-05", "9123456781", "rs@example.com", "3 Park St", None)
+    assert len(cached_db.search_customers("sharma")) == 2
+    assert len(cached_db.get_all_employees()) == 1
+    assert cached_db.cache.invalidations >= 1
+
+
+def test_stale_result_is_not_stored():
+    cache = QueryCache()
+    generation = cache.generation(("customers",))
+    cache.invalidate("customers")               # A write landed while the read ran
+    cache.put("key", ("customers",), [{"cust_id": 1}], generation)
+    assert cache.get("key") == (False, None)
+
+
+def test_expired_and_evicted_entries_miss():
+    cache = QueryCache(ttl=0)
+    cache.put("old", ("customers",), [])
+    assert cache.get("old") == (False, None)
+    cache = QueryCache(max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, ("customers",), [])
+    assert cache.get("a") == (False, None)
+    assert cache.get("c") == (True, [])
+    assert cache.evictions == 1
@@ -0,0 +1,70 @@
+import pytest
+from mysql.connector import Error
+from replicas import ReplicaRouter, parse_hosts
+from sqlite_backend import SQLiteDatabaseManager, _SQLiteConnection
+
+
+@pytest.fixture
+def replica(tmp_path, db, branch_id):
+    "A second SQLite file standing in for a replica that has applied the first change"
+    path = str(tmp_path / "replica.sqlite3")
+    copy = SQLiteDatabaseManager(path)
+    copy.insert_branch("Main Branch (replica)", "1 MG Road", "Pune", "MH", "411001")
+    yield copy
+    copy.close()
+
+
+def router(path, **kwargs):
+    def open_connection(host, port):
+        if path is None:
+            raise Error(errno=2003, msg=f"Can't connect to {host}:{port}")
+        connection = _SQLiteConnection(path)
+        return connection, connection.cursor(dictionary=True)
+    return ReplicaRouter([("replica", 3306)], open_connection, explore=0, probe_interval=3600, **kwargs)
+
+
+def branch_names(db):
+    return [row["branch_name"] for row in db.get_all_branches()]
+
+
+def test_parse_hosts():
+    assert parse_hosts(" 10.0.0.2, 10.0.0.3:3307,") == [("10.0.0.2", 3306), ("10.0.0.3", 3307)]
+    assert parse_hosts(None) == []
+
+
+def test_reads_wait_for_a_replica_that_has_the_sessions_writes(db, replica):
+    db.replicas = router(replica.path)
+    assert branch_names(db) == ["Main Branch (replica)"]
+    db.insert_branch("City Branch", "2 FC Road", "Pune", "MH", "411004")
+    # The replica has not applied seq 2 yet: the read goes to the primary and sees the write
+    assert branch_names(db) == ["City Branch", "Main Branch"]
+    assert db.replicas.primary_reads == 1
+    replica.insert_branch("City Branch (replica)", "2 FC Road", "Pune", "MH", "411004")
+    assert branch_names(db) == ["City Branch (replica)", "Main Branch (replica)"]
+    assert db.replicas.stats()["replicas"][0]["reads"] == 2
+
+
+def test_a_follower_reads_no_older_than_the_session(db, replica):
+    db.replicas = router(replica.path)
+    db.insert_branch("City Branch", "2 FC Road", "Pune", "MH", "411004")
+    follower = SQLiteDatabaseManager(db.path, create_tables=False)
+    try:
+        follower.replicas = router(replica.path)
+        follower.follow(db)
+        assert branch_names(follower) == ["City Branch", "Main Branch"]
+        assert follower.replicas.primary_reads == 1
+    finally:
+        follower.close()
+
+
+def test_an_unreachable_replica_is_skipped_until_its_probe_succeeds(db, branch_id):
+    db.replicas = router(None)
+    assert branch_names(db) == ["Main Branch"]
+    stats = db.replicas.stats()
+    assert stats["primary_reads"] == 1 and not stats["replicas"][0]["healthy"]
+
+
+def test_statement_errors_are_not_hidden_by_the_fallback(db, replica):
+    db.replicas = router(replica.path)
+    with pytest.raises(Error):
+        db.replicas.read(lambda cursor: cursor.execute("SELECT * from no_such_table"))
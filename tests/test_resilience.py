@@ -0,0 +1,104 @@
+import time
+import pytest
+from mysql.connector import Error
+import resilience
+from resilience import CircuitBreaker, DatabaseUnavailable, GuardedCursor, retry
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(resilience, "backoff_delays", lambda attempts, base, cap: iter([0] * (attempts - 1)))
+
+
+def failing(errors, result="ok"):
+    "A call that raises each of errors in turn, then returns result"
+    errors = list(errors)
+    calls = []
+
+    def call():
+        calls.append(1)
+        if errors:
+            raise errors.pop(0)
+        return result
+    return call, calls
+
+
+def test_transient_errors_are_retried(no_backoff):
+    call, calls = failing([Error(errno=2013), Error(errno=1213)])
+    assert retry(call, attempts=3) == "ok" and len(calls) == 3
+
+
+def test_statement_errors_and_exhausted_attempts_are_raised(no_backoff):
+    call, calls = failing([Error(errno=1064)])
+    with pytest.raises(Error):
+        retry(call, attempts=3)
+    assert len(calls) == 1
+    call, calls = failing([Error(errno=2006)] * 3)
+    with pytest.raises(Error):
+        retry(call, attempts=3)
+    assert len(calls) == 3
+
+
+def test_open_breaker_is_not_retried():
+    call, calls = failing([DatabaseUnavailable(msg="open")])
+    with pytest.raises(DatabaseUnavailable):
+        retry(call, attempts=3)
+    assert len(calls) == 1
+
+
+def probe_that_heals(after):
+    attempts = []
+
+    def probe():
+        attempts.append(1)
+        if len(attempts) < after:
+            raise OSError("still down")
+    return probe
+
+
+def test_breaker_opens_after_the_threshold_and_closes_when_the_probe_succeeds():
+    breaker = CircuitBreaker(probe_that_heals(after=2), failure_threshold=2, probe_interval=0.05)
+    breaker.record_failure(Error(errno=2003))
+    assert breaker.allow()
+    breaker.record_success()                    # A success resets the count
+    breaker.record_failure(Error(errno=2003))
+    assert breaker.allow()
+    breaker.record_failure(Error(errno=2003))
+    assert breaker.degraded                     # The first probe runs 40-60ms later
+    deadline = time.monotonic() + 5
+    while not breaker.allow() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert breaker.allow() and breaker.failures == 0
+
+
+class Manager:
+    "The parts of DatabaseManager GuardedCursor calls"
+
+    def __init__(self):
+        self.breaker = CircuitBreaker(lambda: None, failure_threshold=1, probe_interval=3600)
+        self.failed = []
+
+    def _before_query(self):
+        if not self.breaker.allow():
+            raise DatabaseUnavailable(msg="open")
+
+    def _query_failed(self, error):
+        self.failed.append(error)
+        self.breaker.record_failure(error)
+
+
+class BrokenCursor:
+    def execute(self, query, params=()):
+        raise Error(errno=2013)
+
+
+def test_guarded_cursor_fails_fast_once_the_breaker_opens():
+    manager = Manager()
+    cursor = GuardedCursor(manager)
+    cursor.attach(BrokenCursor())
+    with pytest.raises(Error):
+        cursor.execute("SELECT 1")
+    assert manager.breaker.degraded
+    with pytest.raises(DatabaseUnavailable):
+        cursor.execute("SELECT 1")
+    assert len(manager.failed) == 1             # The second call never reached the cursor
@@ -0,0 +1,89 @@
+import http.client
+import json
+import pytest
+from loadgen import seed_standin, start_standin
+
+
+@pytest.fixture(scope="module")
+def server():
+    "The JSON service on a stand-in with 20 branches and 120 customers"
+    with seed_standin(120, prefix="bank-service-test-") as path:
+        server = start_standin(path, 2)
+        yield server
+        server.shutdown()
+        server.server_close()
+
+
+def request(server, method, path, body=None, headers=None):
+    connection = http.client.HTTPConnection(*server.server_address, timeout=10)
+    try:
+        payload = json.dumps(body) if body is not None else None
+        connection.request(method, path, payload, headers or {})
+        response = connection.getresponse()
+        data = response.read()
+        return response.status, (json.loads(data) if data else None), response.getheader("ETag")
+    finally:
+        connection.close()
+
+
+def test_list_pages_by_id(server):
+    ids, after = [], 0
+    while after is not None:
+        status, page, _ = request(server, "GET", f"/customers?after={after}&limit=50")
+        assert status == 200
+        ids += [row["cust_id"] for row in page["items"]]
+        after = page["next_after"]
+    assert ids == sorted(set(ids))
+    assert len(ids) >= 120
+
+
+def test_search_pages_follow_the_cursor(server):
+    status, everything, _ = request(server, "GET", "/customers/search?q=a&limit=1000")
+    assert status == 200 and everything["next_after"] is None
+    ids, query = [], "/customers/search?q=a&limit=7"
+    while True:
+        status, page, _ = request(server, "GET", query)
+        assert status == 200
+        ids += [row["cust_id"] for row in page["items"]]
+        if page["next_after"] is None:
+            break
+        query = f"/customers/search?q=a&limit=7&after={page['next_after']}"
+    assert ids == [row["cust_id"] for row in everything["items"]]
+
+
+@pytest.mark.parametrize("path", ["/customers?limit=0", "/customers?after=-1", "/customers?limit=x",
+                                  "/customers/search?q=a&limit=-1", "/customers/search?q=a&after=nonsense"])
+def test_bad_paging_parameters_are_400(server, path):
+    assert request(server, "GET", path)[0] == 400
+
+
+def test_etag_revalidates_until_a_write(server):
+    status, _, etag = request(server, "GET", "/branches?limit=5")
+    assert status == 200 and etag
+    assert request(server, "GET", "/branches?limit=5", headers={"If-None-Match": etag})[0] == 304
+    status, created, _ = request(server, "POST", "/contacts", {"name": "Asha Rao"})
+    assert status == 201 and created["id"]
+    status, _, fresh = request(server, "GET", "/branches?limit=5", headers={"If-None-Match": etag})
+    assert status == 200 and fresh != etag
+
+
+def test_write_status_codes(server):
+    status, created, _ = request(server, "POST", "/contacts", {"name": "Ravi Das", "phone": "9876543210"})
+    assert status == 201
+    contact = f"/contacts/{created['id']}"
+    assert request(server, "PATCH", contact, {"email": "ravi@example.com"})[:2] == (200, {"updated": True})
+    status, row, _ = request(server, "GET", contact)
+    assert (status, row["phone"], row["email"]) == (200, "9876543210", "ravi@example.com")
+    assert request(server, "DELETE", contact)[0] == 200
+    assert request(server, "GET", contact)[0] == 404
+    assert request(server, "PATCH", contact, {"email": "x@example.com"})[0] == 404
+    assert request(server, "POST", "/contacts", {"colour": "red"})[0] == 400
+    assert request(server, "GET", "/nowhere")[0] == 404
+    assert request(server, "DELETE", "/contacts")[0] == 405
+
+
+def test_refused_create_is_not_201(server):
+    # name is NOT NULL: the insert fails and must not be answered with {"id": null}
+    status, body, _ = request(server, "POST", "/contacts", {"phone": "9876543210"})
+    assert status == 500
+    assert "id" not in body
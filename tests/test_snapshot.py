@@ -0,0 +1,51 @@
+import os
+import sys
+import pytest
+from snapshot import SnapshotStore
+
+ROWS = [(1, ("Asha Rao", None, 3)), (2, ("Ravi Das", "ravi@example.com", 4))]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SnapshotStore(str(tmp_path / "snapshots"), "mysql://db1/project")
+
+
+def test_round_trip(store):
+    store.save("customers", 42, None, ROWS)
+    seq, rows = store.load("customers", None)
+    try:
+        assert seq == 42 and len(rows) == 2
+        # Values come back as text, with None as an empty string
+        assert rows[0] == ("1", ("Asha Rao", "", "3"))
+        assert rows[-1:] == [("2", ("Ravi Das", "ravi@example.com", "4"))]
+    finally:
+        rows.close()
+
+
+def test_snapshot_of_another_scope_or_database_is_ignored(store, tmp_path):
+    store.save("customers", 42, 3, ROWS)
+    assert store.load("customers", None) is None
+    assert store.load("customers", 4) is None
+    other = SnapshotStore(store.directory, "mysql://db2/project")
+    assert other.load("customers", 3) is None
+    _, rows = store.load("customers", 3)
+    rows.close()
+
+
+def test_missing_or_truncated_snapshot_is_ignored(store):
+    assert store.load("employees", None) is None
+    store.save("customers", 42, None, ROWS)
+    path = os.path.join(store.directory, "customers.snap")
+    with open(path, "r+b") as snap:
+        snap.truncate(os.path.getsize(path) - 5)
+    assert store.load("customers", None) is None
+
+
+@pytest.mark.skipif(sys.platform in ("win32", "darwin"), reason="XDG layout")
+def test_default_directory_is_the_user_cache(monkeypatch, tmp_path):
+    monkeypatch.delenv("DB_SNAPSHOT_DIR", raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert SnapshotStore.from_env("x").directory == str(tmp_path / "bank-management" / "snapshots")
+    monkeypatch.setenv("DB_SNAPSHOT_DIR", "")
+    assert SnapshotStore.from_env("x") is None
@@ -0,0 +1,80 @@
+import time
+import tkinter as tk
+from collections.abc import Sequence
+
+
+class ProgressiveTreeFiller:
+    """Fills a Treeview in time-sliced chunks scheduled with after()
+
+    The first screenful is inserted straight away, the rest a slice at a time
+    so the event loop keeps handling input between chunks. Starting a new fill
+    or calling cancel() abandons the one in progress. With a parent item the
+    filler owns that item's children instead of the whole tree, and item ids
+    are prefixed with the parent's so several fillers can share one tree.
+    """
+
+    def __init__(self, root, tree, slice_ms=15, first_chunk=40, parent=""):
+        self.root = root
+        self.tree = tree
+        self.parent = parent
+        self.slice_ms = slice_ms
+        self.first_chunk = first_chunk          # About one screen of rows at the default row height
+        self._after_id = None
+        self._generation = 0
+        self._to_tags = None
+
+    @property
+    def busy(self):
+        return self._after_id is not None
+
+    def fill(self, rows, to_values, key, on_done=None, to_tags=None):
+        """Replace the tree (or parent's) contents with rows, keyed by row[key] as the item id"""
+        self.cancel()
+        self.tree.delete(*self.tree.get_children(self.parent))
+        generation = self._generation
+        if not isinstance(rows, Sequence):
+            rows = list(rows)                   # Sequences such as snapshot rows are read a slice at a time
+        self._to_tags = to_tags
+        self._insert(rows, 0, min(self.first_chunk, len(rows)), to_values, key)
+        self._schedule(generation, rows, min(self.first_chunk, len(rows)), to_values, key, on_done)
+
+    def cancel(self):
+        """Stop the fill in progress, leaving the rows inserted so far"""
+        self._generation += 1
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except tk.TclError:
+                pass
+            self._after_id = None
+
+    def _schedule(self, generation, rows, position, to_values, key, on_done):
+        if position >= len(rows):
+            self._after_id = None
+            if on_done is not None:
+                on_done(len(rows))
+            return
+        self._after_id = self.root.after(1, self._step, generation, rows, position, to_values, key, on_done)
+
+    def _step(self, generation, rows, position, to_values, key, on_done):
+        if generation != self._generation or not self.tree.winfo_exists():
+            return
+        deadline = time.perf_counter() + self.slice_ms / 1000
+        while position < len(rows) and time.perf_counter() < deadline:
+            end = min(position + 100, len(rows))
+            self._insert(rows, position, end, to_values, key)
+            position = end
+        self._schedule(generation, rows, position, to_values, key, on_done)
+
+    def _insert(self, rows, start, end, to_values, key):
+        tree = self.tree
+        to_tags = self._to_tags
+        parent = self.parent
+        for row in rows[start:end]:
+            iid = f"{parent}/{row[key]}" if parent else str(row[key])
+            tags = to_tags(row) if to_tags is not None else ()
+            try:
+                tree.insert(parent, tk.END, iid=iid, values=to_values(row), tags=tags)
+            except tk.TclError:
+                # Already added by a polled change while the fill was running
+                tree.item(iid, values=to_values(row), tags=tags)